@@ -0,0 +1,1247 @@
+"""
+Benchmark suite for the event, bar and indicator hot paths.
+
+Run all benchmarks and write results into a json file:
+
+    python benchmark_suite.py --output result.json
+
+Run selected benchmarks and compare with result of another commit:
+
+    python benchmark_suite.py -k event bar --compare baseline.json
+"""
+
+import json
+import platform
+import subprocess
+import tracemalloc
+from argparse import ArgumentParser, Namespace
+from copy import copy
+from datetime import datetime, time, timedelta
+from pathlib import Path
+from random import Random
+from statistics import median
+from tempfile import TemporaryDirectory
+from threading import Event as Flag
+from time import perf_counter
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from vnpy.event import Event, EventEngine
+from vnpy.trader.batch import BAR_COLUMNS, BarBatch
+from vnpy.trader.constant import (
+    Direction,
+    Exchange,
+    Interval,
+    Offset,
+    OrderType,
+    Product,
+    Status
+)
+from vnpy.trader.cache_database import CacheDatabase
+from vnpy.trader.database import BaseDatabase
+from vnpy.trader.mmap_database import MmapDatabase
+from vnpy.trader.object import (
+    BarData,
+    ContractData,
+    OrderData,
+    OrderRequest,
+    PositionData,
+    SlotBarData,
+    SlotOrderData,
+    SlotTickData,
+    SlotTradeData,
+    TickData,
+    TradeData
+)
+from vnpy.trader.resampler import BarResampler
+from vnpy.trader.utility import (
+    ArrayManager,
+    BarGenerator,
+    MultiBarGenerator,
+    PortfolioArrayManager,
+    RingArrayManager
+)
+from vnpy.trader.write_database import WriteBehindDatabase
+
+
+EVENT_BENCHMARK = "eBenchmark"
+EVENT_FINISHED = "eBenchmarkFinished"
+
+GATEWAY_NAME = "BENCHMARK"
+START_DT = datetime(2022, 1, 3, 9, 0)
+
+
+BENCHMARKS: Dict[str, Callable[[], dict]] = {}
+
+
+def benchmark(name: str) -> Callable:
+    """
+    Decorator for registering benchmark function, which returns a dict
+    of metrics.
+    """
+    def register(func: Callable[[], dict]) -> Callable[[], dict]:
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def generate_ticks(count: int, symbol_count: int = 1, seed: int = 0) -> List[TickData]:
+    """
+    Generate ticks of random walk price, two ticks per second for each
+    symbol.
+    """
+    random: Random = Random(seed)
+    prices: List[float] = [4000.0] * symbol_count
+    volumes: List[float] = [0.0] * symbol_count
+    ticks: List[TickData] = []
+
+    for i in range(count):
+        n: int = i % symbol_count
+        prices[n] += random.choice([-1, 0, 1])
+        volumes[n] += random.randint(1, 10)
+
+        tick: TickData = TickData(
+            symbol=f"rb{2205 + n}",
+            exchange=Exchange.SHFE,
+            datetime=START_DT + timedelta(milliseconds=500 * (i // symbol_count)),
+            gateway_name=GATEWAY_NAME,
+            volume=volumes[n],
+            turnover=volumes[n] * prices[n],
+            open_interest=100000,
+            last_price=prices[n],
+            bid_price_1=prices[n] - 1,
+            ask_price_1=prices[n] + 1,
+            bid_volume_1=random.randint(1, 100),
+            ask_volume_1=random.randint(1, 100)
+        )
+        ticks.append(tick)
+
+    return ticks
+
+
+def generate_bars(count: int, interval: Interval = Interval.MINUTE, seed: int = 0) -> List[BarData]:
+    """
+    Generate continuous bars of random walk price.
+    """
+    random: Random = Random(seed)
+    delta: timedelta = timedelta(minutes=1) if interval == Interval.MINUTE else timedelta(days=1)
+    price: float = 4000.0
+    bars: List[BarData] = []
+
+    for i in range(count):
+        open_price: float = price
+        close_price: float = price + random.uniform(-10, 10)
+        price = close_price
+
+        bar: BarData = BarData(
+            symbol="rb2205",
+            exchange=Exchange.SHFE,
+            datetime=START_DT + delta * i,
+            interval=interval,
+            gateway_name=GATEWAY_NAME,
+            volume=random.randint(100, 1000),
+            turnover=random.randint(100, 1000) * price,
+            open_interest=100000,
+            open_price=open_price,
+            high_price=max(open_price, close_price) + random.uniform(0, 5),
+            low_price=min(open_price, close_price) - random.uniform(0, 5),
+            close_price=close_price
+        )
+        bars.append(bar)
+
+    return bars
+
+
+def generate_contracts(symbol_count: int) -> List[ContractData]:
+    """
+    Generate futures contracts requiring offset convert.
+    """
+    return [
+        ContractData(
+            symbol=f"rb{2205 + n}",
+            exchange=Exchange.SHFE,
+            name=f"rb{2205 + n}",
+            product=Product.FUTURES,
+            size=10,
+            pricetick=1,
+            gateway_name=GATEWAY_NAME
+        )
+        for n in range(symbol_count)
+    ]
+
+
+def generate_orders(count: int, symbol_count: int = 1, seed: int = 0) -> List[OrderData]:
+    """
+    Generate order updates, each order is submitted and then filled.
+    """
+    random: Random = Random(seed)
+    orders: List[OrderData] = []
+
+    for i in range(count // 2):
+        for status in [Status.NOTTRADED, Status.ALLTRADED]:
+            order: OrderData = OrderData(
+                symbol=f"rb{2205 + i % symbol_count}",
+                exchange=Exchange.SHFE,
+                orderid=str(i),
+                gateway_name=GATEWAY_NAME,
+                direction=random.choice([Direction.LONG, Direction.SHORT]),
+                offset=Offset.OPEN,
+                price=4000,
+                volume=1,
+                traded=1 if status == Status.ALLTRADED else 0,
+                status=status,
+                datetime=START_DT
+            )
+            orders.append(order)
+
+    return orders
+
+
+def generate_trades(orders: List[OrderData]) -> List[TradeData]:
+    """
+    Generate trades of orders all traded.
+    """
+    return [
+        TradeData(
+            symbol=order.symbol,
+            exchange=order.exchange,
+            orderid=order.orderid,
+            tradeid=order.orderid,
+            gateway_name=GATEWAY_NAME,
+            direction=order.direction,
+            offset=order.offset,
+            price=order.price,
+            volume=order.volume,
+            datetime=order.datetime
+        )
+        for order in orders if order.status == Status.ALLTRADED
+    ]
+
+
+def get_rate_result(count: int, cost: float) -> dict:
+    """"""
+    return {
+        "count": count,
+        "seconds": round(cost, 6),
+        "rate": round(count / cost, 1),
+    }
+
+
+def get_latency_result(latencies: List[float]) -> dict:
+    """
+    Get percentiles of latencies in microseconds.
+    """
+    latencies = sorted(latencies)
+    count: int = len(latencies)
+
+    return {
+        "latency_p50_us": round(latencies[count // 2] * 1e6, 2),
+        "latency_p99_us": round(latencies[int(count * 0.99)] * 1e6, 2),
+        "latency_max_us": round(latencies[-1] * 1e6, 2),
+    }
+
+
+@benchmark("event_engine_put")
+def run_event_engine_put(count: int = 200_000) -> dict:
+    """
+    Throughput of putting events one by one and dispatching them.
+    """
+    engine: EventEngine = EventEngine(batch_size=64)
+    finished: Flag = Flag()
+
+    engine.register(EVENT_BENCHMARK, lambda event: None)
+    engine.register(EVENT_FINISHED, lambda event: finished.set())
+    engine.start()
+
+    events: List[Event] = [Event(EVENT_BENCHMARK, i) for i in range(count)]
+
+    start: float = perf_counter()
+    for event in events:
+        engine.put(event)
+    engine.put(Event(EVENT_FINISHED))
+    finished.wait()
+    cost: float = perf_counter() - start
+
+    engine.stop()
+    return get_rate_result(count, cost)
+
+
+@benchmark("event_engine_put_many")
+def run_event_engine_put_many(count: int = 200_000, frame_size: int = 20) -> dict:
+    """
+    Throughput of putting events in frames and dispatching them.
+    """
+    engine: EventEngine = EventEngine(batch_size=1024)
+    finished: Flag = Flag()
+
+    engine.register(EVENT_BENCHMARK, lambda event: None)
+    engine.register(EVENT_FINISHED, lambda event: finished.set())
+    engine.start()
+
+    events: List[Event] = [Event(EVENT_BENCHMARK, i) for i in range(count)]
+
+    start: float = perf_counter()
+    for i in range(0, count, frame_size):
+        engine.put_many(events[i:i + frame_size])
+    engine.put(Event(EVENT_FINISHED))
+    finished.wait()
+    cost: float = perf_counter() - start
+
+    engine.stop()
+    return get_rate_result(count, cost)
+
+
+@benchmark("event_engine_latency")
+def run_event_engine_latency(count: int = 20_000) -> dict:
+    """
+    Latency from putting an event to its handler called, with events
+    put one by one at a moderate rate.
+    """
+    engine: EventEngine = EventEngine()
+    latencies: List[float] = []
+    finished: Flag = Flag()
+
+    def process_event(event: Event) -> None:
+        latencies.append(perf_counter() - event.data)
+        if len(latencies) == count:
+            finished.set()
+
+    engine.register(EVENT_BENCHMARK, process_event)
+    engine.start()
+
+    start: float = perf_counter()
+    for i in range(count):
+        engine.put(Event(EVENT_BENCHMARK, perf_counter()))
+
+        # Pause every 100 events to keep the queue short
+        if not i % 100:
+            while len(latencies) < i:
+                pass
+
+    finished.wait()
+    cost: float = perf_counter() - start
+
+    engine.stop()
+
+    result: dict = get_rate_result(count, cost)
+    result.update(get_latency_result(latencies))
+    return result
+
+
+@benchmark("bar_generator_update_tick")
+def run_bar_generator_update_tick(count: int = 200_000) -> dict:
+    """
+    Generate 1 minute bars from ticks.
+    """
+    ticks: List[TickData] = generate_ticks(count)
+    bars: List[BarData] = []
+    bg: BarGenerator = BarGenerator(bars.append)
+
+    start: float = perf_counter()
+    for tick in ticks:
+        bg.update_tick(tick)
+    cost: float = perf_counter() - start
+
+    result: dict = get_rate_result(count, cost)
+    result["bars"] = len(bars)
+    return result
+
+
+@benchmark("bar_generator_update_bar")
+def run_bar_generator_update_bar(count: int = 200_000) -> dict:
+    """
+    Generate 15 minute bars from 1 minute bars.
+    """
+    bars: List[BarData] = generate_bars(count)
+    window_bars: List[BarData] = []
+    bg: BarGenerator = BarGenerator(lambda bar: None, 15, window_bars.append)
+
+    start: float = perf_counter()
+    for bar in bars:
+        bg.update_bar(bar)
+    cost: float = perf_counter() - start
+
+    result: dict = get_rate_result(count, cost)
+    result["bars"] = len(window_bars)
+    return result
+
+
+MULTI_WINDOWS: List[tuple] = [
+    (5, Interval.MINUTE),
+    (15, Interval.MINUTE),
+    (1, Interval.HOUR),
+    (4, Interval.HOUR),
+]
+
+
+@benchmark("bar_generator_chain")
+def run_bar_generator_chain(count: int = 200_000) -> dict:
+    """
+    Generate 5m, 15m, 1h and 4h bars from 1 minute bars with one
+    BarGenerator for each window.
+    """
+    bars: List[BarData] = generate_bars(count)
+    window_bars: List[BarData] = []
+    generators: List[BarGenerator] = [
+        BarGenerator(lambda bar: None, window, window_bars.append, interval)
+        for window, interval in MULTI_WINDOWS
+    ]
+
+    start: float = perf_counter()
+    for bar in bars:
+        for bg in generators:
+            bg.update_bar(bar)
+    cost: float = perf_counter() - start
+
+    result: dict = get_rate_result(count, cost)
+    result["bars"] = len(window_bars)
+    return result
+
+
+def run_multi_bar_generator(reuse: bool, count: int = 200_000) -> dict:
+    """
+    Generate the same bars as bar_generator_chain with MultiBarGenerator.
+    """
+    bars: List[BarData] = generate_bars(count)
+    window_bars: List[BarData] = []
+    mg: MultiBarGenerator = MultiBarGenerator(reuse=reuse)
+    for window, interval in MULTI_WINDOWS:
+        mg.add_window(window, interval, window_bars.append)
+
+    start: float = perf_counter()
+    for bar in bars:
+        mg.update_bar(bar)
+    cost: float = perf_counter() - start
+
+    result: dict = get_rate_result(count, cost)
+    result["bars"] = len(window_bars)
+    return result
+
+
+benchmark("multi_bar_generator")(lambda: run_multi_bar_generator(False))
+benchmark("multi_bar_generator_reuse")(lambda: run_multi_bar_generator(True))
+
+
+RESAMPLE_SETTINGS: Dict[str, tuple] = {
+    "15m": (15, Interval.MINUTE, None),
+    "4h": (4, Interval.HOUR, None),
+    "daily": (1, Interval.DAILY, time(14, 59)),
+}
+
+
+def run_bar_resampler(name: str, count: int = 200_000) -> dict:
+    """
+    Resample 1 minute bars with BarResampler, and check that bars are
+    the same as generated by BarGenerator one by one.
+    """
+    window, interval, daily_end = RESAMPLE_SETTINGS[name]
+    bars: List[BarData] = generate_bars(count)
+
+    window_bars: List[BarData] = []
+    bg: BarGenerator = BarGenerator(lambda bar: None, window, window_bars.append, interval, daily_end)
+
+    start: float = perf_counter()
+    for bar in bars:
+        bg.update_bar(bar)
+    generator_cost: float = perf_counter() - start
+
+    # Resample from batch, as loaded by database, and from bar list
+    resampler: BarResampler = BarResampler(window, interval, daily_end)
+    batch: BarBatch = BarBatch.from_bars(bars)
+
+    start = perf_counter()
+    resampler.resample(batch)
+    cost: float = perf_counter() - start
+
+    start = perf_counter()
+    resampled_bars: List[BarData] = resampler.resample_bars(bars)
+    list_cost: float = perf_counter() - start
+
+    fields: List[str] = ["datetime"] + BAR_COLUMNS
+    matched: bool = len(window_bars) == len(resampled_bars) and all(
+        getattr(a, field) == getattr(b, field)
+        for a, b in zip(window_bars, resampled_bars) for field in fields
+    )
+
+    result: dict = get_rate_result(count, cost)
+    result["list_rate"] = round(count / list_cost, 1)
+    result["bar_generator_rate"] = round(count / generator_cost, 1)
+    result["bars"] = len(resampled_bars)
+    result["matched"] = matched
+    return result
+
+
+def register_bar_resamplers() -> None:
+    """
+    Register benchmarks of resampling into each interval.
+    """
+    for name in RESAMPLE_SETTINGS:
+        func: Callable[[], dict] = lambda name=name: run_bar_resampler(name)     # noqa
+        benchmark(f"bar_resampler_{name}")(func)
+
+
+register_bar_resamplers()
+
+
+def run_array_manager_update_bar(cls: type, size: int, count: int = 100_000) -> dict:
+    """
+    Update bars into array manager without calculating indicators.
+    """
+    bars: List[BarData] = generate_bars(count)
+    am: ArrayManager = cls(size)
+
+    start: float = perf_counter()
+    for bar in bars:
+        am.update_bar(bar)
+    cost: float = perf_counter() - start
+
+    result: dict = get_rate_result(count, cost)
+    result["size"] = size
+    return result
+
+
+def run_array_manager_indicators(cls: type, size: int = 100, count: int = 20_000) -> dict:
+    """
+    Update bars and calculate common indicators on every bar, as a
+    typical CTA strategy does.
+    """
+    bars: List[BarData] = generate_bars(count)
+    am: ArrayManager = cls(size)
+
+    for bar in bars[:size]:
+        am.update_bar(bar)
+
+    indicators: Dict[str, Callable[[], object]] = {
+        "sma": lambda: am.sma(20),
+        "ema": lambda: am.ema(20),
+        "atr": lambda: am.atr(14),
+        "rsi": lambda: am.rsi(14),
+        "macd": lambda: am.macd(12, 26, 9),
+        "boll": lambda: am.boll(20, 2),
+        "donchian": lambda: am.donchian(20),
+    }
+    costs: Dict[str, float] = {name: 0 for name in indicators}
+
+    start: float = perf_counter()
+    for bar in bars[size:]:
+        am.update_bar(bar)
+
+        for name, func in indicators.items():
+            t: float = perf_counter()
+            func()
+            costs[name] += perf_counter() - t
+    cost: float = perf_counter() - start
+
+    bar_count: int = count - size
+    result: dict = get_rate_result(bar_count, cost)
+    result["size"] = size
+    for name, indicator_cost in costs.items():
+        result[f"{name}_us"] = round(indicator_cost / bar_count * 1e6, 2)
+    return result
+
+
+@benchmark("incremental_indicators")
+def run_incremental_indicators(size: int = 100, count: int = 20_000) -> dict:
+    """
+    Same indicators as array_manager_indicators, updated incrementally
+    by indicators registered with array manager.
+    """
+    from vnpy.trader.indicator import (
+        AtrIndicator,
+        BollIndicator,
+        DonchianIndicator,
+        EmaIndicator,
+        MacdIndicator,
+        RsiIndicator,
+        SmaIndicator
+    )
+
+    bars: List[BarData] = generate_bars(count)
+    am: RingArrayManager = RingArrayManager(size)
+
+    for bar in bars[:size]:
+        am.update_bar(bar)
+
+    indicators: list = [
+        SmaIndicator(20),
+        EmaIndicator(20),
+        AtrIndicator(14),
+        RsiIndicator(14),
+        MacdIndicator(12, 26, 9),
+        BollIndicator(20, 2),
+        DonchianIndicator(20),
+    ]
+    for indicator in indicators:
+        am.add_indicator(indicator)
+
+    start: float = perf_counter()
+    for bar in bars[size:]:
+        am.update_bar(bar)
+        for indicator in indicators:
+            indicator.value
+    cost: float = perf_counter() - start
+
+    result: dict = get_rate_result(count - size, cost)
+    result["size"] = size
+    return result
+
+
+def run_array_manager_signals(cache: bool, size: int = 100, count: int = 20_000) -> dict:
+    """
+    Calculate signals sharing indicators on every bar, as a strategy
+    combining entry, exit and filter rules does.
+    """
+    bars: List[BarData] = generate_bars(count)
+    am: ArrayManager = ArrayManager(size, cache=cache)
+
+    for bar in bars[:size]:
+        am.update_bar(bar)
+
+    signals: List[Callable[[], object]] = [
+        lambda: am.close[-1] > am.boll(20, 2)[0],
+        lambda: am.close[-1] < am.sma(20) - am.atr(14) * 2,
+        lambda: am.sma(10) > am.sma(20) and am.rsi(14) < 70,
+        lambda: am.macd(12, 26, 9)[2] > 0 and am.rsi(14) > 30,
+        lambda: am.donchian(20)[0] - am.donchian(20)[1] > am.atr(14) * 3,
+        lambda: am.std(20) > am.atr(14) * 0.5,
+    ]
+
+    start: float = perf_counter()
+    for bar in bars[size:]:
+        am.update_bar(bar)
+
+        for signal in signals:
+            signal()
+    cost: float = perf_counter() - start
+
+    result: dict = get_rate_result(count - size, cost)
+    result["size"] = size
+    result["cache_hits"] = am.cache_hits
+    result["cache_misses"] = am.cache_misses
+    return result
+
+
+def generate_portfolio_bars(count: int, symbol_count: int) -> List[Dict[str, BarData]]:
+    """
+    Generate bar dict of each timestamp for multiple symbols.
+    """
+    vt_symbols: List[str] = [f"rb{i}.SHFE" for i in range(symbol_count)]
+    symbol_bars: List[List[BarData]] = [generate_bars(count, seed=i) for i in range(symbol_count)]
+    return [dict(zip(vt_symbols, bars)) for bars in zip(*symbol_bars)]
+
+
+@benchmark("portfolio_array_managers")
+def run_portfolio_array_managers(size: int = 100, count: int = 2_000, symbol_count: int = 50) -> dict:
+    """
+    Update one array manager per symbol and rank momentum and volatility
+    of symbols on every timestamp, as portfolio strategies do.
+    """
+    portfolio_bars: List[Dict[str, BarData]] = generate_portfolio_bars(count, symbol_count)
+    ams: Dict[str, ArrayManager] = {vt_symbol: ArrayManager(size) for vt_symbol in portfolio_bars[0]}
+
+    start: float = perf_counter()
+    for bars in portfolio_bars:
+        for vt_symbol, bar in bars.items():
+            ams[vt_symbol].update_bar(bar)
+
+        momentum: np.ndarray = np.array([am.roc(20) for am in ams.values()])
+        volatility: np.ndarray = np.array([am.std(20) / am.sma(20) for am in ams.values()])
+        np.argsort(np.argsort(momentum - volatility))
+    cost: float = perf_counter() - start
+
+    result: dict = get_rate_result(count, cost)
+    result["symbol_count"] = symbol_count
+    return result
+
+
+@benchmark("portfolio_array_manager")
+def run_portfolio_array_manager(size: int = 100, count: int = 2_000, symbol_count: int = 50) -> dict:
+    """
+    Same as portfolio_array_managers with signals calculated for all
+    symbols at once.
+    """
+    portfolio_bars: List[Dict[str, BarData]] = generate_portfolio_bars(count, symbol_count)
+    pam: PortfolioArrayManager = PortfolioArrayManager(list(portfolio_bars[0]), size)
+
+    start: float = perf_counter()
+    for bars in portfolio_bars:
+        pam.update_bars(bars)
+
+        momentum: np.ndarray = pam.roc(20)
+        volatility: np.ndarray = pam.std(20) / pam.sma(20)
+        pam.rank(momentum - volatility)
+    cost: float = perf_counter() - start
+
+    result: dict = get_rate_result(count, cost)
+    result["symbol_count"] = symbol_count
+    return result
+
+
+def register_array_managers() -> None:
+    """
+    Register benchmarks of array manager and its ring buffer version.
+    """
+    for prefix, cls in [("", ArrayManager), ("ring_", RingArrayManager)]:
+        for size in [100, 1000, 10000]:
+            func: Callable[[], dict] = (
+                lambda cls=cls, size=size: run_array_manager_update_bar(cls, size)
+            )
+            benchmark(f"{prefix}array_manager_update_bar_{size}")(func)
+
+        func = lambda cls=cls: run_array_manager_indicators(cls)    # noqa
+        benchmark(f"{prefix}array_manager_indicators")(func)
+
+    for prefix, cache in [("", False), ("cached_", True)]:
+        for size in [100, 1000]:
+            func = lambda cache=cache, size=size: run_array_manager_signals(cache, size)     # noqa
+            benchmark(f"{prefix}array_manager_signals_{size}")(func)
+
+
+register_array_managers()
+
+
+@benchmark("oms_engine")
+def run_oms_engine(count: int = 100_000, symbol_count: int = 10) -> dict:
+    """
+    Process tick, order and trade events by OmsEngine through event engine.
+    """
+    from vnpy.trader.engine import MainEngine
+    from vnpy.trader.event import EVENT_CONTRACT, EVENT_ORDER, EVENT_TICK, EVENT_TRADE
+
+    event_engine: EventEngine = EventEngine(batch_size=64)
+    main_engine: MainEngine = MainEngine(event_engine)
+
+    finished: Flag = Flag()
+    event_engine.register(EVENT_FINISHED, lambda event: finished.set())
+
+    for contract in generate_contracts(symbol_count):
+        event_engine.put(Event(EVENT_CONTRACT, contract))
+
+    orders: List[OrderData] = generate_orders(count // 3, symbol_count)
+    trades: List[TradeData] = generate_trades(orders)
+    ticks: List[TickData] = generate_ticks(count - len(orders) - len(trades), symbol_count)
+
+    events: List[Event] = [Event(EVENT_TICK, tick) for tick in ticks]
+    events.extend(Event(EVENT_ORDER, order) for order in orders)
+    events.extend(Event(EVENT_TRADE, trade) for trade in trades)
+    Random(0).shuffle(events)
+
+    start: float = perf_counter()
+    for event in events:
+        event_engine.put(event)
+    event_engine.put(Event(EVENT_FINISHED))
+    finished.wait()
+    cost: float = perf_counter() - start
+
+    main_engine.close()
+    return get_rate_result(len(events), cost)
+
+
+@benchmark("offset_converter")
+def run_offset_converter(count: int = 100_000, symbol_count: int = 10) -> dict:
+    """
+    Update orders, trades and positions into offset converter, and
+    convert order requests of SHFE contracts.
+    """
+    from vnpy.trader.converter import OffsetConverter
+
+    contracts: Dict[str, ContractData] = {
+        contract.vt_symbol: contract for contract in generate_contracts(symbol_count)
+    }
+
+    class ContractSource:
+        """"""
+        def get_contract(self, vt_symbol: str) -> ContractData:
+            """"""
+            return contracts.get(vt_symbol, None)
+
+    converter: OffsetConverter = OffsetConverter(ContractSource())
+
+    for contract in contracts.values():
+        for direction in [Direction.LONG, Direction.SHORT]:
+            position: PositionData = PositionData(
+                symbol=contract.symbol,
+                exchange=contract.exchange,
+                direction=direction,
+                gateway_name=GATEWAY_NAME,
+                volume=10,
+                yd_volume=5
+            )
+            converter.update_position(position)
+
+    orders: List[OrderData] = generate_orders(count // 2, symbol_count)
+    trades: List[TradeData] = generate_trades(orders)
+    requests: List[OrderRequest] = [
+        OrderRequest(
+            symbol=order.symbol,
+            exchange=order.exchange,
+            direction=order.direction,
+            type=OrderType.LIMIT,
+            volume=3,
+            price=order.price,
+            offset=Offset.CLOSE
+        )
+        for order in orders[:count - len(orders) - len(trades)]
+    ]
+
+    start: float = perf_counter()
+    for order in orders:
+        converter.update_order(order)
+    for trade in trades:
+        converter.update_trade(trade)
+    for req in requests:
+        converter.convert_order_request(req, False)
+    cost: float = perf_counter() - start
+
+    return get_rate_result(len(orders) + len(trades) + len(requests), cost)
+
+
+@benchmark("rpc_round_trip")
+def run_rpc_round_trip(count: int = 5_000) -> dict:
+    """
+    Round trip latency of calling function of RpcServer by RpcClient
+    through local tcp sockets.
+    """
+    from vnpy.rpc import RpcClient, RpcServer
+
+    class BenchmarkClient(RpcClient):
+        """"""
+        def callback(self, topic: str, data: object) -> None:
+            """"""
+            pass
+
+    def get_last_price(tick: TickData) -> float:
+        """"""
+        return tick.last_price
+
+    server: RpcServer = RpcServer()
+    server.register(get_last_price)
+    server.start("tcp://127.0.0.1:22014", "tcp://127.0.0.1:24102")
+
+    client: BenchmarkClient = BenchmarkClient()
+    client.subscribe_topic("")
+    client.start("tcp://127.0.0.1:22014", "tcp://127.0.0.1:24102")
+
+    ticks: List[TickData] = generate_ticks(count)
+    latencies: List[float] = []
+
+    start: float = perf_counter()
+    for tick in ticks:
+        t: float = perf_counter()
+        client.get_last_price(tick)
+        latencies.append(perf_counter() - t)
+    cost: float = perf_counter() - start
+
+    # Publish once more so that client thread exits without waiting
+    client.stop()
+    server.publish("", None)
+    client.join()
+
+    server.stop()
+    server.join()
+
+    result: dict = get_rate_result(count, cost)
+    result.update(get_latency_result(latencies))
+    return result
+
+
+@benchmark("bar_batch_from_bars")
+def run_bar_batch_from_bars(count: int = 100_000) -> dict:
+    """
+    Convert bar data list into columnar batch.
+    """
+    bars: List[BarData] = generate_bars(count)
+
+    start: float = perf_counter()
+    BarBatch.from_bars(bars)
+    cost: float = perf_counter() - start
+
+    return get_rate_result(count, cost)
+
+
+@benchmark("bar_batch_to_bars")
+def run_bar_batch_to_bars(count: int = 100_000) -> dict:
+    """
+    Convert columnar batch back into bar data list.
+    """
+    batch: BarBatch = BarBatch.from_bars(generate_bars(count))
+
+    start: float = perf_counter()
+    batch.to_bars()
+    cost: float = perf_counter() - start
+
+    return get_rate_result(count, cost)
+
+
+@benchmark("mmap_database")
+def run_mmap_database(count: int = 1_000_000, chunk_size: int = 10_000) -> dict:
+    """
+    Save 1 minute bars into memory-mapped database chunk by chunk, then
+    load all of them as batch and as bar objects.
+    """
+    bars: List[BarData] = generate_bars(count)
+    first: BarData = bars[0]
+
+    with TemporaryDirectory() as path:
+        db: MmapDatabase = MmapDatabase(Path(path))
+
+        start: float = perf_counter()
+        for i in range(0, count, chunk_size):
+            db.save_bar_data(bars[i:i + chunk_size], stream=True)
+        save_cost: float = perf_counter() - start
+
+        start = perf_counter()
+        db.get_bar_overview()
+        overview_cost: float = perf_counter() - start
+
+        args: tuple = (first.symbol, first.exchange, first.interval, first.datetime, bars[-1].datetime)
+
+        start = perf_counter()
+        batch: BarBatch = db.load_bar_batch(*args)
+        batch_cost: float = perf_counter() - start
+
+        start = perf_counter()
+        loaded_bars: List[BarData] = db.load_bar_data(*args)
+        cost: float = perf_counter() - start
+
+    result: dict = get_rate_result(len(loaded_bars), cost)
+    result["batch_rate"] = round(len(batch) / batch_cost, 1)
+    result["save_rate"] = round(count / save_cost, 1)
+    result["overview_us"] = round(overview_cost * 1e6, 1)
+    return result
+
+
+@benchmark("load_bar_arrays")
+def run_load_bar_arrays(count: int = 1_000_000) -> dict:
+    """
+    Load 1 minute bars from memory-mapped database as arrays and warm up
+    array manager with them, compared with loading bar objects and
+    unpacking them into arrays.
+    """
+    bars: List[BarData] = generate_bars(count)
+    first: BarData = bars[0]
+    args: tuple = (first.symbol, first.exchange, first.interval, first.datetime, bars[-1].datetime)
+
+    with TemporaryDirectory() as path:
+        db: MmapDatabase = MmapDatabase(Path(path))
+        db.save_bar_data(bars)
+        del bars
+
+        start: float = perf_counter()
+        arrays: Dict[str, np.ndarray] = db.load_bar_arrays(*args)
+        am: ArrayManager = ArrayManager()
+        am.update_arrays(arrays)
+        cost: float = perf_counter() - start
+
+        start = perf_counter()
+        loaded_bars: List[BarData] = db.load_bar_data(*args)
+        close_array: np.ndarray = np.array([bar.close_price for bar in loaded_bars])
+        bar_cost: float = perf_counter() - start
+
+        start = perf_counter()
+        bar_am: ArrayManager = ArrayManager()
+        for bar in loaded_bars:
+            bar_am.update_bar(bar)
+        update_cost: float = perf_counter() - start
+
+    result: dict = get_rate_result(len(arrays["close"]), cost)
+    result["matched"] = bool(
+        np.array_equal(arrays["close"], close_array) and np.array_equal(am.close, bar_am.close)
+    )
+    result["load_bar_data_rate"] = round(count / bar_cost, 1)
+    result["update_bar_rate"] = round(count / update_cost, 1)
+    return result
+
+
+@benchmark("cache_database")
+def run_cache_database(count: int = 200_000, load_count: int = 100, load_size: int = 20_000) -> dict:
+    """
+    Load overlapping ranges of 1 minute bars repeatedly from memory-mapped
+    database, with and without cache in front of it.
+    """
+    bars: List[BarData] = generate_bars(count)
+    first: BarData = bars[0]
+    key: tuple = (first.symbol, first.exchange, first.interval)
+
+    random: Random = Random(0)
+    ranges: list = []
+    for _ in range(load_count):
+        i: int = random.randrange(count - load_size)
+        ranges.append((bars[i].datetime, bars[i + load_size - 1].datetime))
+
+    with TemporaryDirectory() as path:
+        db: MmapDatabase = MmapDatabase(Path(path))
+        db.save_bar_data(bars)
+        del bars
+
+        cache_db: CacheDatabase = CacheDatabase(db, 100 * 1024 * 1024)
+
+        start: float = perf_counter()
+        total: int = 0
+        for range_start, range_end in ranges:
+            total += len(cache_db.load_bar_data(*key, range_start, range_end))
+        cost: float = perf_counter() - start
+
+        start = perf_counter()
+        for range_start, range_end in ranges:
+            cache_db.load_bar_batch(*key, range_start, range_end)
+        batch_cost: float = perf_counter() - start
+
+        start = perf_counter()
+        for range_start, range_end in ranges:
+            db.load_bar_data(*key, range_start, range_end)
+        uncached_cost: float = perf_counter() - start
+
+    result: dict = get_rate_result(total, cost)
+    result.update(cache_db.get_stats())
+    result["batch_load_us"] = round(batch_cost / load_count * 1e6, 1)
+    result["uncached_rate"] = round(total / uncached_cost, 1)
+    return result
+
+
+@benchmark("write_behind_database")
+def run_write_behind_database(count: int = 20_000) -> dict:
+    """
+    Save 1 minute bars one by one in stream mode into memory-mapped
+    database, directly and through write-behind batching.
+    """
+    bars: List[BarData] = generate_bars(count)
+
+    with TemporaryDirectory() as path:
+        db: MmapDatabase = MmapDatabase(Path(path).joinpath("direct"))
+
+        start: float = perf_counter()
+        for bar in bars:
+            db.save_bar_data([bar], stream=True)
+        direct_cost: float = perf_counter() - start
+
+        write_db: WriteBehindDatabase = WriteBehindDatabase(MmapDatabase(Path(path).joinpath("batch")))
+
+        start = perf_counter()
+        for bar in bars:
+            write_db.save_bar_data([bar], stream=True)
+        cost: float = perf_counter() - start
+
+        write_db.close()
+        total_cost: float = perf_counter() - start
+
+        first: BarData = bars[0]
+        loaded: List[BarData] = write_db.load_bar_data(
+            first.symbol, first.exchange, first.interval, first.datetime, bars[-1].datetime
+        )
+        stats: dict = write_db.get_stats()
+
+    result: dict = get_rate_result(count, cost)
+    result["matched"] = [bar.close_price for bar in loaded] == [bar.close_price for bar in bars]
+    result["total_rate"] = round(count / total_cost, 1)
+    result["direct_rate"] = round(count / direct_cost, 1)
+    result["flush_count"] = stats["flush_latency"]["count"]
+    result["flush_latency_ms"] = round(stats["flush_latency"]["average"] * 1000, 3)
+    result["max_lag_ms"] = round(stats["write_lag"]["max"] * 1000, 3)
+    return result
+
+
+@benchmark("mmap_database_iter")
+def run_mmap_database_iter(count: int = 1_000_000, chunk_size: int = 10_000) -> dict:
+    """
+    Iterate 1 minute bars saved in memory-mapped database chunk by chunk,
+    by rows and by default time ranges, with peak memory of bar chunks.
+    """
+    bars: List[BarData] = generate_bars(count)
+    first: BarData = bars[0]
+    args: tuple = (first.symbol, first.exchange, first.interval, first.datetime, bars[-1].datetime)
+
+    with TemporaryDirectory() as path:
+        db: MmapDatabase = MmapDatabase(Path(path))
+        db.save_bar_data(bars)
+        del bars
+
+        start: float = perf_counter()
+        total: int = 0
+        for chunk in db.iter_bar_data(*args, chunk_size=chunk_size):
+            total += len(chunk)
+        cost: float = perf_counter() - start
+
+        # Peak memory is bounded by chunk size, so tracing a few chunks is enough
+        tracemalloc.start()
+        for i, chunk in enumerate(db.iter_bar_data(*args, chunk_size=chunk_size)):
+            if i == 10:
+                break
+        peak: int = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        start = perf_counter()
+        range_total: int = 0
+        for chunk in BaseDatabase.iter_bar_data(db, *args, chunk_size=chunk_size, batch=True):
+            range_total += len(chunk)
+        range_cost: float = perf_counter() - start
+
+        start = perf_counter()
+        batch_total: int = 0
+        for chunk in db.iter_bar_data(*args, chunk_size=chunk_size, batch=True):
+            batch_total += len(chunk)
+        batch_cost: float = perf_counter() - start
+
+    result: dict = get_rate_result(total, cost)
+    result["peak_mb"] = round(peak / 1e6, 1)
+    result["batch_rate"] = round(batch_total / batch_cost, 1)
+    result["time_range_batch_rate"] = round(range_total / range_cost, 1)
+    return result
+
+
+def run_data_object(cls: type, kwargs: dict, count: int = 100_000) -> dict:
+    """
+    Construction rate, copy cost and memory of data object.
+    """
+    start: float = perf_counter()
+    objs: list = [cls(**kwargs) for _ in range(count)]
+    cost: float = perf_counter() - start
+
+    tracemalloc.start()
+    samples: list = [cls(**kwargs) for _ in range(1000)]
+    memory: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    copy_start: float = perf_counter()
+    for obj in objs:
+        copy(obj)
+    copy_cost: float = perf_counter() - copy_start
+
+    result: dict = get_rate_result(count, cost)
+    result["copy_us"] = round(copy_cost / count * 1e6, 3)
+    result["bytes"] = round(memory / len(samples), 1)
+
+    if hasattr(cls, "clone"):
+        clone_start: float = perf_counter()
+        for obj in objs:
+            obj.clone()
+        clone_cost: float = perf_counter() - clone_start
+        result["clone_us"] = round(clone_cost / count * 1e6, 3)
+
+    return result
+
+
+def register_data_objects() -> None:
+    """
+    Register benchmark of each data object class and its slotted version.
+    """
+    common: dict = {
+        "gateway_name": GATEWAY_NAME,
+        "symbol": "rb2205",
+        "exchange": Exchange.SHFE,
+    }
+    tick_kwargs: dict = {
+        **common, "datetime": START_DT, "last_price": 4000,
+        "bid_price_1": 3999, "ask_price_1": 4001, "bid_volume_1": 10, "ask_volume_1": 10
+    }
+    bar_kwargs: dict = {
+        **common, "datetime": START_DT, "interval": Interval.MINUTE,
+        "open_price": 4000, "high_price": 4010, "low_price": 3990, "close_price": 4005
+    }
+    order_kwargs: dict = {
+        **common, "orderid": "1", "direction": Direction.LONG, "price": 4000, "volume": 1
+    }
+    trade_kwargs: dict = {
+        **common, "orderid": "1", "tradeid": "1", "direction": Direction.LONG, "price": 4000, "volume": 1
+    }
+
+    for name, classes, kwargs in [
+        ("tick_data", (TickData, SlotTickData), tick_kwargs),
+        ("bar_data", (BarData, SlotBarData), bar_kwargs),
+        ("order_data", (OrderData, SlotOrderData), order_kwargs),
+        ("trade_data", (TradeData, SlotTradeData), trade_kwargs),
+    ]:
+        for prefix, cls in zip(["", "slot_"], classes):
+            func: Callable[[], dict] = (
+                lambda cls=cls, kwargs=kwargs: run_data_object(cls, kwargs)
+            )
+            benchmark(prefix + name)(func)
+
+
+register_data_objects()
+
+
+def get_commit() -> str:
+    """
+    Get current git commit hash, empty if not in a git repository.
+    """
+    try:
+        output: bytes = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            stderr=subprocess.DEVNULL
+        )
+        return output.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run_benchmarks(names: List[str], repeat: int) -> dict:
+    """
+    Run benchmarks and keep the result of median rate among repeats.
+    """
+    results: Dict[str, dict] = {}
+
+    for name in names:
+        runs: List[dict] = [BENCHMARKS[name]() for _ in range(repeat)]
+        rate: float = median(run["rate"] for run in runs)
+        result: dict = min(runs, key=lambda run: abs(run["rate"] - rate))
+        results[name] = result
+
+        print(f"{name:<40}{result['rate']:>16,.0f} /s")
+
+    return {
+        "commit": get_commit(),
+        "datetime": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare_results(data: dict, baseline: dict) -> None:
+    """
+    Print rate change of each benchmark compared with baseline.
+    """
+    print(f"\nCompared with {baseline.get('commit', '') or 'baseline'}:")
+
+    for name, result in data["results"].items():
+        base_result: dict = baseline["results"].get(name, None)
+        if not base_result:
+            continue
+
+        change: float = result["rate"] / base_result["rate"] - 1
+        print(f"{name:<40}{change:>+15.1%}")
+
+
+def main() -> None:
+    """"""
+    parser: ArgumentParser = ArgumentParser(description="vn.py benchmark suite")
+    parser.add_argument("-k", "--keyword", nargs="*", default=[],
+                        help="only run benchmarks whose name contains keyword")
+    parser.add_argument("-o", "--output", default="benchmark_result.json",
+                        help="json file for writing results")
+    parser.add_argument("-c", "--compare", default="",
+                        help="json file of results to compare with")
+    parser.add_argument("-r", "--repeat", type=int, default=3,
+                        help="number of runs of each benchmark")
+    args: Namespace = parser.parse_args()
+
+    names: List[str] = [
+        name for name in BENCHMARKS
+        if not args.keyword or any(keyword in name for keyword in args.keyword)
+    ]
+    data: dict = run_benchmarks(names, args.repeat)
+
+    with open(args.output, "w") as f:
+        json.dump(data, f, indent=4)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare_results(data, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Check that chunks yielded by iter_by_period never exceed chunk_size, and
+cover all data exactly once, when start is far before data and data has
+long gaps.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import List
+
+from vnpy.trader.database import (
+    INTERVAL_DELTA_MAP,
+    MAX_TICK_CHUNK_PERIOD,
+    TICK_CHUNK_PERIOD,
+    iter_by_period
+)
+from vnpy.trader.constant import Interval
+from vnpy.trader.object import BarData
+
+from benchmark_suite import generate_bars, generate_ticks
+
+
+def check(
+    datetimes: List[datetime],
+    start: datetime,
+    end: datetime,
+    period: timedelta,
+    chunk_size: int,
+    max_period: timedelta = None
+) -> tuple:
+    """
+    Iterate sorted datetimes and return number of chunks and loads.
+    """
+    loads: List[int] = [0]
+
+    def load(start: datetime, end: datetime) -> List[datetime]:
+        loads[0] += 1
+        return datetimes[bisect_left(datetimes, start):bisect_right(datetimes, end)]
+
+    result: List[datetime] = []
+    chunks: int = 0
+    for chunk in iter_by_period(load, start, end, period, chunk_size, max_period):
+        assert 0 < len(chunk) <= chunk_size, len(chunk)
+        result.extend(chunk)
+        chunks += 1
+
+    expected: List[datetime] = [dt for dt in datetimes if start <= dt <= end]
+    assert result == expected, (len(result), len(expected))
+    return chunks, loads[0]
+
+
+def main() -> None:
+    """"""
+    chunk_size: int = 10_000
+
+    bars: List[BarData] = generate_bars(100_000)
+    bar_datetimes: List[datetime] = [bar.datetime for bar in bars]
+
+    # Data with a gap of one year in the middle
+    gapped: List[datetime] = (
+        bar_datetimes[:50_000]
+        + [dt + timedelta(days=365) for dt in bar_datetimes[50_000:]]
+    )
+
+    tick_datetimes: List[datetime] = sorted(tick.datetime for tick in generate_ticks(100_000, 1))
+
+    for interval in [Interval.MINUTE, Interval.HOUR]:
+        period: timedelta = INTERVAL_DELTA_MAP[interval] * chunk_size
+
+        for name, datetimes in [("continuous", bar_datetimes), ("gapped", gapped)]:
+            for years in [0, 1, 5]:
+                start: datetime = datetimes[0] - timedelta(days=365 * years)
+                end: datetime = datetimes[-1] + timedelta(days=365 * years)
+
+                chunks, loads = check(datetimes, start, end, period, chunk_size)
+                print(f"{interval.value:>3} {name:<10} {years} years before {chunks:>4} chunks {loads:>6} loads")
+
+    for years in [0, 1, 5]:
+        start = tick_datetimes[0] - timedelta(days=365 * years)
+        end = tick_datetimes[-1]
+
+        chunks, loads = check(
+            tick_datetimes, start, end, TICK_CHUNK_PERIOD, chunk_size, MAX_TICK_CHUNK_PERIOD
+        )
+        print(f"tick {years} years before {chunks:>4} chunks {loads:>6} loads")
+
+
+if __name__ == "__main__":
+    main()
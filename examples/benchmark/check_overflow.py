@@ -0,0 +1,64 @@
+"""
+Check that a bounded EventEngine with CONFLATE policy stays within capacity
+when flooded with events, both with and without vt_symbol in event data.
+"""
+
+from types import SimpleNamespace
+from typing import List, Tuple
+
+from vnpy.event import Event, EventEngine, OverflowPolicy
+
+
+CAPACITY: int = 100
+SYMBOL_COUNT: int = 10
+
+
+def flood(events: List[Event]) -> Tuple[int, int]:
+    """
+    Put events into engine not started, and return number of events
+    queued and dropped.
+    """
+    dropped: List[Event] = []
+    engine: EventEngine = EventEngine(
+        capacity=CAPACITY,
+        default_policy=OverflowPolicy.CONFLATE,
+        on_overflow=lambda event, policy: dropped.append(event)
+    )
+
+    for event in events:
+        engine.put(event)
+
+    queued: int = sum(engine.get_queue_sizes().values())
+    return queued, len(dropped)
+
+
+def main() -> None:
+    """"""
+    count: int = 10_000
+
+    # Events without vt_symbol can not be conflated, so are dropped
+    events: List[Event] = [Event("eLog", SimpleNamespace(msg=str(i))) for i in range(count)]
+    queued, dropped = flood(events)
+    assert queued == CAPACITY, queued
+    assert queued + dropped == count, (queued, dropped)
+    print(f"no vt_symbol   queued {queued:>5} dropped {dropped:>5}")
+
+    events = [Event("eLog") for i in range(count)]
+    queued, dropped = flood(events)
+    assert queued == CAPACITY, queued
+    assert queued + dropped == count, (queued, dropped)
+    print(f"no data        queued {queued:>5} dropped {dropped:>5}")
+
+    # Events with vt_symbol exceed capacity by at most one per vt_symbol
+    events = [
+        Event("eTick.", SimpleNamespace(vt_symbol=f"{i % SYMBOL_COUNT}.SHFE"))
+        for i in range(count)
+    ]
+    queued, dropped = flood(events)
+    assert queued <= CAPACITY + SYMBOL_COUNT, queued
+    assert dropped == 0, dropped
+    print(f"with vt_symbol queued {queued:>5} dropped {dropped:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Cross-check bars of BarResampler with those pushed by BarGenerator and
+MultiBarGenerator, on continuous history and on history with session
+gaps, random gaps, sparse minute 59 bars and timezone-aware datetimes.
+"""
+
+from datetime import time
+from random import Random
+from typing import Dict, List
+
+from vnpy.trader.constant import Interval
+from vnpy.trader.object import BarData
+from vnpy.trader.resampler import BarResampler
+from vnpy.trader.utility import BarGenerator, MultiBarGenerator, ZoneInfo
+
+from benchmark_suite import generate_bars
+
+
+# Interval is not compared, as BarGenerator leaves it empty in some windows
+FIELDS: List[str] = [
+    "datetime", "open_price", "high_price", "low_price",
+    "close_price", "volume", "turnover", "open_interest"
+]
+
+# Same trading sessions as SHFE futures with night session
+SESSIONS: List[tuple] = [
+    (time(9, 0), time(10, 15)),
+    (time(10, 30), time(11, 30)),
+    (time(13, 30), time(15, 0)),
+    (time(21, 0), time(23, 0)),
+]
+
+
+def in_session(bar: BarData) -> bool:
+    """"""
+    t: time = bar.datetime.time()
+    return any(start <= t < end for start, end in SESSIONS)
+
+
+def generate_histories() -> Dict[str, List[BarData]]:
+    """
+    Generate 1 minute bar histories of different gap patterns.
+    """
+    random: Random = Random(1)
+    bars: List[BarData] = generate_bars(20_000)
+
+    # About 140 days, long enough for windows of daily and weekly bars
+    long_bars: List[BarData] = generate_bars(200_000, seed=3)
+
+    tz_bars: List[BarData] = generate_bars(5_000, seed=2)
+    tz: ZoneInfo = ZoneInfo("Asia/Shanghai")
+    for bar in tz_bars:
+        bar.datetime = bar.datetime.replace(tzinfo=tz)
+
+    return {
+        "continuous": bars,
+        "sessions": [bar for bar in bars if in_session(bar)],
+        "random_gaps": [bar for bar in bars if random.random() < 0.3],
+        "sparse_59": [bar for bar in bars if bar.datetime.minute in {0, 30, 59} and random.random() < 0.6],
+        "timezone": tz_bars,
+        "long": [bar for bar in long_bars if in_session(bar)],
+    }
+
+
+def check(
+    bars: List[BarData],
+    window: int,
+    interval: Interval,
+    daily_end: time = None,
+    generator_window: int = 0,
+    generator_interval: Interval = None
+) -> int:
+    """
+    Check that resampled bars are exactly the same as generated ones,
+    and return the count of them. Generator arguments are the same as
+    resampler if not given.
+    """
+    generated: List[BarData] = []
+    generator: BarGenerator = BarGenerator(
+        lambda bar: None,
+        generator_window or window,
+        generated.append,
+        generator_interval or interval,
+        daily_end
+    )
+    for bar in bars:
+        generator.update_bar(bar)
+
+    return compare(bars, window, interval, daily_end, generated)
+
+
+def check_multi(bars: List[BarData], window: int, interval: Interval, daily_end: time = None) -> int:
+    """
+    Check that resampled bars are exactly the same as those pushed by
+    MultiBarGenerator, and return the count of them.
+    """
+    generated: List[BarData] = []
+    generator: MultiBarGenerator = MultiBarGenerator(daily_end)
+    generator.add_window(window, interval, generated.append)
+    for bar in bars:
+        generator.update_bar(bar)
+
+    return compare(bars, window, interval, daily_end, generated)
+
+
+def compare(
+    bars: List[BarData],
+    window: int,
+    interval: Interval,
+    daily_end: time,
+    generated: List[BarData]
+) -> int:
+    """
+    Check that resampled bars are exactly the same as generated ones,
+    and return the count of them.
+    """
+    resampled: List[BarData] = BarResampler(window, interval, daily_end).resample_bars(bars)
+
+    assert len(resampled) == len(generated), (window, interval, len(resampled), len(generated))
+    for a, b in zip(resampled, generated):
+        for name in FIELDS:
+            assert getattr(a, name) == getattr(b, name), (window, interval, name, a, b)
+
+    return len(resampled)
+
+
+def main() -> None:
+    """"""
+    for name, bars in generate_histories().items():
+        count: int = 0
+
+        # Windows not dividing 60 continue across hours by minute of hour
+        for window in [1, 2, 3, 5, 7, 15, 30, 45]:
+            count += check(bars, window, Interval.MINUTE)
+            count += check_multi(bars, window, Interval.MINUTE)
+        count += check(bars, 1, Interval.MINUTE_15, generator_window=15, generator_interval=Interval.MINUTE)
+        count += check_multi(bars, 1, Interval.MINUTE_15)
+
+        for window in [1, 2, 4]:
+            count += check(bars, window, Interval.HOUR)
+            count += check_multi(bars, window, Interval.HOUR)
+        count += check(bars, 1, Interval.HOUR_4, generator_window=4, generator_interval=Interval.HOUR)
+        count += check_multi(bars, 1, Interval.HOUR_4)
+
+        for daily_end in [time(14, 59), time(22, 59), time(8, 59)]:
+            count += check(bars, 1, Interval.DAILY, daily_end)
+
+            for window in [1, 2, 5]:
+                count += check_multi(bars, window, Interval.DAILY, daily_end)
+                count += check_multi(bars, window, Interval.WEEKLY, daily_end)
+
+        print(f"{name:<12} {len(bars):>6} bars {count:>6} window bars matched")
+
+    for interval in [Interval.SECOND, Interval.TICK]:
+        try:
+            BarResampler(1, interval)
+        except ValueError:
+            continue
+        raise AssertionError(f"{interval} should be rejected")
+
+
+if __name__ == "__main__":
+    main()
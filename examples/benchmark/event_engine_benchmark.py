@@ -0,0 +1,60 @@
+"""
+Measure dispatch throughput of EventEngine with different batch sizes.
+"""
+
+from threading import Event as Flag
+from time import perf_counter
+from typing import List
+
+from vnpy.event import Event, EventEngine
+
+
+EVENT_BENCHMARK = "eBenchmark"
+EVENT_COUNT = 200_000
+FRAME_SIZE = 20
+
+
+def run_benchmark(batch_size: int, put_many: bool) -> float:
+    """
+    Return events dispatched per second.
+    """
+    engine: EventEngine = EventEngine(batch_size=batch_size)
+    finished: Flag = Flag()
+    processed: List[int] = [0]
+
+    def process_event(event: Event) -> None:
+        processed[0] += 1
+        if processed[0] == EVENT_COUNT:
+            finished.set()
+
+    engine.register(EVENT_BENCHMARK, process_event)
+    engine.start()
+
+    events: List[Event] = [Event(EVENT_BENCHMARK, i) for i in range(EVENT_COUNT)]
+
+    start: float = perf_counter()
+
+    if put_many:
+        for i in range(0, EVENT_COUNT, FRAME_SIZE):
+            engine.put_many(events[i:i + FRAME_SIZE])
+    else:
+        for event in events:
+            engine.put(event)
+
+    finished.wait()
+    cost: float = perf_counter() - start
+
+    engine.stop()
+    return EVENT_COUNT / cost
+
+
+def main() -> None:
+    """"""
+    for batch_size in [1, 64, 1024]:
+        for put_many in [False, True]:
+            rate: float = run_benchmark(batch_size, put_many)
+            print(f"batch_size={batch_size:<5} put_many={put_many!s:<5} {rate:,.0f} events/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,10 @@
-from .engine import Event, EventEngine, EVENT_TIMER
+from .engine import (
+    Event,
+    EventEngine,
+    ShardedEventEngine,
+    OverflowPolicy,
+    EVENT_TIMER,
+    EVENT_EVENT_STATS
+)
+from .async_engine import AsyncEventEngine
+from .journal import EventJournal, JournalReader, JournalReplayer
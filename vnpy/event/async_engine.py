@@ -0,0 +1,288 @@
+"""
+Event engine running on asyncio event loop.
+"""
+
+import asyncio
+from concurrent.futures import Future
+from inspect import isawaitable
+from threading import Thread, get_ident
+from time import perf_counter
+from typing import Any, Coroutine, Dict, Iterable, List, Tuple
+
+from .engine import Event, EventEngine, EVENT_TIMER
+from .timer import TimerHandle
+
+
+class AsyncEventEngine(EventEngine):
+    """
+    Event engine which distributes events on an asyncio event loop.
+
+    Both plain functions and coroutine functions can be registered as
+    handler, coroutine handlers are awaited one by one so that events
+    are still processed in order.
+
+    Event can be put from any thread, and timer event is generated by
+    scheduling callback on the loop instead of a sleeping thread.
+    """
+
+    def __init__(
+        self,
+        interval: int = 1,
+        loop: asyncio.AbstractEventLoop = None,
+        stats: bool = False,
+        stats_interval: int = 0
+    ) -> None:
+        """
+        If loop is not specified, a new event loop is created and run
+        in its own thread after start. Otherwise the loop passed in
+        should be run by the caller.
+        """
+        super().__init__(interval, stats=stats, stats_interval=stats_interval)
+
+        if loop:
+            self._loop: asyncio.AbstractEventLoop = loop
+            self._own_loop: bool = False
+        else:
+            self._loop = asyncio.new_event_loop()
+            self._own_loop = True
+
+        self._queue: asyncio.Queue = None
+        self._buffer: List[Event] = []
+        self._task: asyncio.Task = None
+        self._timer_handle: asyncio.TimerHandle = None
+        self._timer_start: float = 0
+        self._timer_count: int = 0
+
+        self._thread: Thread = Thread(target=self._run_loop)
+        self._loop_thread_id: int = 0
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Get the event loop which events are processed on.
+        """
+        return self._loop
+
+    def _run_loop(self) -> None:
+        """
+        Run event loop in its own thread.
+        """
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _start_loop(self) -> None:
+        """
+        Create queue and tasks inside the loop thread.
+        """
+        self._loop_thread_id = get_ident()
+        self._queue = asyncio.Queue()
+        self._put_events(self._buffer)
+        self._buffer = []
+
+        self._task = self._loop.create_task(self._run_async())
+
+        self._timer_start = self._loop.time()
+        self._timer_count = 0
+        self._schedule_timer()
+
+    def _stop_loop(self) -> None:
+        """
+        Cancel tasks inside the loop thread.
+        """
+        if self._timer_handle:
+            self._timer_handle.cancel()
+
+        if self._task:
+            self._task.cancel()
+
+        # Stop loop after the cancelled task finished
+        if self._own_loop:
+            self._loop.call_soon(self._loop.stop)
+
+    async def _run_async(self) -> None:
+        """
+        Get event from queue and then process it.
+        """
+        while self._active:
+            event: Event = await self._queue.get()
+            await self._process_async(event)
+
+    async def _process_async(self, event: Event) -> None:
+        """
+        Distribute event to handlers registered and general handlers,
+        awaiting the result of coroutine handlers.
+        """
+        if self._stats_active:
+            await self._process_async_stats(event)
+            return
+
+        if event.type in self._handlers:
+            for handler in self._handlers[event.type]:
+                result: Any = handler(event)
+                if isawaitable(result):
+                    await result
+
+        for handler in self._general_handlers:
+            result = handler(event)
+            if isawaitable(result):
+                await result
+
+    async def _process_async_stats(self, event: Event) -> None:
+        """
+        Same as _process_async, but records waiting time of event and
+        calling time (including await) of each handler.
+        """
+        start: float = perf_counter()
+        if event.time:
+            self._get_stats(self._wait_stats, event.type).update(start - event.time)
+
+        handlers: list = list(self._handlers.get(event.type, [])) + self._general_handlers
+        for handler in handlers:
+            start = perf_counter()
+
+            result: Any = handler(event)
+            if isawaitable(result):
+                await result
+
+            cost: float = perf_counter() - start
+            self._get_stats(self._handler_stats, (event.type, handler)).update(cost)
+
+    def _schedule_timer(self) -> None:
+        """
+        Schedule next timer event at fixed rate, so that the delay of
+        each callback does not accumulate.
+        """
+        self._timer_count += 1
+        when: float = self._timer_start + self._timer_count * self._interval
+        self._timer_handle = self._loop.call_at(when, self._on_timer)
+
+    def _on_timer(self) -> None:
+        """
+        Generate a timer event and schedule the next one.
+        """
+        if not self._active:
+            return
+
+        self._put_events([Event(EVENT_TIMER)])
+        self._schedule_timer()
+
+        if self._stats_active:
+            self._update_stats()
+
+    def _sample_queue(self) -> Tuple[int, float]:
+        """
+        Get number of queued events, age of events is not tracked.
+        """
+        if not self._queue:
+            return len(self._buffer), 0
+        return self._queue.qsize(), 0
+
+    def _add_timer(self, handle: TimerHandle) -> None:
+        """
+        Schedule timer handle on event loop.
+        """
+        self._loop.call_soon_threadsafe(self._call_at, handle)
+
+    def _call_at(self, handle: TimerHandle) -> None:
+        """
+        Call timer handle at its deadline, loop time is also monotonic.
+        """
+        if not handle.cancelled:
+            self._loop.call_at(handle.when, self._fire_timer, handle)
+
+    def _fire_timer(self, handle: TimerHandle) -> None:
+        """
+        Call timer callback and schedule the next period.
+        """
+        if handle.cancelled:
+            return
+
+        handle.callback()
+
+        if handle.next(self._loop.time()):
+            self._call_at(handle)
+
+    def _put_events(self, events: List[Event]) -> None:
+        """
+        Put events into queue, should be called in loop thread.
+        Events put before start are buffered until queue created.
+        """
+        if not self._queue:
+            self._buffer.extend(events)
+            return
+
+        for event in events:
+            self._queue.put_nowait(event)
+
+    def start(self) -> None:
+        """
+        Start processing events and generating timer events.
+        """
+        self._active = True
+
+        if self._own_loop:
+            self._thread.start()
+
+        self._loop.call_soon_threadsafe(self._start_loop)
+
+    def stop(self) -> None:
+        """
+        Stop event engine.
+        """
+        self._active = False
+
+        if self._loop.is_closed():
+            return
+
+        self._loop.call_soon_threadsafe(self._stop_loop)
+
+        if self._own_loop:
+            self._thread.join()
+            self._loop.close()
+
+    def put(self, event: Event) -> None:
+        """
+        Put an event object into event queue, which can be called
+        from any thread.
+        """
+        self.put_many([event])
+
+    def put_many(self, events: Iterable[Event]) -> None:
+        """
+        Put several event objects into event queue at once. Events put
+        after stopped are dropped, as gateways and apps may still write
+        logs while closing.
+        """
+        if self._loop.is_closed() or (not self._active and self._loop_thread_id):
+            return
+
+        events: List[Event] = list(events)
+
+        if self._stats_active:
+            now: float = perf_counter()
+            for event in events:
+                event.time = now
+
+        if get_ident() == self._loop_thread_id:
+            self._put_events(events)
+        else:
+            # Loop may be closed by stop in another thread since checked
+            try:
+                self._loop.call_soon_threadsafe(self._put_events, events)
+            except RuntimeError:
+                pass
+
+    def run_coroutine(self, coro: Coroutine) -> Future:
+        """
+        Run a coroutine on the event loop from any thread, so that
+        gateways can share the loop instead of starting own threads.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def get_queue_sizes(self) -> Dict[int, int]:
+        """
+        Get number of queued events.
+        """
+        if not self._queue:
+            return {0: 0}
+        return {0: self._queue.qsize()}
@@ -2,13 +2,18 @@
 Event-driven framework of VeighNa framework.
 """
 
-from collections import defaultdict
-from queue import Empty, Queue
-from threading import Thread
-from time import sleep
-from typing import Any, Callable, List
+from bisect import bisect_left
+from collections import defaultdict, deque
+from enum import Enum
+from threading import Condition, Lock, Thread, get_ident
+from time import monotonic, perf_counter, time
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from .timer import TimerHandle, TimerWheel
 
 EVENT_TIMER = "eTimer"
+EVENT_EVENT_STATS = "eEventStats"
+EVENT_SCHEDULE = "eSchedule"
 
 
 class Event:
@@ -22,44 +27,373 @@ class Event:
         """"""
         self.type: str = type
         self.data: Any = data
+        self.time: float = 0        # Time put into queue, only set when stats active
 
 
 # Defines handler function to be used in event engine.
 HandlerType: callable = Callable[[Event], None]
 
 
+class OverflowPolicy(Enum):
+    """
+    What to do when putting event into a full event queue.
+    """
+
+    BLOCK = "block"                 # Wait until queue has space
+    DROP_OLDEST = "drop_oldest"     # Drop the oldest event of the same lane
+    DROP_NEWEST = "drop_newest"     # Drop the event being put
+    CONFLATE = "conflate"           # Replace data of pending event with same vt_symbol
+
+
+# Defines callback function called with event dropped and policy.
+OverflowCallback = Callable[[Event, OverflowPolicy], None]
+
+
+def match_type(type: str, keys: Iterable[str]) -> Optional[str]:
+    """
+    Find the key equal to event type, otherwise the longest key
+    which event type starts with.
+    """
+    if type in keys:
+        return type
+
+    matched: str = None
+    for key in keys:
+        if type.startswith(key) and (matched is None or len(key) > len(matched)):
+            matched = key
+    return matched
+
+
+class LatencyStats:
+    """
+    Call count, cumulative time, max time and histogram of latency.
+    """
+
+    # Upper bounds (seconds) of histogram buckets
+    buckets: List[float] = [1e-5, 1e-4, 1e-3, 1e-2, 1e-1, float("inf")]
+
+    def __init__(self) -> None:
+        """"""
+        self.count: int = 0
+        self.total: float = 0
+        self.max: float = 0
+        self.histogram: List[int] = [0] * len(self.buckets)
+
+    def update(self, cost: float) -> None:
+        """
+        Record one latency value.
+        """
+        self.count += 1
+        self.total += cost
+        if cost > self.max:
+            self.max = cost
+        self.histogram[bisect_left(self.buckets, cost)] += 1
+
+    def merge(self, other: "LatencyStats") -> None:
+        """
+        Add values recorded by another stats object.
+        """
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+    def to_dict(self) -> dict:
+        """"""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "average": self.total / self.count if self.count else 0,
+            "max": self.max,
+            "histogram": list(self.histogram)
+        }
+
+
 class EventEngine:
     """
     Event engine distributes event object based on its type
     to those handlers registered.
 
     It also generates timer event by every interval seconds,
-    which can be used for timing purpose.
+    which can be used for timing purpose. Callbacks with millisecond
+    resolution can be scheduled by schedule and schedule_every.
     """
 
-    def __init__(self, interval: int = 1) -> None:
+    def __init__(
+        self,
+        interval: int = 1,
+        batch_size: int = 1,
+        priorities: Dict[str, int] = None,
+        starvation_limit: int = 100,
+        conflate_types: List[str] = None,
+        stats: bool = False,
+        stats_interval: int = 0,
+        stats_samples: int = 600,
+        capacity: int = 0,
+        overflow_policies: Dict[str, OverflowPolicy] = None,
+        default_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        on_overflow: OverflowCallback = None
+    ) -> None:
         """
         Timer event is generated every 1 second by default, if
         interval not specified.
+
+        Events are dispatched one by one by default. If batch_size is
+        larger than 1, all queued events (at most batch_size) are taken
+        out of queue with one lock acquisition and then dispatched in order.
+
+        Priorities is a dict of event type (or type prefix) to priority
+        class, smaller number means higher priority. Each priority class
+        has its own FIFO lane and higher lanes are always served first,
+        while a waiting lower lane is served once it has been skipped for
+        starvation_limit times. Event types not listed use the lowest lane.
+
+        Event types (or type prefixes) in conflate_types are conflated by
+        vt_symbol of event data: if an event of the same type and vt_symbol
+        is still waiting in queue, its data is replaced by the newest one
+        instead of queueing another event.
+
+        If stats is True, calling time of each (event type, handler) and
+        waiting time of each event type in queue are recorded. Queue depth
+        and age of the oldest event are sampled on every timer interval,
+        keeping at most stats_samples records. If stats_interval is not 0,
+        EVENT_EVENT_STATS with get_stats() data is put every stats_interval
+        timer intervals.
+
+        If capacity is not 0, number of queued events is bounded, and the
+        policy of event type (or type prefix) in overflow_policies decides
+        what to do when queue is full, default_policy is used for types not
+        listed. Event thread itself is never blocked. Every event dropped
+        is counted and passed to on_overflow callback. Events of CONFLATE
+        policy still get queued when there is no pending event to conflate,
+        so that queue exceeds capacity by at most one event per vt_symbol,
+        while those without vt_symbol are dropped when queue is full.
         """
         self._interval: int = interval
-        self._queue: Queue = Queue()
+        self._batch_size: int = max(batch_size, 1)
+        self._lock: Lock = Lock()
+        self._condition: Condition = Condition(self._lock)
+        self._not_full: Condition = Condition(self._lock)
         self._active: bool = False
         self._thread: Thread = Thread(target=self._run)
         self._timer: Thread = Thread(target=self._run_timer)
         self._handlers: defaultdict = defaultdict(list)
         self._general_handlers: List = []
 
+        self._priorities: Dict[str, int] = priorities or {}
+        self._starvation_limit: int = starvation_limit
+        self._lane_priorities: List[int] = sorted(set(self._priorities.values())) or [0]
+        self._lanes: List[Deque[Event]] = [deque() for _ in self._lane_priorities]
+        self._skips: List[int] = [0] * len(self._lanes)
+        self._size: int = 0
+
+        self._conflate_types: List[str] = conflate_types or []
+        self._pending: Dict[Tuple[str, str], Event] = {}
+        self._conflated: Dict[Tuple[str, str], int] = defaultdict(int)
+
+        self._capacity: int = capacity
+        self._overflow_policies: Dict[str, OverflowPolicy] = overflow_policies or {}
+        self._default_policy: OverflowPolicy = default_policy
+        self._on_overflow: OverflowCallback = on_overflow
+        self._overflow_counts: defaultdict = defaultdict(int)
+        self._blocked_count: int = 0
+
+        self._routes: Dict[str, Tuple[int, bool, OverflowPolicy]] = {}
+
+        self._stats_active: bool = stats
+        self._stats_interval: int = stats_interval
+        self._stats_count: int = 0
+        self._handler_stats: Dict[Tuple[str, HandlerType], LatencyStats] = {}
+        self._wait_stats: Dict[str, LatencyStats] = {}
+        self._samples: Deque[Tuple[float, int, float]] = deque(maxlen=stats_samples)
+
+        self._wheel: TimerWheel = TimerWheel()
+        self.register(EVENT_SCHEDULE, self._process_schedule_event)
+
     def _run(self) -> None:
         """
-        Get event from queue and then process it.
+        Get events from queue and then process them.
         """
         while self._active:
-            try:
-                event: Event = self._queue.get(block=True, timeout=1)
-                self._process(event)
-            except Empty:
-                pass
+            if self._stats_active:
+                process: Callable[[Event], None] = self._process_stats
+            else:
+                process = self._process
+
+            for event in self._get(timeout=1):
+                process(event)
+
+    def _get(self, timeout: float) -> List[Event]:
+        """
+        Wait for queued events and take out at most batch_size of them.
+        """
+        with self._condition:
+            if not self._size:
+                self._condition.wait(timeout)
+
+            count: int = min(self._size, self._batch_size)
+            self._size -= count
+
+            if len(self._lanes) == 1:
+                lane: Deque[Event] = self._lanes[0]
+                events: List[Event] = [lane.popleft() for _ in range(count)]
+            else:
+                events = [self._pop() for _ in range(count)]
+
+            if self._pending:
+                for event in events:
+                    self._release(event)
+
+            if self._capacity:
+                self._not_full.notify_all()
+
+            return events
+
+    def _release(self, event: Event) -> None:
+        """
+        Remove event taken out of queue from pending conflation.
+        """
+        key: tuple = (event.type, getattr(event.data, "vt_symbol", None))
+        if self._pending.get(key, None) is event:
+            self._pending.pop(key)
+
+    def _pop(self) -> Event:
+        """
+        Pop next event from the lanes according to priority.
+        """
+        lanes: List[Deque[Event]] = self._lanes
+        skips: List[int] = self._skips
+
+        index: int = -1
+        for i, lane in enumerate(lanes):
+            if not lane:
+                continue
+
+            if index < 0:
+                index = i
+            elif skips[i] >= self._starvation_limit:
+                index = i
+                break
+
+        # Lower lanes still waiting are skipped once more
+        for i in range(index + 1, len(lanes)):
+            if lanes[i]:
+                skips[i] += 1
+
+        skips[index] = 0
+        return lanes[index].popleft()
+
+    def _get_route(self, type: str) -> Tuple[int, bool, OverflowPolicy]:
+        """
+        Get index of the lane which the event type belongs to, whether
+        the event type should be conflated, and its overflow policy.
+        """
+        route: Optional[Tuple[int, bool, OverflowPolicy]] = self._routes.get(type, None)
+        if route:
+            return route
+
+        # Exact type first, then the longest matched type prefix
+        key: str = match_type(type, self._priorities)
+        if key is None:
+            index: int = len(self._lanes) - 1
+        else:
+            index = self._lane_priorities.index(self._priorities[key])
+
+        conflate: bool = match_type(type, self._conflate_types) is not None
+
+        key = match_type(type, self._overflow_policies)
+        if key is None:
+            policy: OverflowPolicy = self._default_policy
+        else:
+            policy = self._overflow_policies[key]
+
+        route = (index, conflate, policy)
+        self._routes[type] = route
+        return route
+
+    def _append(
+        self,
+        event: Event,
+        index: int,
+        conflate: bool,
+        policy: OverflowPolicy
+    ) -> Optional[Event]:
+        """
+        Append event into lane, should be called with condition locked.
+        Return event dropped because of overflow.
+        """
+        # Fast path for unbounded queue without conflation
+        if not conflate and not self._capacity:
+            self._lanes[index].append(event)
+            self._size += 1
+            return None
+
+        full: bool = bool(self._capacity) and self._size >= self._capacity
+
+        key: tuple = None
+        if conflate or policy is OverflowPolicy.CONFLATE:
+            vt_symbol: str = getattr(event.data, "vt_symbol", None)
+            if vt_symbol:
+                key = (event.type, vt_symbol)
+                pending: Event = self._pending.get(key, None)
+
+                if pending and (conflate or full):
+                    pending.data = event.data
+                    self._conflated[key] += 1
+                    return None
+
+        dropped: Optional[Event] = None
+        if full:
+            # Events of CONFLATE policy without vt_symbol can never be
+            # conflated, so they are dropped as DROP_NEWEST
+            if policy is OverflowPolicy.DROP_NEWEST or (policy is OverflowPolicy.CONFLATE and not key):
+                dropped = event
+            elif policy is OverflowPolicy.DROP_OLDEST:
+                lane: Deque[Event] = self._lanes[index]
+                if lane:
+                    dropped = lane.popleft()
+                    self._size -= 1
+                    self._release(dropped)
+                else:
+                    dropped = event
+
+            if dropped:
+                self._overflow_counts[dropped.type] += 1
+                if dropped is event:
+                    return dropped
+
+        if key:
+            self._pending[key] = event
+
+        self._lanes[index].append(event)
+        self._size += 1
+        return dropped
+
+    def _wait_not_full(self, policy: OverflowPolicy) -> None:
+        """
+        Block producer thread until queue has space, should be called
+        with condition locked.
+        """
+        if (
+            policy is not OverflowPolicy.BLOCK
+            or self._size < self._capacity
+            or get_ident() == self._thread.ident
+        ):
+            return
+
+        self._blocked_count += 1
+        while self._active and self._size >= self._capacity:
+            self._not_full.wait(1)
+
+    def _notify_overflow(self, dropped: List[Tuple[Event, OverflowPolicy]]) -> None:
+        """
+        Call overflow callback with events dropped and policy applied.
+        """
+        if not self._on_overflow:
+            return
+
+        for event, policy in dropped:
+            self._on_overflow(event, policy)
 
     def _process(self, event: Event) -> None:
         """
@@ -75,14 +409,111 @@ class EventEngine:
         if self._general_handlers:
             [handler(event) for handler in self._general_handlers]
 
+    def _process_stats(self, event: Event) -> None:
+        """
+        Same as _process, but records waiting time of event and
+        calling time of each handler.
+        """
+        start: float = perf_counter()
+        if event.time:
+            self._get_stats(self._wait_stats, event.type).update(start - event.time)
+
+        if event.type in self._handlers:
+            for handler in self._handlers[event.type]:
+                self._call_handler(handler, event)
+
+        for handler in self._general_handlers:
+            self._call_handler(handler, event)
+
+    def _call_handler(self, handler: HandlerType, event: Event) -> None:
+        """
+        Call handler and record its calling time.
+        """
+        start: float = perf_counter()
+        handler(event)
+        cost: float = perf_counter() - start
+
+        self._get_stats(self._handler_stats, (event.type, handler)).update(cost)
+
+    def _get_stats(self, stats_map: dict, key: Any) -> LatencyStats:
+        """
+        Get stats object of key, create one if not exists.
+        """
+        stats: LatencyStats = stats_map.get(key, None)
+        if not stats:
+            stats = LatencyStats()
+            stats_map[key] = stats
+        return stats
+
     def _run_timer(self) -> None:
         """
-        Sleep by interval second(s) and then generate a timer event.
+        Drive timer wheel and call timers expired.
         """
         while self._active:
-            sleep(self._interval)
-            event: Event = Event(EVENT_TIMER)
-            self.put(event)
+            self._wheel.wait()
+
+            for handle in self._wheel.advance():
+                if handle.direct:
+                    handle.callback()
+                else:
+                    self.put(Event(EVENT_SCHEDULE, handle))
+
+    def _add_timer(self, handle: TimerHandle) -> None:
+        """
+        Add timer handle into timer wheel.
+        """
+        self._wheel.add(handle)
+
+    def _on_timer(self) -> None:
+        """
+        Generate a timer event every interval second(s).
+        """
+        event: Event = Event(EVENT_TIMER)
+        self.put(event)
+
+        if self._stats_active:
+            self._update_stats()
+
+    def _process_schedule_event(self, event: Event) -> None:
+        """
+        Call scheduled callback in event thread.
+        """
+        handle: TimerHandle = event.data
+        if not handle.cancelled:
+            handle.callback()
+
+    def _update_stats(self) -> None:
+        """
+        Sample queue status on timer, and put stats event if needed.
+        """
+        size, age = self._sample_queue()
+        self._samples.append((time(), size, age))
+
+        if not self._stats_interval:
+            return
+
+        self._stats_count += 1
+        if self._stats_count >= self._stats_interval:
+            self._stats_count = 0
+            self.put(Event(EVENT_EVENT_STATS, self.get_stats()))
+
+    def _sample_queue(self) -> Tuple[int, float]:
+        """
+        Get number of queued events and age of the oldest one.
+        """
+        with self._condition:
+            size: int = self._size
+            times: List[float] = [lane[0].time for lane in self._lanes if lane and lane[0].time]
+
+        if not times:
+            return size, 0
+        return size, perf_counter() - min(times)
+
+    def _collect_stats(self) -> Tuple[dict, dict]:
+        """
+        Get copies of handler stats and wait stats dict.
+        """
+        return dict(self._handler_stats), dict(self._wait_stats)
 
     def start(self) -> None:
         """
@@ -90,6 +521,19 @@ class EventEngine:
         """
         self._active = True
         self._thread.start()
+        self._start_timer()
+
+    def _start_timer(self) -> None:
+        """
+        Schedule timer event and start timer thread.
+        """
+        handle: TimerHandle = TimerHandle(
+            self._on_timer,
+            monotonic() + self._interval,
+            self._interval,
+            direct=True
+        )
+        self._add_timer(handle)
         self._timer.start()
 
     def stop(self) -> None:
@@ -97,14 +541,148 @@ class EventEngine:
         Stop event engine.
         """
         self._active = False
+        self._wheel.wakeup()
         self._timer.join()
+
+        self._wakeup()
         self._thread.join()
 
+    def _wakeup(self) -> None:
+        """
+        Wake up event thread waiting on queue.
+        """
+        with self._condition:
+            self._condition.notify_all()
+
     def put(self, event: Event) -> None:
         """
         Put an event object into event queue.
         """
-        self._queue.put(event)
+        index, conflate, policy = self._get_route(event.type)
+
+        if self._stats_active:
+            event.time = perf_counter()
+
+        with self._condition:
+            if self._capacity:
+                self._wait_not_full(policy)
+
+            dropped: Optional[Event] = self._append(event, index, conflate, policy)
+            self._condition.notify()
+
+        if dropped:
+            self._notify_overflow([(dropped, policy)])
+
+    def put_many(self, events: Iterable[Event]) -> None:
+        """
+        Put several event objects into event queue at once, which
+        keeps their order and only acquires queue lock one time.
+        """
+        routes: List[Tuple[Event, Tuple[int, bool, OverflowPolicy]]] = [
+            (event, self._get_route(event.type)) for event in events
+        ]
+        dropped: List[Tuple[Event, OverflowPolicy]] = []
+
+        if self._stats_active:
+            now: float = perf_counter()
+            for event, _ in routes:
+                event.time = now
+
+        with self._condition:
+            for event, (index, conflate, policy) in routes:
+                if self._capacity:
+                    self._condition.notify()
+                    self._wait_not_full(policy)
+
+                dropped_event: Optional[Event] = self._append(event, index, conflate, policy)
+                if dropped_event:
+                    dropped.append((dropped_event, policy))
+            self._condition.notify()
+
+        if dropped:
+            self._notify_overflow(dropped)
+
+    def schedule(self, delay: float, callback: Callable[[], None]) -> TimerHandle:
+        """
+        Call callback once in event thread after delay second(s),
+        with millisecond resolution.
+        """
+        handle: TimerHandle = TimerHandle(callback, monotonic() + delay)
+        self._add_timer(handle)
+        return handle
+
+    def schedule_every(self, period: float, callback: Callable[[], None]) -> TimerHandle:
+        """
+        Call callback in event thread every period second(s), with
+        millisecond resolution and no accumulated drift.
+        """
+        handle: TimerHandle = TimerHandle(callback, monotonic() + period, period)
+        self._add_timer(handle)
+        return handle
+
+    def get_queue_sizes(self) -> Dict[int, int]:
+        """
+        Get number of queued events in each priority lane.
+        """
+        with self._condition:
+            return {
+                priority: len(lane)
+                for priority, lane in zip(self._lane_priorities, self._lanes)
+            }
+
+    def get_conflated_counts(self) -> Dict[Tuple[str, str], int]:
+        """
+        Get number of events conflated for each (event type, vt_symbol).
+        A tick put as both EVENT_TICK and EVENT_TICK + vt_symbol is
+        conflated and counted under each of the two types.
+        """
+        with self._condition:
+            return dict(self._conflated)
+
+    def get_overflow_counts(self) -> Dict[str, int]:
+        """
+        Get number of events dropped for each event type because of
+        queue overflow.
+        """
+        with self._condition:
+            return dict(self._overflow_counts)
+
+    def get_blocked_count(self) -> int:
+        """
+        Get number of times producers were blocked by full queue.
+        """
+        return self._blocked_count
+
+    def get_stats(self) -> dict:
+        """
+        Get statistics of handlers, event waiting time and queue status.
+        """
+        handler_stats, wait_stats = self._collect_stats()
+        size, age = self._sample_queue()
+
+        handlers: List[dict] = []
+        for (type, handler), stats in handler_stats.items():
+            d: dict = stats.to_dict()
+            d["type"] = type
+            d["handler"] = getattr(handler, "__qualname__", repr(handler))
+            handlers.append(d)
+
+        return {
+            "handlers": handlers,
+            "waits": {type: stats.to_dict() for type, stats in wait_stats.items()},
+            "queue_size": size,
+            "queue_sizes": self.get_queue_sizes(),
+            "oldest_age": age,
+            "samples": list(self._samples)
+        }
+
+    def reset_stats(self) -> None:
+        """
+        Clear all statistics recorded.
+        """
+        self._handler_stats = {}
+        self._wait_stats = {}
+        self._samples.clear()
 
     def register(self, type: str, handler: HandlerType) -> None:
         """
@@ -141,3 +719,203 @@ class EventEngine:
         """
         if handler in self._general_handlers:
             self._general_handlers.remove(handler)
+
+
+def get_vt_symbol(event: Event) -> Any:
+    """
+    Default key extractor of sharded event engine.
+    """
+    return getattr(event.data, "vt_symbol", None)
+
+
+class ShardedEventEngine(EventEngine):
+    """
+    Event engine which dispatches events in several shard threads.
+
+    Each event is routed to a shard by the key extracted from it
+    (vt_symbol of event data by default), so events with the same key
+    are always processed in order by the same thread, while a slow
+    handler only stalls the keys of its own shard.
+
+    Handlers registered are shared by all shards, which means a handler
+    listening to events of different keys may be called from different
+    threads and should be thread-safe.
+    """
+
+    def __init__(
+        self,
+        interval: int = 1,
+        shard_count: int = 4,
+        key_func: Callable[[Event], Any] = get_vt_symbol,
+        broadcast_types: List[str] = None,
+        global_shard: int = 0,
+        **kwargs
+    ) -> None:
+        """
+        Events without key (such as EVENT_TIMER and EVENT_LOG) are all
+        processed by the global shard, which keeps their order.
+
+        Event types (or type prefixes) in broadcast_types are put into
+        every shard instead, so their handlers are called once in every
+        shard thread.
+
+        Other keyword arguments are passed to EventEngine of each shard.
+        """
+        super().__init__(
+            interval,
+            stats=kwargs.get("stats", False),
+            stats_interval=kwargs.pop("stats_interval", 0)
+        )
+
+        self._key_func: Callable[[Event], Any] = key_func
+        self._broadcast_types: List[str] = broadcast_types or []
+        self._broadcasts: Dict[str, bool] = {}
+
+        self._shards: List[EventEngine] = []
+        for _ in range(shard_count):
+            shard: EventEngine = EventEngine(interval, **kwargs)
+            shard._handlers = self._handlers
+            shard._general_handlers = self._general_handlers
+            self._shards.append(shard)
+
+        self._global_shard: EventEngine = self._shards[global_shard]
+
+    def _get_shards(self, event: Event) -> List[EventEngine]:
+        """
+        Get shards which the event should be put into.
+        """
+        broadcast: Optional[bool] = self._broadcasts.get(event.type, None)
+        if broadcast is None:
+            broadcast = match_type(event.type, self._broadcast_types) is not None
+            self._broadcasts[event.type] = broadcast
+
+        if broadcast:
+            return self._shards
+
+        key: Any = self._key_func(event)
+        if key is None:
+            return [self._global_shard]
+
+        shard: EventEngine = self._shards[hash(key) % len(self._shards)]
+        return [shard]
+
+    def start(self) -> None:
+        """
+        Start shard threads to process events and generate timer events.
+        """
+        self._active = True
+
+        for shard in self._shards:
+            shard._active = True
+            shard._thread.start()
+
+        self._start_timer()
+
+    def stop(self) -> None:
+        """
+        Stop event engine and all shard threads.
+        """
+        self._active = False
+        self._wheel.wakeup()
+        self._timer.join()
+
+        for shard in self._shards:
+            shard._active = False
+            shard._wakeup()
+            shard._thread.join()
+
+    def put(self, event: Event) -> None:
+        """
+        Put an event object into queue of its shard.
+        """
+        for shard in self._get_shards(event):
+            shard.put(event)
+
+    def put_many(self, events: Iterable[Event]) -> None:
+        """
+        Put several event objects into queues of their shards, events
+        of each shard are put at once.
+        """
+        groups: Dict[EventEngine, List[Event]] = defaultdict(list)
+        for event in events:
+            for shard in self._get_shards(event):
+                groups[shard].append(event)
+
+        for shard, shard_events in groups.items():
+            shard.put_many(shard_events)
+
+    def get_queue_sizes(self) -> Dict[int, int]:
+        """
+        Get number of queued events in each priority lane of all shards.
+        """
+        sizes: Dict[int, int] = defaultdict(int)
+        for shard in self._shards:
+            for priority, size in shard.get_queue_sizes().items():
+                sizes[priority] += size
+        return dict(sizes)
+
+    def get_shard_sizes(self) -> List[int]:
+        """
+        Get number of queued events in each shard.
+        """
+        return [sum(shard.get_queue_sizes().values()) for shard in self._shards]
+
+    def _sample_queue(self) -> Tuple[int, float]:
+        """
+        Get number of queued events and age of the oldest one in all shards.
+        """
+        samples: List[Tuple[int, float]] = [shard._sample_queue() for shard in self._shards]
+        return sum(s[0] for s in samples), max(s[1] for s in samples)
+
+    def _collect_stats(self) -> Tuple[dict, dict]:
+        """
+        Merge handler stats and wait stats of all shards.
+        """
+        handler_stats: Dict[Tuple[str, HandlerType], LatencyStats] = {}
+        wait_stats: Dict[str, LatencyStats] = {}
+
+        for shard in self._shards:
+            shard_handler_stats, shard_wait_stats = shard._collect_stats()
+
+            for key, stats in shard_handler_stats.items():
+                self._get_stats(handler_stats, key).merge(stats)
+
+            for key, stats in shard_wait_stats.items():
+                self._get_stats(wait_stats, key).merge(stats)
+
+        return handler_stats, wait_stats
+
+    def reset_stats(self) -> None:
+        """
+        Clear all statistics recorded in all shards.
+        """
+        super().reset_stats()
+        for shard in self._shards:
+            shard.reset_stats()
+
+    def get_conflated_counts(self) -> Dict[Tuple[str, str], int]:
+        """
+        Get number of events conflated for each (event type, vt_symbol)
+        in all shards.
+        """
+        counts: Dict[Tuple[str, str], int] = defaultdict(int)
+        for shard in self._shards:
+            for key, count in shard.get_conflated_counts().items():
+                counts[key] += count
+        return dict(counts)
+
+    def get_overflow_counts(self) -> Dict[str, int]:
+        """
+        Get number of events dropped for each event type in all shards.
+        """
+        counts: Dict[str, int] = defaultdict(int)
+        for shard in self._shards:
+            for type, count in shard.get_overflow_counts().items():
+                counts[type] += count
+        return dict(counts)
+
+    def get_blocked_count(self) -> int:
+        """
+        Get number of times producers were blocked in all shards.
+        """
+        return sum(shard.get_blocked_count() for shard in self._shards)
@@ -0,0 +1,421 @@
+"""
+Binary journal for recording events and replaying them.
+"""
+
+import pickle
+from bisect import bisect_right
+from dataclasses import is_dataclass
+from enum import Enum
+from importlib import import_module
+from io import BytesIO
+from pathlib import Path
+from struct import Struct
+from threading import Lock
+from time import sleep, time
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from .engine import Event, EventEngine, EVENT_SCHEDULE
+
+
+# Record header: kind, capture time, payload length
+HEADER: Struct = Struct("<BdI")
+# Index entry: segment start time, segment file offset
+INDEX: Struct = Struct("<dQ")
+# Type id at the beginning of event payload
+TYPE_ID: Struct = Struct("<H")
+
+KIND_EVENT = 0
+KIND_TYPE = 1
+KIND_SHAPE = 2
+KIND_ENUM = 3
+
+
+class _Shape:
+    """
+    Class and attribute names of data objects written in journal.
+    """
+
+    def __init__(self, cls: type, names: Tuple[str, ...]) -> None:
+        """"""
+        self.cls: type = cls
+        self.names: Tuple[str, ...] = names
+
+    def create(self, values: tuple) -> Any:
+        """
+        Create data object without calling __init__.
+        """
+        obj: Any = self.cls.__new__(self.cls)
+        if hasattr(obj, "__dict__"):
+            obj.__dict__.update(zip(self.names, values))
+        else:
+            for name, value in zip(self.names, values):
+                setattr(obj, name, value)
+        return obj
+
+
+class _Pickler(pickle.Pickler):
+    """
+    Pickler writing enum members as ids defined in journal segment.
+    """
+
+    def __init__(self, file: BinaryIO, enum_ids: Dict[Enum, int]) -> None:
+        """"""
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.enum_ids: Dict[Enum, int] = enum_ids
+
+    def persistent_id(self, obj: Any) -> Optional[int]:
+        """"""
+        if isinstance(obj, Enum):
+            return self.enum_ids.get(obj, None)
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    """
+    Unpickler reading enum member ids defined in journal segment.
+    """
+
+    def __init__(self, file: BinaryIO, enums: List[Enum]) -> None:
+        """"""
+        super().__init__(file)
+        self.enums: List[Enum] = enums
+
+    def persistent_load(self, pid: int) -> Enum:
+        """"""
+        return self.enums[pid]
+
+
+class EventJournal:
+    """
+    Append-only binary journal recording every event passing through
+    event engine.
+
+    Data objects are written as a shape id plus a tuple of attribute
+    values, and event types, shapes and enum members are defined once
+    per segment, so that records stay compact. A new segment is started
+    every segment_size events, and its start time and file offset are
+    appended into the index file for seeking by time.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        event_engine: EventEngine = None,
+        segment_size: int = 100_000,
+        skip_types: List[str] = None
+    ) -> None:
+        """
+        Journal writes into path and path + ".index". If event_engine
+        is passed, journal is registered as its general handler.
+
+        Events of skip_types (internal EVENT_SCHEDULE by default) are not
+        recorded, and neither are events whose data cannot be pickled.
+        """
+        self.path: Path = Path(path)
+        self.index_path: Path = get_index_path(self.path)
+        self.segment_size: int = segment_size
+        self.skip_types: set = set(skip_types or [EVENT_SCHEDULE])
+        self.skipped: int = 0
+        self.event_engine: EventEngine = event_engine
+
+        self.file: BinaryIO = open(self.path, "ab")
+        self.index_file: BinaryIO = open(self.index_path, "ab")
+
+        self.buffer: BytesIO = BytesIO()
+        self.type_ids: Dict[str, int] = {}
+        self.shape_ids: Dict[Tuple[type, Tuple[str, ...]], int] = {}
+        self.enum_ids: Dict[Enum, int] = {}
+        self.pickler: _Pickler = _Pickler(self.buffer, self.enum_ids)
+        self.count: int = 0
+        self.lock: Lock = Lock()
+
+        if event_engine:
+            event_engine.register_general(self.process_event)
+
+    def process_event(self, event: Event) -> None:
+        """
+        Write event into journal.
+        """
+        self.write(event, time())
+
+    def write(self, event: Event, timestamp: float) -> None:
+        """
+        Write event with capture timestamp into journal.
+        """
+        if event.type in self.skip_types:
+            return
+
+        # General handlers may be called by several threads at the same
+        # time in ShardedEventEngine, while buffer, pickler and ids are shared
+        with self.lock:
+            self.write_event(event, timestamp)
+
+    def write_event(self, event: Event, timestamp: float) -> None:
+        """"""
+        if not self.count % self.segment_size:
+            self.start_segment(timestamp)
+        self.count += 1
+
+        type_id: int = self.type_ids.get(event.type, None)
+        if type_id is None:
+            type_id = len(self.type_ids)
+            self.type_ids[event.type] = type_id
+            self.write_record(KIND_TYPE, timestamp, event.type.encode("utf-8"))
+
+        value: tuple = self.convert_data(event.data, timestamp)
+
+        buffer: BytesIO = self.buffer
+        buffer.seek(0)
+        buffer.truncate()
+        buffer.write(TYPE_ID.pack(type_id))
+
+        self.pickler.clear_memo()
+        try:
+            self.pickler.dump(value)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            self.skipped += 1
+            return
+
+        self.write_record(KIND_EVENT, timestamp, buffer.getvalue())
+
+    def convert_data(self, data: Any, timestamp: float) -> tuple:
+        """
+        Convert dataclass object into shape id and attribute values,
+        other data is kept as it is with shape id -1.
+        """
+        if not is_dataclass(data) or isinstance(data, type):
+            return (-1, data)
+
+        values: Dict[str, Any] = get_attributes(data)
+        for value in values.values():
+            if isinstance(value, Enum) and value not in self.enum_ids:
+                self.enum_ids[value] = len(self.enum_ids)
+                self.write_record(KIND_ENUM, timestamp, pickle.dumps(value))
+
+        cls: type = type(data)
+        names: Tuple[str, ...] = tuple(values.keys())
+        key: Tuple[type, Tuple[str, ...]] = (cls, names)
+
+        shape_id: int = self.shape_ids.get(key, None)
+        if shape_id is None:
+            shape_id = len(self.shape_ids)
+            self.shape_ids[key] = shape_id
+
+            definition: tuple = (cls.__module__, cls.__qualname__, names)
+            self.write_record(KIND_SHAPE, timestamp, pickle.dumps(definition))
+
+        return (shape_id, tuple(values.values()))
+
+    def start_segment(self, timestamp: float) -> None:
+        """
+        Start a new segment which can be read independently.
+        """
+        self.file.flush()
+        self.index_file.write(INDEX.pack(timestamp, self.file.tell()))
+        self.index_file.flush()
+
+        self.type_ids.clear()
+        self.shape_ids.clear()
+        self.enum_ids.clear()
+
+    def write_record(self, kind: int, timestamp: float, payload: bytes) -> None:
+        """"""
+        self.file.write(HEADER.pack(kind, timestamp, len(payload)))
+        self.file.write(payload)
+
+    def flush(self) -> None:
+        """
+        Flush written records into file.
+        """
+        with self.lock:
+            self.file.flush()
+            self.index_file.flush()
+
+    def close(self) -> None:
+        """
+        Stop recording and close journal files.
+        """
+        if self.event_engine:
+            self.event_engine.unregister_general(self.process_event)
+
+        with self.lock:
+            self.file.close()
+            self.index_file.close()
+
+
+class JournalReader:
+    """
+    Reader of event journal, which can start reading from any time
+    by seeking the segment index.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """"""
+        self.path: Path = Path(path)
+
+        self.index: List[Tuple[float, int]] = []
+        with open(get_index_path(self.path), "rb") as f:
+            for entry in INDEX.iter_unpack(f.read()):
+                self.index.append(entry)
+
+    def get_segments(self) -> List[Tuple[float, int]]:
+        """
+        Get start time and file offset of each segment.
+        """
+        return list(self.index)
+
+    def read(
+        self,
+        start: float = 0,
+        end: float = 0
+    ) -> Iterator[Tuple[float, Event]]:
+        """
+        Yield capture timestamp and event of records between start
+        and end timestamp (0 means no limit).
+        """
+        offset: int = 0
+        if start and self.index:
+            i: int = bisect_right([entry[0] for entry in self.index], start) - 1
+            offset = self.index[max(i, 0)][1]
+
+        segment_offsets: set = {entry[1] for entry in self.index}
+
+        types: List[str] = []
+        shapes: List[_Shape] = []
+        enums: List[Enum] = []
+
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+
+            while True:
+                position: int = f.tell()
+                header: bytes = f.read(HEADER.size)
+                if len(header) < HEADER.size:
+                    break
+
+                kind, timestamp, length = HEADER.unpack(header)
+                payload: bytes = f.read(length)
+                if len(payload) < length:
+                    break
+
+                # Definitions are reset at the beginning of each segment
+                if position in segment_offsets:
+                    types.clear()
+                    shapes.clear()
+                    enums.clear()
+
+                if kind == KIND_TYPE:
+                    types.append(payload.decode("utf-8"))
+                elif kind == KIND_SHAPE:
+                    module_name, qualname, names = pickle.loads(payload)
+                    shapes.append(_Shape(load_class(module_name, qualname), names))
+                elif kind == KIND_ENUM:
+                    enums.append(pickle.loads(payload))
+                elif kind == KIND_EVENT:
+                    if timestamp < start:
+                        continue
+                    if end and timestamp > end:
+                        break
+
+                    type_id: int = TYPE_ID.unpack_from(payload)[0]
+                    buffer: BytesIO = BytesIO(payload)
+                    buffer.seek(TYPE_ID.size)
+                    shape_id, value = _Unpickler(buffer, enums).load()
+
+                    if shape_id >= 0:
+                        data: Any = shapes[shape_id].create(value)
+                    else:
+                        data = value
+
+                    yield timestamp, Event(types[type_id], data)
+
+
+class JournalReplayer:
+    """
+    Feed events recorded in journal into event engine, as fast as
+    possible or at scaled real-time speed.
+    """
+
+    def __init__(
+        self,
+        event_engine: EventEngine,
+        path: Union[str, Path],
+        max_pending: int = 10_000
+    ) -> None:
+        """
+        When replaying as fast as possible, putting is paused while more
+        than max_pending events are waiting in event engine.
+        """
+        self.event_engine: EventEngine = event_engine
+        self.reader: JournalReader = JournalReader(path)
+        self.max_pending: int = max_pending
+
+    def replay(
+        self,
+        start: float = 0,
+        end: float = 0,
+        speed: float = 0,
+        skip_types: List[str] = None
+    ) -> int:
+        """
+        Replay events between start and end timestamp and return number
+        of events replayed. Speed 0 means as fast as possible, otherwise
+        speed 1 is real-time and speed 10 is ten times faster.
+        """
+        skip_types: set = set(skip_types or [])
+        count: int = 0
+
+        first_timestamp: float = 0
+        replay_start: float = time()
+
+        for timestamp, event in self.reader.read(start, end):
+            if event.type in skip_types:
+                continue
+
+            if speed:
+                if not first_timestamp:
+                    first_timestamp = timestamp
+
+                delay: float = (timestamp - first_timestamp) / speed - (time() - replay_start)
+                if delay > 0:
+                    sleep(delay)
+            elif not count % 1000:
+                self.wait_pending()
+
+            self.event_engine.put(event)
+            count += 1
+
+        return count
+
+    def wait_pending(self) -> None:
+        """
+        Wait until number of events pending in event engine is under limit.
+        """
+        while sum(self.event_engine.get_queue_sizes().values()) > self.max_pending:
+            sleep(0.001)
+
+
+def get_index_path(path: Path) -> Path:
+    """
+    Get path of index file of journal.
+    """
+    return path.with_name(path.name + ".index")
+
+
+def get_attributes(obj: Any) -> Dict[str, Any]:
+    """
+    Get attributes of object with either __dict__ or __slots__.
+    """
+    if hasattr(obj, "__dict__"):
+        return obj.__dict__
+    return {name: getattr(obj, name) for name in obj.__slots__ if hasattr(obj, name)}
+
+
+def load_class(module_name: str, qualname: str) -> type:
+    """
+    Load class object by module name and qualified name.
+    """
+    obj: Any = import_module(module_name)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return obj
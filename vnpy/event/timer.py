@@ -0,0 +1,199 @@
+"""
+Hierarchical timer wheel used by event engine for scheduling callbacks.
+"""
+
+from math import ceil, floor
+from threading import Condition
+from time import monotonic
+from typing import Callable, List, Optional
+
+
+class TimerHandle:
+    """
+    Handle of a scheduled callback, which can be used for cancelling.
+
+    Time is in seconds of time.monotonic(). Periodic timer is scheduled
+    at fixed rate from its first deadline, so that the delay of each
+    call does not accumulate.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[], None],
+        when: float,
+        period: float = 0,
+        direct: bool = False
+    ) -> None:
+        """
+        If direct is True, callback is called in timer thread instead
+        of event thread.
+        """
+        self.callback: Callable[[], None] = callback
+        self.when: float = when
+        self.period: float = period
+        self.direct: bool = direct
+
+        self.first: float = when
+        self.count: int = 0
+        self.cancelled: bool = False
+
+    def cancel(self) -> None:
+        """
+        Cancel the scheduled callback.
+        """
+        self.cancelled = True
+
+    def next(self, now: float) -> bool:
+        """
+        Move deadline of periodic timer to the next period after now,
+        skipping periods missed. Return False for one-shot timer.
+        """
+        if not self.period or self.cancelled:
+            return False
+
+        self.count += 1
+        when: float = self.first + self.count * self.period
+
+        if when <= now:
+            self.count = floor((now - self.first) / self.period) + 1
+            when = self.first + self.count * self.period
+
+        self.when = when
+        return True
+
+
+class TimerWheel:
+    """
+    Hierarchical timer wheel with O(1) insertion and cancellation.
+
+    Each level has 2 ** slot_bits slots, one slot of level 0 lasts one
+    resolution tick, and one slot of higher level lasts a whole round of
+    the level below. Timers are moved down to lower level when the wheel
+    reaches their slot.
+    """
+
+    def __init__(
+        self,
+        resolution: float = 0.001,
+        slot_bits: int = 8,
+        level_count: int = 4
+    ) -> None:
+        """"""
+        self._resolution: float = resolution
+        self._bits: int = slot_bits
+        self._mask: int = (1 << slot_bits) - 1
+        self._levels: List[List[List[TimerHandle]]] = [
+            [[] for _ in range(1 << slot_bits)] for _ in range(level_count)
+        ]
+
+        self._base: float = monotonic()
+        self._tick: int = 0
+        self._count: int = 0
+        self._condition: Condition = Condition()
+
+    def _insert(self, handle: TimerHandle, min_tick: int) -> None:
+        """
+        Insert timer into slot, should be called with condition locked.
+        """
+        tick: int = max(ceil((handle.when - self._base) / self._resolution), min_tick)
+        diff: int = tick - self._tick
+
+        last: int = len(self._levels) - 1
+        for level in range(len(self._levels)):
+            span: int = 1 << (self._bits * (level + 1))
+            if diff < span or level == last:
+                # Timer beyond the top level waits in its farthest slot
+                if diff >= span:
+                    tick = self._tick + span - 1
+
+                slot: int = (tick >> (self._bits * level)) & self._mask
+                self._levels[level][slot].append(handle)
+                break
+
+        self._count += 1
+
+    def add(self, handle: TimerHandle) -> None:
+        """
+        Add timer into wheel, which can be called from any thread.
+        """
+        with self._condition:
+            self._insert(handle, self._tick + 1)
+            self._condition.notify()
+
+    def advance(self) -> List[TimerHandle]:
+        """
+        Move wheel to current time and return timers expired.
+        """
+        now: float = monotonic()
+        target: int = floor((now - self._base) / self._resolution)
+        expired: List[TimerHandle] = []
+
+        with self._condition:
+            while self._tick < target:
+                self._tick += 1
+                tick: int = self._tick
+
+                # Cascade from the highest level reached, so timers moved
+                # down are cascaded again by lower level in the same tick
+                top: int = 0
+                for level in range(1, len(self._levels)):
+                    if tick & ((1 << (self._bits * level)) - 1):
+                        break
+                    top = level
+
+                for level in range(top, 0, -1):
+                    slot: int = (tick >> (self._bits * level)) & self._mask
+                    handles: List[TimerHandle] = self._levels[level][slot]
+                    self._levels[level][slot] = []
+                    self._count -= len(handles)
+
+                    for handle in handles:
+                        if not handle.cancelled:
+                            self._insert(handle, tick)
+
+                slot = tick & self._mask
+                handles = self._levels[0][slot]
+                if handles:
+                    self._levels[0][slot] = []
+                    self._count -= len(handles)
+                    expired.extend(h for h in handles if not h.cancelled)
+
+            for handle in expired:
+                if handle.next(now):
+                    self._insert(handle, self._tick + 1)
+
+        return expired
+
+    def wait(self) -> None:
+        """
+        Wait until the next timer may expire or a new timer is added.
+        """
+        with self._condition:
+            self._condition.wait(self._get_timeout())
+
+    def wakeup(self) -> None:
+        """
+        Wake up thread waiting on the wheel.
+        """
+        with self._condition:
+            self._condition.notify_all()
+
+    def _get_timeout(self) -> Optional[float]:
+        """
+        Get seconds until the next non-empty slot of level 0, or the next
+        cascade of level 1. Return None if wheel is empty.
+        """
+        if not self._count:
+            return None
+
+        tick: int = self._tick
+        rest: int = (1 << self._bits) - (tick & self._mask)
+
+        step: int = rest
+        for i in range(1, rest):
+            if self._levels[0][(tick + i) & self._mask]:
+                step = i
+                break
+
+        when: float = self._base + (tick + step) * self._resolution
+        return max(when - monotonic(), 0)
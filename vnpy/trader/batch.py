@@ -0,0 +1,438 @@
+"""
+Columnar containers holding bar and tick data of one symbol as numpy arrays.
+"""
+
+import gc
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, tzinfo
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .constant import Exchange, Interval
+from .object import BarData, TickData
+
+
+BAR_COLUMNS: List[str] = [
+    "volume", "turnover", "open_interest",
+    "open_price", "high_price", "low_price", "close_price",
+]
+
+TICK_COLUMNS: List[str] = [
+    "volume", "turnover", "open_interest", "last_price", "last_volume",
+    "limit_up", "limit_down", "open_price", "high_price", "low_price", "pre_close",
+    "bid_price_1", "bid_price_2", "bid_price_3", "bid_price_4", "bid_price_5",
+    "ask_price_1", "ask_price_2", "ask_price_3", "ask_price_4", "ask_price_5",
+    "bid_volume_1", "bid_volume_2", "bid_volume_3", "bid_volume_4", "bid_volume_5",
+    "ask_volume_1", "ask_volume_2", "ask_volume_3", "ask_volume_4", "ask_volume_5",
+]
+
+BAR_ARRAY_NAMES: Dict[str, str] = {
+    "open_price": "open",
+    "high_price": "high",
+    "low_price": "low",
+    "close_price": "close",
+    "volume": "volume",
+    "turnover": "turnover",
+    "open_interest": "open_interest",
+}
+
+DATETIME_DTYPE: str = "datetime64[us]"
+
+EPOCH: datetime = datetime(1970, 1, 1)
+MICROSECOND: timedelta = timedelta(microseconds=1)
+
+
+class BaseBatch(ABC):
+    """
+    Batch of data objects of one symbol, stored as a datetime64 column
+    and float64 value columns.
+
+    Datetime is kept as naive local time of tz, which is attached again
+    when converting back to data objects. Slicing returns a batch of
+    views into the same arrays without copying.
+    """
+
+    columns: List[str] = []
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        gateway_name: str,
+        datetime: np.ndarray,
+        tz: Optional[tzinfo] = None,
+        **columns: np.ndarray
+    ) -> None:
+        """
+        Value columns not passed are filled with zeros.
+        """
+        self.symbol: str = symbol
+        self.exchange: Exchange = exchange
+        self.gateway_name: str = gateway_name
+        self.tz: Optional[tzinfo] = tz
+
+        self.datetime: np.ndarray = np.asarray(datetime, dtype=DATETIME_DTYPE)
+
+        count: int = len(self.datetime)
+        for name in self.columns:
+            column: np.ndarray = columns.get(name, None)
+            if column is None:
+                column = np.zeros(count)
+            else:
+                column = np.asarray(column, dtype=np.float64)
+            setattr(self, name, column)
+
+    @property
+    def vt_symbol(self) -> str:
+        """"""
+        return f"{self.symbol}.{self.exchange.value}"
+
+    def __len__(self) -> int:
+        """"""
+        return len(self.datetime)
+
+    def __getitem__(self, key: Union[int, slice, np.ndarray]) -> Union["BaseBatch", BarData, TickData]:
+        """
+        Get data object of integer position, or batch of slice and index
+        array. Batch of slice shares memory with this batch.
+        """
+        if isinstance(key, (int, np.integer)):
+            index: int = range(len(self))[key]
+            return self.get_object(index)
+
+        return self.take(key)
+
+    def get_meta(self) -> dict:
+        """
+        Get keyword arguments of fields other than columns.
+        """
+        return {
+            "symbol": self.symbol,
+            "exchange": self.exchange,
+            "gateway_name": self.gateway_name,
+            "tz": self.tz,
+        }
+
+    def get_columns(self) -> Dict[str, np.ndarray]:
+        """
+        Get dict of all columns including datetime.
+        """
+        columns: Dict[str, np.ndarray] = {"datetime": self.datetime}
+        for name in self.columns:
+            columns[name] = getattr(self, name)
+        return columns
+
+    def take(self, key: Union[slice, np.ndarray]) -> "BaseBatch":
+        """
+        Create batch with rows selected by slice, bool mask or index array.
+        """
+        columns: Dict[str, np.ndarray] = {
+            name: column[key] for name, column in self.get_columns().items()
+        }
+        return type(self)(**self.get_meta(), **columns)
+
+    def slice_by_datetime(self, start: datetime = None, end: datetime = None) -> "BaseBatch":
+        """
+        Get rows with datetime between start and end (both included)
+        without copying, the batch should be sorted.
+        """
+        begin: int = 0
+        if start:
+            begin = int(np.searchsorted(self.datetime, self.to_datetime64(start), "left"))
+
+        stop: int = len(self)
+        if end:
+            stop = int(np.searchsorted(self.datetime, self.to_datetime64(end), "right"))
+
+        return self.take(slice(begin, stop))
+
+    def sort(self) -> "BaseBatch":
+        """
+        Create batch sorted by datetime, rows with the same datetime
+        keep their order.
+        """
+        if len(self) < 2 or (self.datetime[1:] >= self.datetime[:-1]).all():
+            return self
+        return self.take(np.argsort(self.datetime, kind="stable"))
+
+    def to_datetime64(self, dt: datetime) -> np.datetime64:
+        """
+        Convert datetime into naive local time of batch.
+        """
+        if dt.tzinfo and self.tz:
+            dt = dt.astimezone(self.tz)
+        return np.datetime64(dt.replace(tzinfo=None), "us")
+
+    def to_datetimes(self, values: np.ndarray) -> List[datetime]:
+        """
+        Convert datetime64 values into datetime objects with tz.
+        """
+        if not self.tz:
+            return values.astype(datetime).tolist()
+
+        # Adding to aware datetime keeps its tzinfo, which is faster than
+        # replacing tzinfo of naive datetime
+        base: datetime = EPOCH.replace(tzinfo=self.tz)
+        microsecond: timedelta = MICROSECOND
+        return [base + microsecond * value for value in values.view(np.int64).tolist()]
+
+    def create_objects(self, template: Union[BarData, TickData]) -> list:
+        """
+        Create data objects of all rows by copying attributes of template,
+        which is much faster than calling constructor for each row.
+        """
+        cls: type = type(template)
+        attributes: dict = template.__dict__
+        datetimes: List[datetime] = self.to_datetimes(self.datetime)
+        rows: zip = zip(*[getattr(self, name).tolist() for name in self.columns])
+
+        # Objects created hold no reference cycle, while creating millions
+        # of them triggers garbage collection many times for nothing
+        gc_enabled: bool = gc.isenabled()
+        gc.disable()
+
+        try:
+            objs: list = []
+            for dt, values in zip(datetimes, rows):
+                obj: Union[BarData, TickData] = cls.__new__(cls)
+                d: dict = obj.__dict__
+                d.update(attributes)
+                d["datetime"] = dt
+                d.update(zip(self.columns, values))
+                objs.append(obj)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        return objs
+
+    @abstractmethod
+    def get_object(self, index: int) -> Union[BarData, TickData]:
+        """
+        Create data object of row.
+        """
+        pass
+
+    @classmethod
+    def concat(cls, batches: Sequence["BaseBatch"]) -> "BaseBatch":
+        """
+        Concatenate batches of the same symbol into a new batch.
+        """
+        first: BaseBatch = batches[0]
+        columns: Dict[str, np.ndarray] = {
+            name: np.concatenate([getattr(batch, name) for batch in batches])
+            for name in ["datetime"] + cls.columns
+        }
+        return cls(**first.get_meta(), **columns)
+
+
+class BarBatch(BaseBatch):
+    """
+    Batch of bar data of one symbol and interval.
+    """
+
+    columns: List[str] = BAR_COLUMNS
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        gateway_name: str,
+        datetime: np.ndarray,
+        tz: Optional[tzinfo] = None,
+        **columns: np.ndarray
+    ) -> None:
+        """"""
+        super().__init__(symbol, exchange, gateway_name, datetime, tz, **columns)
+        self.interval: Interval = interval
+
+    def get_meta(self) -> dict:
+        """"""
+        meta: dict = super().get_meta()
+        meta["interval"] = self.interval
+        return meta
+
+    def get_object(self, index: int) -> BarData:
+        """
+        Create bar data of row.
+        """
+        return self.take(slice(index, index + 1)).to_bars()[0]
+
+    @classmethod
+    def from_bars(
+        cls,
+        bars: List[BarData],
+        symbol: str = "",
+        exchange: Exchange = None,
+        interval: Interval = None,
+        tz: Optional[tzinfo] = None
+    ) -> "BarBatch":
+        """
+        Create batch from bar data list, symbol, exchange and interval
+        are only required for empty list.
+
+        Datetime is kept as local time of tz if given, otherwise of tz
+        of the first bar.
+        """
+        if bars:
+            first: BarData = bars[0]
+            symbol, exchange, interval = first.symbol, first.exchange, first.interval
+            gateway_name: str = first.gateway_name
+            tz = tz or first.datetime.tzinfo
+        else:
+            gateway_name = ""
+
+        columns: Dict[str, np.ndarray] = {
+            name: np.fromiter((getattr(bar, name) for bar in bars), np.float64, len(bars))
+            for name in BAR_COLUMNS
+        }
+
+        return cls(
+            symbol=symbol,
+            exchange=exchange,
+            interval=interval,
+            gateway_name=gateway_name,
+            datetime=get_datetime64(bars, tz),
+            tz=tz,
+            **columns
+        )
+
+    def to_bars(self) -> List[BarData]:
+        """
+        Convert batch into bar data list.
+        """
+        template: BarData = BarData(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            datetime=None,
+            interval=self.interval,
+            gateway_name=self.gateway_name
+        )
+        return self.create_objects(template)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Get dict of datetime and price columns named as in ArrayManager,
+        which can be passed to ArrayManager.update_arrays.
+        """
+        arrays: Dict[str, np.ndarray] = {"datetime": self.datetime}
+        for column, name in BAR_ARRAY_NAMES.items():
+            arrays[name] = getattr(self, column)
+        return arrays
+
+
+class TickBatch(BaseBatch):
+    """
+    Batch of tick data of one symbol, localtime of ticks is not kept.
+    """
+
+    columns: List[str] = TICK_COLUMNS
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        gateway_name: str,
+        datetime: np.ndarray,
+        tz: Optional[tzinfo] = None,
+        name: str = "",
+        **columns: np.ndarray
+    ) -> None:
+        """"""
+        super().__init__(symbol, exchange, gateway_name, datetime, tz, **columns)
+        self.name: str = name
+
+    def get_meta(self) -> dict:
+        """"""
+        meta: dict = super().get_meta()
+        meta["name"] = self.name
+        return meta
+
+    def get_object(self, index: int) -> TickData:
+        """
+        Create tick data of row.
+        """
+        return self.take(slice(index, index + 1)).to_ticks()[0]
+
+    @classmethod
+    def from_ticks(
+        cls,
+        ticks: List[TickData],
+        symbol: str = "",
+        exchange: Exchange = None,
+        tz: Optional[tzinfo] = None
+    ) -> "TickBatch":
+        """
+        Create batch from tick data list, symbol and exchange are only
+        required for empty list.
+
+        Datetime is kept as local time of tz if given, otherwise of tz
+        of the first tick.
+        """
+        if ticks:
+            first: TickData = ticks[0]
+            symbol, exchange, name = first.symbol, first.exchange, first.name
+            gateway_name: str = first.gateway_name
+            tz = tz or first.datetime.tzinfo
+        else:
+            name = gateway_name = ""
+
+        columns: Dict[str, np.ndarray] = {
+            column: np.fromiter((getattr(tick, column) for tick in ticks), np.float64, len(ticks))
+            for column in TICK_COLUMNS
+        }
+
+        return cls(
+            symbol=symbol,
+            exchange=exchange,
+            gateway_name=gateway_name,
+            datetime=get_datetime64(ticks, tz),
+            tz=tz,
+            name=name,
+            **columns
+        )
+
+    def to_ticks(self) -> List[TickData]:
+        """
+        Convert batch into tick data list.
+        """
+        template: TickData = TickData(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            datetime=None,
+            name=self.name,
+            gateway_name=self.gateway_name
+        )
+        return self.create_objects(template)
+
+
+def get_datetime64(objs: List[Union[BarData, TickData]], tz: Optional[tzinfo]) -> np.ndarray:
+    """
+    Get datetime of data objects as naive local time of tz.
+    """
+    count: int = len(objs)
+
+    if not tz:
+        values: np.ndarray = np.fromiter(
+            ((obj.datetime - EPOCH) // MICROSECOND for obj in objs), np.int64, count
+        )
+        return values.view(DATETIME_DTYPE)
+
+    # Converting datetime objects by numpy is slow, so local time is
+    # calculated from timestamp and utc offset
+    timestamps: np.ndarray = np.fromiter((obj.datetime.timestamp() for obj in objs), np.float64, count)
+    offsets: np.ndarray = np.fromiter((get_utc_offset(obj.datetime, tz) for obj in objs), np.float64, count)
+
+    values = np.rint((timestamps + offsets) * 1_000_000).astype(np.int64)
+    return values.view(DATETIME_DTYPE)
+
+
+def get_utc_offset(dt: datetime, tz: tzinfo) -> float:
+    """
+    Get utc offset seconds of datetime in tz.
+    """
+    if dt.tzinfo is not tz:
+        dt = dt.astimezone(tz)
+    return dt.utcoffset().total_seconds()
@@ -0,0 +1,495 @@
+"""
+Shared-memory market data bus for fanning out tick and bar data to
+processes on the same host.
+"""
+
+import sys
+from datetime import datetime
+from hashlib import md5
+from multiprocessing import shared_memory
+from operator import attrgetter
+from struct import Struct
+from threading import Thread
+from time import sleep
+from typing import Callable, Dict, List, Optional, Tuple
+
+from vnpy.event import Event, EventEngine
+from .constant import Exchange, Interval
+from .event import EVENT_TICK, EVENT_BAR
+from .object import TickData, BarData
+from .utility import ZoneInfo
+
+
+TICK_FIELDS: List[str] = [
+    "volume", "turnover", "open_interest", "last_price", "last_volume",
+    "limit_up", "limit_down", "open_price", "high_price", "low_price", "pre_close",
+    "bid_price_1", "bid_price_2", "bid_price_3", "bid_price_4", "bid_price_5",
+    "ask_price_1", "ask_price_2", "ask_price_3", "ask_price_4", "ask_price_5",
+    "bid_volume_1", "bid_volume_2", "bid_volume_3", "bid_volume_4", "bid_volume_5",
+    "ask_volume_1", "ask_volume_2", "ask_volume_3", "ask_volume_4", "ask_volume_5",
+]
+
+BAR_FIELDS: List[str] = [
+    "volume", "turnover", "open_interest",
+    "open_price", "high_price", "low_price", "close_price",
+]
+
+get_tick_values: Callable[[TickData], tuple] = attrgetter(*TICK_FIELDS)
+get_bar_values: Callable[[BarData], tuple] = attrgetter(*BAR_FIELDS)
+
+# Write sequence is kept at offset 0, so that it is 8-byte aligned
+SEQUENCE: Struct = Struct("<Q")
+# capacity, record size, symbol, exchange, gateway name, name, timezone, interval
+HEADER: Struct = Struct("<II64s32s32s64s32s8s")
+HEADER_SIZE: int = 256
+# Ready flag written after header, at the end of header area
+READY: Struct = Struct("<I")
+READY_OFFSET: int = HEADER_SIZE - READY.size
+READY_MAGIC: int = 0x766E7079
+
+# Tick record: datetime, localtime timestamps and numeric fields
+TICK_RECORD: Struct = Struct("<dd" + "d" * len(TICK_FIELDS))
+# Bar record: datetime timestamp and numeric fields
+BAR_RECORD: Struct = Struct("<d" + "d" * len(BAR_FIELDS))
+
+
+def get_memory_name(bus_name: str, vt_symbol: str, interval: Optional[Interval]) -> str:
+    """
+    Get shared memory name of a symbol ring, which is kept short for
+    platforms limiting the length.
+    """
+    key: str = f"{vt_symbol}.{interval.value}" if interval else vt_symbol
+    digest: str = md5(key.encode("utf-8")).hexdigest()[:16]
+    kind: str = "b" if interval else "t"
+    return f"{bus_name}_{kind}_{digest}"
+
+
+def attach_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach existing shared memory without letting resource tracker of
+    this process unlink it at exit.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+
+    memory: shared_memory.SharedMemory = shared_memory.SharedMemory(name)
+
+    if sys.platform != "win32":
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(memory._name, "shared_memory")
+
+    return memory
+
+
+def to_timestamp(dt: Optional[datetime]) -> float:
+    """"""
+    if not dt:
+        return 0
+    return dt.timestamp()
+
+
+def from_timestamp(ts: float, tz: Optional[ZoneInfo]) -> Optional[datetime]:
+    """"""
+    if not ts:
+        return None
+    return datetime.fromtimestamp(ts, tz)
+
+
+def encode(text: str) -> bytes:
+    """"""
+    return text.encode("utf-8")
+
+
+def decode(data: bytes) -> str:
+    """"""
+    return data.rstrip(b"\x00").decode("utf-8")
+
+
+class DataRing:
+    """
+    Fixed-size ring buffer of records in shared memory.
+
+    Writer copies record into slot first and then increases the write
+    sequence, reader checks the sequence again after copying a record
+    to detect if the slot was overwritten meanwhile.
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, record: Struct) -> None:
+        """"""
+        self.memory: shared_memory.SharedMemory = memory
+        self.buf: memoryview = memory.buf
+        self.record: Struct = record
+
+        header: tuple = HEADER.unpack_from(self.buf, SEQUENCE.size)
+        self.capacity: int = header[0]
+        self.symbol: str = decode(header[2])
+        self.exchange: Exchange = Exchange(decode(header[3]))
+        self.gateway_name: str = decode(header[4])
+        self.name: str = decode(header[5])
+        self.interval: Optional[Interval] = Interval(decode(header[7])) if header[7].rstrip(b"\x00") else None
+
+        tz_name: str = decode(header[6])
+        self.tz: Optional[ZoneInfo] = ZoneInfo(tz_name) if tz_name else None
+
+        self.sequence: int = self.get_sequence()
+
+    @classmethod
+    def create(
+        cls,
+        name: str,
+        record: Struct,
+        capacity: int,
+        symbol: str,
+        exchange: Exchange,
+        gateway_name: str,
+        contract_name: str,
+        dt: datetime,
+        interval: Optional[Interval]
+    ) -> "DataRing":
+        """
+        Create shared memory of ring and write header.
+        """
+        size: int = HEADER_SIZE + capacity * record.size
+
+        try:
+            memory: shared_memory.SharedMemory = shared_memory.SharedMemory(name, create=True, size=size)
+        except FileExistsError:
+            # Left by a publisher not closed properly
+            old: shared_memory.SharedMemory = shared_memory.SharedMemory(name)
+            old.close()
+            old.unlink()
+            memory = shared_memory.SharedMemory(name, create=True, size=size)
+
+        tz_name: str = getattr(dt.tzinfo, "key", "UTC") if dt.tzinfo else ""
+
+        SEQUENCE.pack_into(memory.buf, 0, 0)
+        HEADER.pack_into(
+            memory.buf,
+            SEQUENCE.size,
+            capacity,
+            record.size,
+            encode(symbol),
+            encode(exchange.value),
+            encode(gateway_name),
+            encode(contract_name),
+            encode(tz_name),
+            encode(interval.value if interval else "")
+        )
+        READY.pack_into(memory.buf, READY_OFFSET, READY_MAGIC)
+        return cls(memory, record)
+
+    @staticmethod
+    def is_ready(memory: shared_memory.SharedMemory) -> bool:
+        """
+        Check if header of ring is completely written by publisher.
+        """
+        return READY.unpack_from(memory.buf, READY_OFFSET)[0] == READY_MAGIC
+
+    def get_sequence(self) -> int:
+        """"""
+        return SEQUENCE.unpack_from(self.buf, 0)[0]
+
+    def write(self, values: tuple) -> None:
+        """
+        Write one record, only one writer process is allowed.
+        """
+        offset: int = HEADER_SIZE + (self.sequence % self.capacity) * self.record.size
+        self.record.pack_into(self.buf, offset, *values)
+
+        self.sequence += 1
+        SEQUENCE.pack_into(self.buf, 0, self.sequence)
+
+    def read(self) -> Tuple[List[tuple], int]:
+        """
+        Read records written since last read. Return records and
+        number of records lost because reader fell behind.
+        """
+        sequence: int = self.get_sequence()
+        start: int = self.sequence
+        lost: int = 0
+
+        if sequence - start > self.capacity:
+            lost = sequence - start - self.capacity
+            start = sequence - self.capacity
+
+        records: List[tuple] = []
+        for i in range(start, sequence):
+            offset: int = HEADER_SIZE + (i % self.capacity) * self.record.size
+            records.append(self.record.unpack_from(self.buf, offset))
+
+        # Drop records overwritten during reading
+        latest: int = self.get_sequence()
+        overwritten: int = latest - self.capacity - start + 1
+        if overwritten > 0:
+            records = records[overwritten:]
+            lost += min(overwritten, sequence - start)
+
+        self.sequence = sequence
+        return records, lost
+
+    def close(self) -> None:
+        """"""
+        self.buf.release()
+        self.memory.close()
+
+
+class MarketDataPublisher:
+    """
+    Publish tick and bar data of local event engine into shared memory
+    rings, one ring for each symbol (and interval of bar).
+    """
+
+    def __init__(
+        self,
+        event_engine: EventEngine = None,
+        bus_name: str = "vnpy",
+        capacity: int = 4096
+    ) -> None:
+        """
+        If event_engine is passed, EVENT_TICK and EVENT_BAR are published.
+        """
+        self.event_engine: EventEngine = event_engine
+        self.bus_name: str = bus_name
+        self.capacity: int = capacity
+
+        self.tick_rings: Dict[str, DataRing] = {}
+        self.bar_rings: Dict[Tuple[str, Interval], DataRing] = {}
+
+        if event_engine:
+            event_engine.register(EVENT_TICK, self.process_tick_event)
+            event_engine.register(EVENT_BAR, self.process_bar_event)
+
+    def process_tick_event(self, event: Event) -> None:
+        """"""
+        self.publish_tick(event.data)
+
+    def process_bar_event(self, event: Event) -> None:
+        """"""
+        self.publish_bar(event.data)
+
+    def publish_tick(self, tick: TickData) -> None:
+        """
+        Write tick data into ring of its symbol.
+        """
+        ring: DataRing = self.tick_rings.get(tick.vt_symbol, None)
+        if not ring:
+            ring = DataRing.create(
+                get_memory_name(self.bus_name, tick.vt_symbol, None),
+                TICK_RECORD,
+                self.capacity,
+                tick.symbol,
+                tick.exchange,
+                tick.gateway_name,
+                tick.name,
+                tick.datetime,
+                None
+            )
+            self.tick_rings[tick.vt_symbol] = ring
+
+        ring.write((
+            to_timestamp(tick.datetime),
+            to_timestamp(tick.localtime),
+            *get_tick_values(tick)
+        ))
+
+    def publish_bar(self, bar: BarData) -> None:
+        """
+        Write bar data into ring of its symbol and interval.
+        """
+        key: Tuple[str, Interval] = (bar.vt_symbol, bar.interval)
+
+        ring: DataRing = self.bar_rings.get(key, None)
+        if not ring:
+            ring = DataRing.create(
+                get_memory_name(self.bus_name, bar.vt_symbol, bar.interval or Interval.MINUTE),
+                BAR_RECORD,
+                self.capacity,
+                bar.symbol,
+                bar.exchange,
+                bar.gateway_name,
+                "",
+                bar.datetime,
+                bar.interval or Interval.MINUTE
+            )
+            self.bar_rings[key] = ring
+
+        ring.write((
+            to_timestamp(bar.datetime),
+            *get_bar_values(bar)
+        ))
+
+    def close(self) -> None:
+        """
+        Remove all shared memory rings.
+        """
+        if self.event_engine:
+            self.event_engine.unregister(EVENT_TICK, self.process_tick_event)
+            self.event_engine.unregister(EVENT_BAR, self.process_bar_event)
+
+        for ring in list(self.tick_rings.values()) + list(self.bar_rings.values()):
+            memory: shared_memory.SharedMemory = ring.memory
+            ring.close()
+            memory.unlink()
+
+        self.tick_rings.clear()
+        self.bar_rings.clear()
+
+
+class MarketDataSubscriber:
+    """
+    Attach shared memory rings of a publisher process and put tick and
+    bar events into local event engine, as if pushed by a gateway.
+    """
+
+    def __init__(
+        self,
+        event_engine: EventEngine,
+        bus_name: str = "vnpy",
+        poll_interval: float = 0.001,
+        replay: bool = False
+    ) -> None:
+        """
+        Only data published after ring attached is received. If replay
+        is set, data still kept in ring when attached is pushed first,
+        which is history rather than live data.
+        """
+        self.event_engine: EventEngine = event_engine
+        self.bus_name: str = bus_name
+        self.poll_interval: float = poll_interval
+        self.replay: bool = replay
+
+        self.tick_symbols: List[str] = []
+        self.bar_symbols: List[Tuple[str, Interval]] = []
+        self.tick_rings: Dict[str, DataRing] = {}
+        self.bar_rings: Dict[Tuple[str, Interval], DataRing] = {}
+        self.lost_count: int = 0
+
+        self.active: bool = False
+        self.thread: Thread = Thread(target=self.run)
+
+    def subscribe_tick(self, vt_symbol: str) -> None:
+        """
+        Receive tick data of vt_symbol, ring is attached once published.
+        """
+        if vt_symbol not in self.tick_symbols:
+            self.tick_symbols.append(vt_symbol)
+
+    def subscribe_bar(self, vt_symbol: str, interval: Interval = Interval.MINUTE) -> None:
+        """
+        Receive bar data of vt_symbol and interval.
+        """
+        key: Tuple[str, Interval] = (vt_symbol, interval)
+        if key not in self.bar_symbols:
+            self.bar_symbols.append(key)
+
+    def start(self) -> None:
+        """"""
+        self.active = True
+        self.thread.start()
+
+    def stop(self) -> None:
+        """"""
+        self.active = False
+        self.thread.join()
+
+        for ring in list(self.tick_rings.values()) + list(self.bar_rings.values()):
+            ring.close()
+
+        self.tick_rings.clear()
+        self.bar_rings.clear()
+
+    def run(self) -> None:
+        """
+        Poll rings and put new data into event engine.
+        """
+        while self.active:
+            self.attach_rings()
+
+            events: List[Event] = []
+            for ring in self.tick_rings.values():
+                self.read_ticks(ring, events)
+            for ring in self.bar_rings.values():
+                self.read_bars(ring, events)
+
+            if events:
+                self.event_engine.put_many(events)
+            else:
+                sleep(self.poll_interval)
+
+    def attach_rings(self) -> None:
+        """
+        Attach rings of symbols subscribed but not published before.
+        """
+        for vt_symbol in self.tick_symbols:
+            if vt_symbol not in self.tick_rings:
+                ring: Optional[DataRing] = self.attach_ring(vt_symbol, None, TICK_RECORD)
+                if ring:
+                    self.tick_rings[vt_symbol] = ring
+
+        for vt_symbol, interval in self.bar_symbols:
+            key: Tuple[str, Interval] = (vt_symbol, interval)
+            if key not in self.bar_rings:
+                ring = self.attach_ring(vt_symbol, interval, BAR_RECORD)
+                if ring:
+                    self.bar_rings[key] = ring
+
+    def attach_ring(
+        self,
+        vt_symbol: str,
+        interval: Optional[Interval],
+        record: Struct
+    ) -> Optional[DataRing]:
+        """"""
+        name: str = get_memory_name(self.bus_name, vt_symbol, interval)
+        try:
+            memory: shared_memory.SharedMemory = attach_memory(name)
+        except FileNotFoundError:
+            return None
+
+        if not DataRing.is_ready(memory):
+            memory.close()
+            return None
+
+        # Read from current write sequence, or the oldest data in ring
+        # except the slot which may be overwritten by next write
+        ring: DataRing = DataRing(memory, record)
+        if self.replay:
+            ring.sequence = max(ring.sequence - ring.capacity + 1, 0)
+        return ring
+
+    def read_ticks(self, ring: DataRing, events: List[Event]) -> None:
+        """"""
+        records, lost = ring.read()
+        self.lost_count += lost
+
+        for values in records:
+            tick: TickData = TickData(
+                symbol=ring.symbol,
+                exchange=ring.exchange,
+                datetime=from_timestamp(values[0], ring.tz),
+                name=ring.name,
+                gateway_name=ring.gateway_name
+            )
+            tick.localtime = from_timestamp(values[1], ring.tz)
+            tick.__dict__.update(zip(TICK_FIELDS, values[2:]))
+
+            events.append(Event(EVENT_TICK, tick))
+            events.append(Event(EVENT_TICK + tick.vt_symbol, tick))
+
+    def read_bars(self, ring: DataRing, events: List[Event]) -> None:
+        """"""
+        records, lost = ring.read()
+        self.lost_count += lost
+
+        for values in records:
+            bar: BarData = BarData(
+                symbol=ring.symbol,
+                exchange=ring.exchange,
+                datetime=from_timestamp(values[0], ring.tz),
+                interval=ring.interval,
+                gateway_name=ring.gateway_name
+            )
+            bar.__dict__.update(zip(BAR_FIELDS, values[1:]))
+
+            events.append(Event(EVENT_BAR, bar))
+            events.append(Event(EVENT_BAR + bar.vt_symbol, bar))
@@ -0,0 +1,356 @@
+"""
+Caching wrapper of database keeping recently loaded bar data in memory.
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Dict, Iterator, List, Tuple, Union
+
+from .batch import BarBatch, TickBatch
+from .constant import Exchange, Interval
+from .database import DB_TZ, BaseDatabase, BarOverview, TickOverview
+from .object import BarData, TickData
+
+
+MICROSECOND: timedelta = timedelta(microseconds=1)
+
+
+class CacheSegment:
+    """
+    Bars of a continuous datetime range loaded from database, which
+    holds all bars between start and end (both included).
+    """
+
+    def __init__(self, start: datetime, end: datetime, batch: BarBatch) -> None:
+        """"""
+        self.start: datetime = start
+        self.end: datetime = end
+        self.batch: BarBatch = batch
+
+    @property
+    def nbytes(self) -> int:
+        """"""
+        return sum(column.nbytes for column in self.batch.get_columns().values())
+
+
+class CacheDatabase(BaseDatabase):
+    """
+    Wrapper of database, serving bar data of ranges loaded before from
+    memory, which is used with database.cache_size set to megabytes of
+    memory budget.
+
+    Ranges loaded of each symbol and interval are kept as segments, and
+    only parts of a request not covered are loaded from database, then
+    merged with overlapping and adjacent segments into one. Least
+    recently used symbols are evicted when over memory budget.
+
+    Saving bars drops segments overlapping their datetime range, and
+    deleting bars drops all segments of the symbol, both before and after
+    writing. Database is loaded without lock held, and data loaded is
+    not cached if segments of the symbol changed meanwhile. Arrays of batches
+    loaded are read-only views of cache. Tick data is not cached.
+    """
+
+    def __init__(self, database: BaseDatabase, cache_size: int) -> None:
+        """
+        Cache size is memory budget in bytes.
+        """
+        self.database: BaseDatabase = database
+        self.cache_size: int = cache_size
+
+        self.segments: OrderedDict[Tuple[str, Exchange, Interval], List[CacheSegment]] = OrderedDict()
+        self.versions: Dict[Tuple[str, Exchange, Interval], int] = {}
+        self.nbytes: int = 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self.lock: Lock = Lock()
+
+    def save_bar_data(self, bars: List[BarData], stream: bool = False) -> bool:
+        """"""
+        if bars:
+            first: BarData = bars[0]
+            datetimes: List[datetime] = [to_db_datetime(bar.datetime) for bar in bars]
+
+            key: Tuple[str, Exchange, Interval] = (first.symbol, first.exchange, first.interval)
+            start: datetime = min(datetimes)
+            end: datetime = max(datetimes)
+
+            # Invalidate again after saved, in case range is loaded again
+            # during saving
+            with self.lock:
+                self.invalidate(key, start, end)
+
+            result: bool = self.database.save_bar_data(bars, stream)
+
+            with self.lock:
+                self.invalidate(key, start, end)
+
+            return result
+
+        return self.database.save_bar_data(bars, stream)
+
+    def save_tick_data(self, ticks: List[TickData], stream: bool = False) -> bool:
+        """"""
+        return self.database.save_tick_data(ticks, stream)
+
+    def load_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> List[BarData]:
+        """"""
+        return self.load_bar_batch(symbol, exchange, interval, start, end).to_bars()
+
+    def load_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> List[TickData]:
+        """"""
+        return self.database.load_tick_data(symbol, exchange, start, end)
+
+    def load_bar_batch(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> BarBatch:
+        """
+        Load bar data from cache, with parts not cached loaded from
+        database first.
+        """
+        key: Tuple[str, Exchange, Interval] = (symbol, exchange, interval)
+        start = to_db_datetime(start)
+        end = to_db_datetime(end)
+
+        with self.lock:
+            segments: List[CacheSegment] = self.segments.get(key, [])
+
+            for segment in segments:
+                if segment.start <= start and end <= segment.end:
+                    self.hits += 1
+                    self.segments.move_to_end(key)
+                    return segment.batch.slice_by_datetime(start, end)
+
+            self.misses += 1
+            merged: List[CacheSegment] = [
+                segment for segment in segments
+                if segment.start - end <= MICROSECOND and start - segment.end <= MICROSECOND
+            ]
+            version: int = self.versions.get(key, 0)
+
+        # Load from database without lock, so that other symbols and
+        # ranges cached are not blocked
+        segment = self.load_segment(key, merged, start, end)
+
+        # Segment is not cached if segments of symbol changed since, as
+        # data loaded may be older than data saved
+        with self.lock:
+            if self.versions.get(key, 0) == version:
+                self.add_segment(key, merged, segment)
+                self.evict()
+
+        return segment.batch.slice_by_datetime(start, end)
+
+    def load_tick_batch(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> TickBatch:
+        """"""
+        return self.database.load_tick_batch(symbol, exchange, start, end)
+
+    def iter_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = 10_000,
+        batch: bool = False
+    ) -> Iterator[Union[List[BarData], BarBatch]]:
+        """
+        Streaming is meant to bound memory, so bypasses cache.
+        """
+        return self.database.iter_bar_data(symbol, exchange, interval, start, end, chunk_size, batch)
+
+    def iter_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = 10_000,
+        batch: bool = False
+    ) -> Iterator[Union[List[TickData], TickBatch]]:
+        """"""
+        return self.database.iter_tick_data(symbol, exchange, start, end, chunk_size, batch)
+
+    def delete_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval
+    ) -> int:
+        """"""
+        key: Tuple[str, Exchange, Interval] = (symbol, exchange, interval)
+
+        with self.lock:
+            self.invalidate(key, None, None)
+
+        count: int = self.database.delete_bar_data(symbol, exchange, interval)
+
+        with self.lock:
+            self.invalidate(key, None, None)
+
+        return count
+
+    def delete_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange
+    ) -> int:
+        """"""
+        return self.database.delete_tick_data(symbol, exchange)
+
+    def get_bar_overview(self) -> List[BarOverview]:
+        """"""
+        return self.database.get_bar_overview()
+
+    def get_tick_overview(self) -> List[TickOverview]:
+        """"""
+        return self.database.get_tick_overview()
+
+    def load_segment(
+        self,
+        key: Tuple[str, Exchange, Interval],
+        merged: List[CacheSegment],
+        start: datetime,
+        end: datetime
+    ) -> CacheSegment:
+        """
+        Load parts of range not covered by merged segments from database,
+        and merge them with the segments into one.
+        """
+        batches: List[BarBatch] = []
+        begin: datetime = start
+        for segment in merged:
+            if begin < segment.start:
+                batches.append(self.database.load_bar_batch(*key, begin, segment.start - MICROSECOND))
+            batches.append(segment.batch)
+            begin = segment.end + MICROSECOND
+
+        if not merged or begin <= end:
+            batches.append(self.database.load_bar_batch(*key, begin, end))
+
+        # Batch of empty range may be created without timezone
+        batches = [batch for batch in batches if len(batch)] or batches[:1]
+
+        # Cached arrays are shared by results, so set them read-only
+        batch: BarBatch = BarBatch.concat(batches)
+        for column in batch.get_columns().values():
+            column.setflags(write=False)
+
+        return CacheSegment(
+            min(start, merged[0].start) if merged else start,
+            max(end, merged[-1].end) if merged else end,
+            batch
+        )
+
+    def add_segment(
+        self,
+        key: Tuple[str, Exchange, Interval],
+        merged: List[CacheSegment],
+        segment: CacheSegment
+    ) -> None:
+        """
+        Replace merged segments with the new one.
+        """
+        remained: List[CacheSegment] = [s for s in self.segments.get(key, []) if s not in merged]
+        remained.append(segment)
+        remained.sort(key=lambda s: s.start)
+
+        self.segments[key] = remained
+        self.segments.move_to_end(key)
+        self.nbytes += segment.nbytes - sum(s.nbytes for s in merged)
+        self.update_version(key)
+
+    def invalidate(self, key: Tuple[str, Exchange, Interval], start: datetime, end: datetime) -> None:
+        """
+        Drop segments overlapping range, or all segments if range is None.
+        """
+        self.update_version(key)
+
+        segments: List[CacheSegment] = self.segments.get(key, None)
+        if not segments:
+            return
+
+        remained: List[CacheSegment] = []
+        for segment in segments:
+            if start is None or (segment.start <= end and start <= segment.end):
+                self.nbytes -= segment.nbytes
+            else:
+                remained.append(segment)
+
+        if remained:
+            self.segments[key] = remained
+        else:
+            self.segments.pop(key)
+
+    def evict(self) -> None:
+        """
+        Drop segments of least recently used symbols until memory used
+        is within budget.
+        """
+        while self.segments and self.nbytes > self.cache_size:
+            key, segments = self.segments.popitem(last=False)
+            self.nbytes -= sum(segment.nbytes for segment in segments)
+            self.update_version(key)
+
+    def update_version(self, key: Tuple[str, Exchange, Interval]) -> None:
+        """
+        Mark segments of symbol changed, called with lock held.
+        """
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def clear(self) -> None:
+        """
+        Drop all cached bar data.
+        """
+        with self.lock:
+            for key in self.segments:
+                self.update_version(key)
+
+            self.segments.clear()
+            self.nbytes = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """"""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "nbytes": self.nbytes,
+                "segments": sum(len(segments) for segments in self.segments.values()),
+            }
+
+
+def to_db_datetime(dt: datetime) -> datetime:
+    """
+    Convert datetime into DB_TZ, naive one is taken as local time as in
+    convert_tz.
+    """
+    return dt.astimezone(DB_TZ)
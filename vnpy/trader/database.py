@@ -1,12 +1,15 @@
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import datetime, timedelta
 from types import ModuleType
-from typing import List
+from typing import Callable, Dict, Iterator, List, Union
 from dataclasses import dataclass
 from importlib import import_module
 
+import numpy as np
+
 from .constant import Interval, Exchange
 from .object import BarData, TickData
+from .batch import BarBatch, TickBatch
 from .setting import SETTINGS
 from .utility import ZoneInfo
 from .locale import _
@@ -14,6 +17,20 @@ from .locale import _
 
 DB_TZ = ZoneInfo(SETTINGS["database.timezone"])
 
+INTERVAL_DELTA_MAP: Dict[Interval, timedelta] = {
+    Interval.SECOND: timedelta(seconds=1),
+    Interval.MINUTE: timedelta(minutes=1),
+    Interval.MINUTE_15: timedelta(minutes=15),
+    Interval.HOUR: timedelta(hours=1),
+    Interval.HOUR_4: timedelta(hours=4),
+    Interval.DAILY: timedelta(days=1),
+    Interval.WEEKLY: timedelta(days=7),
+}
+
+TICK_CHUNK_PERIOD: timedelta = timedelta(minutes=1)
+MAX_TICK_CHUNK_PERIOD: timedelta = timedelta(days=1)
+MIN_CHUNK_PERIOD: timedelta = timedelta(seconds=1)
+
 
 def convert_tz(dt: datetime) -> datetime:
     """
@@ -96,6 +113,102 @@ class BaseDatabase(ABC):
         """
         pass
 
+    def load_bar_batch(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> BarBatch:
+        """
+        Load bar data from database as columnar batch. Database reading
+        data in columns can override this to skip creating bar objects.
+        """
+        bars: List[BarData] = self.load_bar_data(symbol, exchange, interval, start, end)
+        return BarBatch.from_bars(bars, symbol, exchange, interval)
+
+    def load_bar_arrays(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> Dict[str, np.ndarray]:
+        """
+        Load bar data from database as dict of arrays: datetime, open,
+        high, low, close, volume, turnover and open_interest, which can
+        be fed into ArrayManager.update_arrays.
+        """
+        batch: BarBatch = self.load_bar_batch(symbol, exchange, interval, start, end)
+        return batch.to_arrays()
+
+    def load_tick_batch(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> TickBatch:
+        """
+        Load tick data from database as columnar batch.
+        """
+        ticks: List[TickData] = self.load_tick_data(symbol, exchange, start, end)
+        return TickBatch.from_ticks(ticks, symbol, exchange)
+
+    def iter_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = 10_000,
+        batch: bool = False
+    ) -> Iterator[Union[List[BarData], BarBatch]]:
+        """
+        Load bar data from database chunk by chunk, as bar list or as
+        batch of about chunk_size bars, so that memory used is bounded.
+
+        Chunks are loaded by time range, starting from the period of
+        chunk_size bars. Database able to read by rows can override this.
+        """
+        if batch:
+            def load(start: datetime, end: datetime) -> BarBatch:
+                return self.load_bar_batch(symbol, exchange, interval, start, end)
+        else:
+            def load(start: datetime, end: datetime) -> List[BarData]:
+                return self.load_bar_data(symbol, exchange, interval, start, end)
+
+        period: timedelta = INTERVAL_DELTA_MAP.get(interval, TICK_CHUNK_PERIOD) * chunk_size
+        return iter_by_period(load, start, end, period, chunk_size)
+
+    def iter_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = 10_000,
+        batch: bool = False
+    ) -> Iterator[Union[List[TickData], TickBatch]]:
+        """
+        Load tick data from database chunk by chunk, as tick list or as
+        batch of about chunk_size ticks, so that memory used is bounded.
+
+        Chunks are loaded by time range, starting from one minute and
+        growing to at most one day over empty ranges.
+        """
+        if batch:
+            def load(start: datetime, end: datetime) -> TickBatch:
+                return self.load_tick_batch(symbol, exchange, start, end)
+        else:
+            def load(start: datetime, end: datetime) -> List[TickData]:
+                return self.load_tick_data(symbol, exchange, start, end)
+
+        return iter_by_period(load, start, end, TICK_CHUNK_PERIOD, chunk_size, MAX_TICK_CHUNK_PERIOD)
+
     @abstractmethod
     def delete_bar_data(
         self,
@@ -134,6 +247,46 @@ class BaseDatabase(ABC):
         pass
 
 
+def iter_by_period(
+    load: Callable[[datetime, datetime], Union[list, BarBatch, TickBatch]],
+    start: datetime,
+    end: datetime,
+    period: timedelta,
+    chunk_size: int,
+    max_period: timedelta = None
+) -> Iterator[Union[list, BarBatch, TickBatch]]:
+    """
+    Load data between start and end (both included) by consecutive time
+    ranges, and yield data of ranges not empty in chunks of at most
+    chunk_size.
+
+    Period of the next range is scaled by density of data loaded, and at
+    most doubled each time, so that chunks stay close to chunk_size.
+    Over empty ranges period is doubled up to max_period (the period
+    given by default), so that a long gap before data does not make the
+    range after it huge.
+    """
+    if max_period is None:
+        max_period = period
+
+    while start <= end:
+        stop: datetime = min(start + period, end + timedelta(microseconds=1))
+        chunk: Union[list, BarBatch, TickBatch] = load(start, stop - timedelta(microseconds=1))
+
+        count: int = len(chunk)
+        if count > chunk_size:
+            for i in range(0, count, chunk_size):
+                yield chunk[i:i + chunk_size]
+        elif count:
+            yield chunk
+
+        start = stop
+        if count:
+            period = max(period * min(2, chunk_size / count), MIN_CHUNK_PERIOD)
+        else:
+            period = max(min(period * 2, max_period), period)
+
+
 database: BaseDatabase = None
 
 
@@ -148,13 +301,30 @@ def get_database() -> BaseDatabase:
     database_name: str = SETTINGS["database.name"]
     module_name: str = f"vnpy_{database_name}"
 
-    # Try to import database module
-    try:
-        module: ModuleType = import_module(module_name)
-    except ModuleNotFoundError:
-        print(_("找不到数据库驱动{}，使用默认的SQLite数据库").format(module_name))
-        module: ModuleType = import_module("vnpy_sqlite")
+    # Use built-in memory-mapped database
+    if database_name == "mmap":
+        from .mmap_database import MmapDatabase
+        database = MmapDatabase()
+    else:
+        # Try to import database module
+        try:
+            module: ModuleType = import_module(module_name)
+        except ModuleNotFoundError:
+            print(_("找不到数据库驱动{}，使用默认的SQLite数据库").format(module_name))
+            module: ModuleType = import_module("vnpy_sqlite")
+
+        # Create database object from module
+        database = module.Database()
+
+    # Cache bar data loaded in memory if budget set in megabytes
+    cache_size: int = SETTINGS["database.cache_size"]
+    if cache_size:
+        from .cache_database import CacheDatabase
+        database = CacheDatabase(database, cache_size * 1024 * 1024)
+
+    # Write data saved in stream mode by background thread in batches
+    if SETTINGS["database.write_behind"]:
+        from .write_database import WriteBehindDatabase
+        database = WriteBehindDatabase(database)
 
-    # Create database object from module
-    database = module.Database()
     return database
@@ -26,6 +26,7 @@ from .event import (
     EVENT_QUOTE
 )
 from .gateway import BaseGateway
+from .batch import BarBatch
 from .object import (
     CancelRequest,
     LogData,
@@ -230,6 +231,16 @@ class MainEngine:
         else:
             return None
 
+    def query_history_batch(self, req: HistoryRequest, gateway_name: str) -> Optional[BarBatch]:
+        """
+        Query bar history data as columnar batch from a specific gateway.
+        """
+        gateway: BaseGateway = self.get_gateway(gateway_name)
+        if gateway:
+            return gateway.query_history_batch(req)
+        else:
+            return None
+
     def send_wechat(self, msg, usr_id=''):
 
         self.wechat_client.send_markdown(msg, usr_id)
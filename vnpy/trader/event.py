@@ -2,7 +2,7 @@
 Event type string used in the trading platform.
 """
 
-from vnpy.event import EVENT_TIMER  # noqa
+from vnpy.event import EVENT_TIMER, EVENT_EVENT_STATS  # noqa
 
 EVENT_TICK = "eTick."
 EVENT_BAR = 'eBar'  # Kline for 1min updating
@@ -14,3 +14,20 @@ EVENT_QUOTE = "eQuote."
 EVENT_CONTRACT = "eContract."
 EVENT_LOG = "eLog"
 EVENT_BALANCE = "eBalance."
+
+
+# Priority class of event types which can be passed into EventEngine,
+# smaller number is served first.
+EVENT_PRIORITIES = {
+    EVENT_ORDER: 0,
+    EVENT_TRADE: 0,
+    EVENT_QUOTE: 0,
+    EVENT_POSITION: 1,
+    EVENT_ACCOUNT: 1,
+    EVENT_BALANCE: 1,
+    EVENT_CONTRACT: 1,
+    EVENT_TICK: 2,
+    EVENT_BAR: 2,
+    EVENT_LOG: 3,
+    EVENT_TIMER: 3,
+}
@@ -33,6 +33,7 @@ from .object import (
     BarData,
     BalanceData
 )
+from .batch import BarBatch
 
 
 class BaseGateway(ABC):
@@ -103,6 +104,17 @@ class BaseGateway(ABC):
         self.on_event(EVENT_TICK, tick)
         self.on_event(EVENT_TICK + tick.vt_symbol, tick)
 
+    def on_ticks(self, ticks: List[TickData]) -> None:
+        """
+        Tick events push for several ticks decoded from one message.
+        All events are put into event engine at once.
+        """
+        events: List[Event] = []
+        for tick in ticks:
+            events.append(Event(EVENT_TICK, tick))
+            events.append(Event(EVENT_TICK + tick.vt_symbol, tick))
+        self.event_engine.put_many(events)
+
     def on_bar(self, bar: BarData) -> None:
         """
         Bar  event push.
@@ -284,6 +296,16 @@ class BaseGateway(ABC):
         """
         pass
 
+    def query_history_batch(self, req: HistoryRequest) -> Optional[BarBatch]:
+        """
+        Query bar history data as columnar batch. Gateways receiving
+        history in columns can override this to skip creating bar objects.
+        """
+        bars: List[BarData] = self.query_history(req)
+        if bars is None:
+            return None
+        return BarBatch.from_bars(bars, req.symbol, req.exchange, req.interval)
+
     def get_default_setting(self) -> Dict[str, Any]:
         """
         Return default setting dict.
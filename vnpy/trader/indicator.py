@@ -0,0 +1,408 @@
+"""
+Incremental technical indicators updated in O(1) time for each bar.
+
+Values are consistent with talib functions calculated over the whole
+history of bars. ArrayManager methods run talib only over the latest
+size bars, so recursive indicators (EMA, MACD, ATR, RSI) differ from
+them by the truncated history until it becomes negligible, and OBV
+differs by a constant offset.
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from math import nan, sqrt
+from typing import Deque, Tuple
+
+from .object import BarData
+
+
+class BaseIndicator(ABC):
+    """
+    Base class of incremental indicator, which can be registered with
+    ArrayManager by add_indicator to be fed automatically.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.count: int = 0
+        self.inited: bool = False
+        self.value: float = nan
+
+    def update_bar(self, bar: BarData) -> None:
+        """
+        Update indicator with new bar.
+        """
+        self.update(bar.high_price, bar.low_price, bar.close_price, bar.volume)
+
+    @abstractmethod
+    def update(self, high: float, low: float, close: float, volume: float) -> None:
+        """
+        Update indicator with price and volume of new bar.
+        """
+        pass
+
+
+class SmaIndicator(BaseIndicator):
+    """
+    Simple moving average of close price.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        super().__init__()
+
+        self.n: int = n
+        self.values: Deque[float] = deque()
+        self.total: float = 0
+
+    def update(self, high: float, low: float, close: float, volume: float) -> None:
+        """"""
+        self.count += 1
+        self.values.append(close)
+        self.total += close
+
+        if len(self.values) > self.n:
+            self.total -= self.values.popleft()
+
+        # Sum again every n bars to stop rounding error accumulating
+        if not self.count % self.n:
+            self.total = sum(self.values)
+
+        if self.count >= self.n:
+            self.inited = True
+            self.value = self.total / self.n
+
+
+class EmaIndicator(BaseIndicator):
+    """
+    Exponential moving average of close price, seeded with simple moving
+    average of the first n bars as talib does.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        super().__init__()
+
+        self.n: int = n
+        self.k: float = 2 / (n + 1)
+        self.total: float = 0
+
+    def update(self, high: float, low: float, close: float, volume: float) -> None:
+        """"""
+        self.update_value(close)
+
+    def update_value(self, value: float) -> None:
+        """
+        Update with value other than close price, used by MACD.
+        """
+        self.count += 1
+
+        if self.inited:
+            self.value += (value - self.value) * self.k
+        else:
+            self.total += value
+            if self.count == self.n:
+                self.inited = True
+                self.value = self.total / self.n
+
+    def seed(self, value: float) -> None:
+        """
+        Start from a seed value calculated outside, used by MACD.
+        """
+        self.count = self.n
+        self.inited = True
+        self.value = value
+
+
+class AtrIndicator(BaseIndicator):
+    """
+    Average true range with Wilder's smoothing.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        super().__init__()
+
+        self.n: int = n
+        self.pre_close: float = nan
+        self.total: float = 0
+
+    def update(self, high: float, low: float, close: float, volume: float) -> None:
+        """"""
+        self.count += 1
+        pre_close: float = self.pre_close
+        self.pre_close = close
+
+        # True range starts from the second bar
+        if self.count == 1:
+            return
+
+        tr: float = max(high - low, abs(high - pre_close), abs(low - pre_close))
+
+        if self.inited:
+            self.value = (self.value * (self.n - 1) + tr) / self.n
+        else:
+            self.total += tr
+            if self.count > self.n:
+                self.inited = True
+                self.value = self.total / self.n
+
+
+class RsiIndicator(BaseIndicator):
+    """
+    Relative strength index with Wilder's smoothing.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        super().__init__()
+
+        self.n: int = n
+        self.pre_close: float = nan
+        self.gain: float = 0
+        self.loss: float = 0
+
+    def update(self, high: float, low: float, close: float, volume: float) -> None:
+        """"""
+        self.count += 1
+        pre_close: float = self.pre_close
+        self.pre_close = close
+
+        if self.count == 1:
+            return
+
+        diff: float = close - pre_close
+        gain: float = diff if diff > 0 else 0
+        loss: float = -diff if diff < 0 else 0
+
+        if self.inited:
+            self.gain = (self.gain * (self.n - 1) + gain) / self.n
+            self.loss = (self.loss * (self.n - 1) + loss) / self.n
+        else:
+            self.gain += gain
+            self.loss += loss
+            if self.count <= self.n:
+                return
+
+            self.inited = True
+            self.gain /= self.n
+            self.loss /= self.n
+
+        total: float = self.gain + self.loss
+        self.value = 100 * self.gain / total if total else 0
+
+
+class StdIndicator(BaseIndicator):
+    """
+    Rolling population standard deviation of close price.
+
+    Sums are kept of values minus a shift close to their mean, which
+    avoids cancellation error of large prices with small variance.
+    """
+
+    def __init__(self, n: int, nbdev: float = 1) -> None:
+        """"""
+        super().__init__()
+
+        self.n: int = n
+        self.nbdev: float = nbdev
+        self.values: Deque[float] = deque()
+        self.shift: float = nan
+        self.total: float = 0
+        self.total_square: float = 0
+
+    def update(self, high: float, low: float, close: float, volume: float) -> None:
+        """"""
+        self.count += 1
+        self.values.append(close)
+
+        if self.count == 1:
+            self.shift = close
+
+        diff: float = close - self.shift
+        self.total += diff
+        self.total_square += diff * diff
+
+        if len(self.values) > self.n:
+            diff = self.values.popleft() - self.shift
+            self.total -= diff
+            self.total_square -= diff * diff
+
+        # Move shift to the mean and sum again every n bars
+        if not self.count % self.n:
+            self.shift = sum(self.values) / len(self.values)
+            self.total = sum(v - self.shift for v in self.values)
+            self.total_square = sum((v - self.shift) ** 2 for v in self.values)
+
+        if self.count >= self.n:
+            self.inited = True
+
+            mean: float = self.total / self.n
+            variance: float = self.total_square / self.n - mean * mean
+            self.value = sqrt(variance) * self.nbdev if variance > 0 else 0
+
+
+class BollIndicator(BaseIndicator):
+    """
+    Bollinger channel, value is the tuple of up and down band.
+    """
+
+    def __init__(self, n: int, dev: float) -> None:
+        """"""
+        super().__init__()
+
+        self.dev: float = dev
+        self.sma: SmaIndicator = SmaIndicator(n)
+        self.std: StdIndicator = StdIndicator(n)
+        self.value: Tuple[float, float] = (nan, nan)
+
+    def update(self, high: float, low: float, close: float, volume: float) -> None:
+        """"""
+        self.count += 1
+        self.sma.update(high, low, close, volume)
+        self.std.update(high, low, close, volume)
+
+        if self.sma.inited:
+            self.inited = True
+
+            mid: float = self.sma.value
+            width: float = self.std.value * self.dev
+            self.value = (mid + width, mid - width)
+
+
+class KeltnerIndicator(BaseIndicator):
+    """
+    Keltner channel, value is the tuple of up and down band.
+    """
+
+    def __init__(self, n: int, dev: float) -> None:
+        """"""
+        super().__init__()
+
+        self.dev: float = dev
+        self.sma: SmaIndicator = SmaIndicator(n)
+        self.atr: AtrIndicator = AtrIndicator(n)
+        self.value: Tuple[float, float] = (nan, nan)
+
+    def update(self, high: float, low: float, close: float, volume: float) -> None:
+        """"""
+        self.count += 1
+        self.sma.update(high, low, close, volume)
+        self.atr.update(high, low, close, volume)
+
+        if self.atr.inited:
+            self.inited = True
+
+            mid: float = self.sma.value
+            width: float = self.atr.value * self.dev
+            self.value = (mid + width, mid - width)
+
+
+class DonchianIndicator(BaseIndicator):
+    """
+    Donchian channel of highest high and lowest low, using monotonic
+    deques so that each bar is pushed and popped at most once.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        super().__init__()
+
+        self.n: int = n
+        self.highs: Deque[Tuple[int, float]] = deque()
+        self.lows: Deque[Tuple[int, float]] = deque()
+        self.value: Tuple[float, float] = (nan, nan)
+
+    def update(self, high: float, low: float, close: float, volume: float) -> None:
+        """"""
+        count: int = self.count
+        self.count += 1
+
+        highs: Deque[Tuple[int, float]] = self.highs
+        while highs and highs[-1][1] <= high:
+            highs.pop()
+        highs.append((count, high))
+        if highs[0][0] <= count - self.n:
+            highs.popleft()
+
+        lows: Deque[Tuple[int, float]] = self.lows
+        while lows and lows[-1][1] >= low:
+            lows.pop()
+        lows.append((count, low))
+        if lows[0][0] <= count - self.n:
+            lows.popleft()
+
+        if self.count >= self.n:
+            self.inited = True
+            self.value = (highs[0][1], lows[0][1])
+
+
+class MacdIndicator(BaseIndicator):
+    """
+    MACD, value is the tuple of macd, signal and histogram.
+
+    As talib does, both EMAs start at the slow_period bar, with the fast
+    EMA seeded by average of the latest fast_period bars.
+    """
+
+    def __init__(self, fast_period: int, slow_period: int, signal_period: int) -> None:
+        """"""
+        super().__init__()
+
+        if slow_period < fast_period:
+            fast_period, slow_period = slow_period, fast_period
+
+        self.fast: EmaIndicator = EmaIndicator(fast_period)
+        self.slow: EmaIndicator = EmaIndicator(slow_period)
+        self.signal: EmaIndicator = EmaIndicator(signal_period)
+
+        self.closes: Deque[float] = deque(maxlen=fast_period)
+        self.value: Tuple[float, float, float] = (nan, nan, nan)
+
+    def update(self, high: float, low: float, close: float, volume: float) -> None:
+        """"""
+        self.count += 1
+        self.slow.update_value(close)
+
+        if self.fast.inited:
+            self.fast.update_value(close)
+        else:
+            self.closes.append(close)
+            if not self.slow.inited:
+                return
+            self.fast.seed(sum(self.closes) / len(self.closes))
+
+        macd: float = self.fast.value - self.slow.value
+        self.signal.update_value(macd)
+
+        if self.signal.inited:
+            self.inited = True
+
+            signal: float = self.signal.value
+            self.value = (macd, signal, macd - signal)
+
+
+class ObvIndicator(BaseIndicator):
+    """
+    On balance volume accumulated from the first bar.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        super().__init__()
+
+        self.pre_close: float = nan
+
+    def update(self, high: float, low: float, close: float, volume: float) -> None:
+        """"""
+        self.count += 1
+
+        if self.count == 1:
+            self.inited = True
+            self.value = volume
+        elif close > self.pre_close:
+            self.value += volume
+        elif close < self.pre_close:
+            self.value -= volume
+
+        self.pre_close = close
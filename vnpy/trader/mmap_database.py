@@ -0,0 +1,551 @@
+"""
+Built-in database storing bar and tick data in memory-mapped columnar files.
+"""
+
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+import numpy as np
+
+from .batch import BAR_COLUMNS, DATETIME_DTYPE, TICK_COLUMNS, BaseBatch, BarBatch, TickBatch
+from .constant import Exchange, Interval
+from .database import DB_TZ, BaseDatabase, BarOverview, TickOverview, convert_tz
+from .object import BarData, TickData
+from .utility import get_folder_path
+
+
+HEADER_NAME: str = "header.json"
+
+
+class ColumnStore:
+    """
+    Data of one symbol stored in a folder, with one file of fixed-width
+    values for each column, and a header file of meta data.
+
+    Datetime column is int64 microseconds of naive database local time,
+    and the others are float64. Rows are sorted by datetime, so loading
+    a range is a binary search and a slice of memory-mapped files.
+
+    Header is written after column files, and count in header is the
+    number of valid rows. Rows beyond count left by an interrupted write
+    are ignored and truncated by next write.
+
+    Rows merged are written into column files of a new generation, and
+    switched to by replacing header atomically, so an interrupted merge
+    leaves data saved before unchanged. Valid rows are never rewritten in
+    place, so columns mapped stay valid after later saves.
+    """
+
+    def __init__(self, path: Path, columns: List[str]) -> None:
+        """"""
+        self.path: Path = path
+        self.columns: List[str] = ["datetime"] + columns
+
+    def get_header(self) -> dict:
+        """
+        Get meta data from header file, empty if not saved yet.
+        """
+        header_path: Path = self.path.joinpath(HEADER_NAME)
+        if not header_path.exists():
+            return {}
+
+        with open(header_path, encoding="UTF-8") as f:
+            return json.load(f)
+
+    def save_header(self, header: dict) -> None:
+        """
+        Replace header file atomically.
+        """
+        temp_path: Path = self.path.joinpath(HEADER_NAME + ".tmp")
+        with open(temp_path, "w", encoding="UTF-8") as f:
+            json.dump(header, f)
+        os.replace(temp_path, self.path.joinpath(HEADER_NAME))
+
+    def get_column_path(self, name: str, generation: int = 0) -> Path:
+        """
+        Column files of generation 0 are named without generation.
+        """
+        if generation:
+            return self.path.joinpath(f"{name}.{generation}.bin")
+        return self.path.joinpath(f"{name}.bin")
+
+    def open_column(self, name: str, count: int, generation: int = 0) -> np.ndarray:
+        """
+        Map first count values of column file into memory.
+        """
+        dtype: str = "int64" if name == "datetime" else "float64"
+        if not count:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self.get_column_path(name, generation), dtype=dtype, mode="r", shape=(count,))
+
+    def open_columns(self, header: dict) -> Dict[str, np.ndarray]:
+        """
+        Map all columns of rows counted in header into memory.
+        """
+        count: int = header.get("count", 0)
+        generation: int = header.get("generation", 0)
+
+        columns: Dict[str, np.ndarray] = {
+            name: self.open_column(name, count, generation) for name in self.columns
+        }
+        columns["datetime"] = columns["datetime"].view(DATETIME_DTYPE)
+        return columns
+
+    def load(self, start: Optional[np.datetime64], end: Optional[np.datetime64]) -> Dict[str, np.ndarray]:
+        """
+        Load columns of rows with datetime between start and end (both
+        included) into memory.
+        """
+        columns: Dict[str, np.ndarray] = self.open_columns(self.get_header())
+        begin, stop = find_rows(columns, start, end)
+        return load_rows(columns, begin, stop)
+
+    def save(self, batch: BaseBatch, header: dict) -> None:
+        """
+        Save rows of batch, which are appended after existing rows if
+        all later than them, otherwise merged with existing rows and
+        rewritten. Rows of the same datetime are replaced by new ones.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        batch = drop_duplicates(batch.sort())
+        new_columns: Dict[str, np.ndarray] = batch.get_columns()
+        new_columns["datetime"] = new_columns["datetime"].view(np.int64)
+
+        old_header: dict = self.get_header()
+        count: int = old_header.get("count", 0)
+        generation: int = old_header.get("generation", 0)
+
+        if count:
+            last: int = int(self.open_column("datetime", count, generation)[-1])
+            append: bool = new_columns["datetime"][0] > last
+        else:
+            append = True
+
+        if append:
+            for name in self.columns:
+                with open(self.get_column_path(name, generation), "r+b" if count else "wb") as f:
+                    f.truncate(count * 8)
+                    f.seek(count * 8)
+                    f.write(new_columns[name].tobytes())
+            count += len(batch)
+        else:
+            old_columns: Dict[str, np.ndarray] = self.load(None, None)
+            old_columns["datetime"] = old_columns["datetime"].view(np.int64)
+
+            merged: BaseBatch = type(batch)(**batch.get_meta(), **{
+                name: np.concatenate([old_columns[name], new_columns[name]])
+                for name in self.columns
+            })
+            merged = drop_duplicates(merged.sort())
+
+            # Files of the new generation are not used until header saved
+            generation += 1
+            for name, column in merged.get_columns().items():
+                if name == "datetime":
+                    column = column.view(np.int64)
+
+                with open(self.get_column_path(name, generation), "wb") as f:
+                    f.write(column.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+            count = len(merged)
+
+        datetimes: np.ndarray = self.open_column("datetime", count, generation).view(DATETIME_DTYPE)
+        header["count"] = count
+        header["generation"] = generation
+        header["start"] = str(datetimes[0])
+        header["end"] = str(datetimes[-1])
+        self.save_header(header)
+
+        if not append:
+            self.remove_columns(generation)
+
+    def remove_columns(self, generation: int) -> None:
+        """
+        Remove column files of generations other than the given one.
+        Files still mapped can not be removed on Windows, and are left
+        to be removed after a later merge.
+        """
+        current: set = {self.get_column_path(name, generation).name for name in self.columns}
+
+        for path in self.path.glob("*.bin"):
+            if path.name in current:
+                continue
+
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def delete(self) -> int:
+        """
+        Delete all data, and return count of rows deleted.
+        """
+        count: int = self.get_header().get("count", 0)
+        if self.path.exists():
+            shutil.rmtree(self.path)
+        return count
+
+
+class MmapDatabase(BaseDatabase):
+    """
+    Database of bar and tick data in memory-mapped columnar files, which
+    is used with database.name set to mmap.
+
+    Files of each symbol are only written by one process at a time.
+    Columns are mapped with lock held, so that files of a generation
+    replaced by merge are not removed between reading header and
+    mapping them.
+    """
+
+    def __init__(self, path: Path = None) -> None:
+        """"""
+        if not path:
+            path = get_folder_path("mmap_database")
+
+        self.bar_path: Path = path.joinpath("bar")
+        self.tick_path: Path = path.joinpath("tick")
+
+        self.lock: Lock = Lock()
+
+    def get_bar_store(self, symbol: str, exchange: Exchange, interval: Interval) -> ColumnStore:
+        """"""
+        folder_name: str = f"{quote(symbol, safe='')}.{exchange.value}.{interval.value}"
+        return ColumnStore(self.bar_path.joinpath(folder_name), BAR_COLUMNS)
+
+    def get_tick_store(self, symbol: str, exchange: Exchange) -> ColumnStore:
+        """"""
+        folder_name: str = f"{quote(symbol, safe='')}.{exchange.value}"
+        return ColumnStore(self.tick_path.joinpath(folder_name), TICK_COLUMNS)
+
+    def save_bar_data(self, bars: List[BarData], stream: bool = False) -> bool:
+        """
+        Save bar data of the same symbol and interval.
+        """
+        if not bars:
+            return False
+
+        batch: BarBatch = BarBatch.from_bars(bars, tz=DB_TZ)
+        header: dict = {
+            "symbol": batch.symbol,
+            "exchange": batch.exchange.value,
+            "interval": batch.interval.value,
+        }
+
+        with self.lock:
+            store: ColumnStore = self.get_bar_store(batch.symbol, batch.exchange, batch.interval)
+            store.save(batch, header)
+
+        return True
+
+    def save_tick_data(self, ticks: List[TickData], stream: bool = False) -> bool:
+        """
+        Save tick data of the same symbol, localtime is not saved.
+        """
+        if not ticks:
+            return False
+
+        batch: TickBatch = TickBatch.from_ticks(ticks, tz=DB_TZ)
+        header: dict = {
+            "symbol": batch.symbol,
+            "exchange": batch.exchange.value,
+            "name": batch.name,
+        }
+
+        with self.lock:
+            store: ColumnStore = self.get_tick_store(batch.symbol, batch.exchange)
+            store.save(batch, header)
+
+        return True
+
+    def load_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> List[BarData]:
+        """"""
+        return self.load_bar_batch(symbol, exchange, interval, start, end).to_bars()
+
+    def load_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> List[TickData]:
+        """"""
+        return self.load_tick_batch(symbol, exchange, start, end).to_ticks()
+
+    def load_bar_batch(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> BarBatch:
+        """
+        Load bar data as columnar batch without creating bar objects.
+        """
+        store: ColumnStore = self.get_bar_store(symbol, exchange, interval)
+        _, columns = self.open_columns(store)
+        begin, stop = find_rows(columns, to_datetime64(start), to_datetime64(end))
+
+        return BarBatch(
+            symbol=symbol,
+            exchange=exchange,
+            interval=interval,
+            gateway_name="DB",
+            tz=DB_TZ,
+            **load_rows(columns, begin, stop)
+        )
+
+    def load_tick_batch(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> TickBatch:
+        """
+        Load tick data as columnar batch without creating tick objects.
+        """
+        store: ColumnStore = self.get_tick_store(symbol, exchange)
+        header, columns = self.open_columns(store)
+        begin, stop = find_rows(columns, to_datetime64(start), to_datetime64(end))
+
+        return TickBatch(
+            symbol=symbol,
+            exchange=exchange,
+            gateway_name="DB",
+            tz=DB_TZ,
+            name=header.get("name", ""),
+            **load_rows(columns, begin, stop)
+        )
+
+    def iter_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = 10_000,
+        batch: bool = False
+    ) -> Iterator[Union[List[BarData], BarBatch]]:
+        """
+        Load bar data by chunks of chunk_size rows, except the last one.
+        """
+        store: ColumnStore = self.get_bar_store(symbol, exchange, interval)
+        _, columns = self.open_columns(store)
+
+        for rows in iter_rows(columns, start, end, chunk_size):
+            bar_batch: BarBatch = BarBatch(
+                symbol=symbol,
+                exchange=exchange,
+                interval=interval,
+                gateway_name="DB",
+                tz=DB_TZ,
+                **rows
+            )
+
+            if batch:
+                yield bar_batch
+            else:
+                yield bar_batch.to_bars()
+
+    def iter_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = 10_000,
+        batch: bool = False
+    ) -> Iterator[Union[List[TickData], TickBatch]]:
+        """
+        Load tick data by chunks of chunk_size rows, except the last one.
+        """
+        store: ColumnStore = self.get_tick_store(symbol, exchange)
+        header, columns = self.open_columns(store)
+
+        for rows in iter_rows(columns, start, end, chunk_size):
+            tick_batch: TickBatch = TickBatch(
+                symbol=symbol,
+                exchange=exchange,
+                gateway_name="DB",
+                tz=DB_TZ,
+                name=header.get("name", ""),
+                **rows
+            )
+
+            if batch:
+                yield tick_batch
+            else:
+                yield tick_batch.to_ticks()
+
+    def delete_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval
+    ) -> int:
+        """"""
+        with self.lock:
+            return self.get_bar_store(symbol, exchange, interval).delete()
+
+    def delete_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange
+    ) -> int:
+        """"""
+        with self.lock:
+            return self.get_tick_store(symbol, exchange).delete()
+
+    def open_columns(self, store: ColumnStore) -> Tuple[dict, Dict[str, np.ndarray]]:
+        """
+        Read header and map columns of store with lock held, so that files
+        of the header are not removed by merge meanwhile.
+        """
+        with self.lock:
+            header: dict = store.get_header()
+            return header, store.open_columns(header)
+
+    def get_bar_overview(self) -> List[BarOverview]:
+        """
+        Return overview of bar data from header files.
+        """
+        overviews: List[BarOverview] = []
+
+        for header in get_headers(self.bar_path, BAR_COLUMNS):
+            overview: BarOverview = BarOverview(
+                symbol=header["symbol"],
+                exchange=Exchange(header["exchange"]),
+                interval=Interval(header["interval"]),
+                count=header["count"],
+                start=to_datetime(header["start"]),
+                end=to_datetime(header["end"])
+            )
+            overviews.append(overview)
+
+        return overviews
+
+    def get_tick_overview(self) -> List[TickOverview]:
+        """
+        Return overview of tick data from header files.
+        """
+        overviews: List[TickOverview] = []
+
+        for header in get_headers(self.tick_path, TICK_COLUMNS):
+            overview: TickOverview = TickOverview(
+                symbol=header["symbol"],
+                exchange=Exchange(header["exchange"]),
+                count=header["count"],
+                start=to_datetime(header["start"]),
+                end=to_datetime(header["end"])
+            )
+            overviews.append(overview)
+
+        return overviews
+
+
+def drop_duplicates(batch: BaseBatch) -> BaseBatch:
+    """
+    Keep only the last row of rows with the same datetime in sorted batch.
+    """
+    datetimes: np.ndarray = batch.datetime
+    if len(datetimes) < 2:
+        return batch
+
+    last: np.ndarray = np.ones(len(datetimes), dtype=bool)
+    last[:-1] = datetimes[1:] != datetimes[:-1]
+    if last.all():
+        return batch
+    return batch.take(last)
+
+
+def find_rows(
+    columns: Dict[str, np.ndarray],
+    start: Optional[np.datetime64],
+    end: Optional[np.datetime64]
+) -> Tuple[int, int]:
+    """
+    Find range of rows with datetime between start and end in columns.
+    """
+    datetimes: np.ndarray = columns["datetime"]
+
+    begin: int = 0
+    if start is not None:
+        begin = int(np.searchsorted(datetimes, start, "left"))
+
+    stop: int = len(datetimes)
+    if end is not None:
+        stop = int(np.searchsorted(datetimes, end, "right"))
+
+    return begin, stop
+
+
+def load_rows(columns: Dict[str, np.ndarray], begin: int, stop: int) -> Dict[str, np.ndarray]:
+    """
+    Load rows from begin to stop of columns mapped into memory.
+    """
+    # Copy slices out so that files are not kept open by results
+    return {name: np.array(column[begin:stop]) for name, column in columns.items()}
+
+
+def iter_rows(
+    columns: Dict[str, np.ndarray],
+    start: datetime,
+    end: datetime,
+    chunk_size: int
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Load rows between start and end of columns mapped into memory chunk
+    by chunk. Rows saved after columns mapped are not included.
+    """
+    begin, stop = find_rows(columns, to_datetime64(start), to_datetime64(end))
+
+    for i in range(begin, stop, chunk_size):
+        yield load_rows(columns, i, min(i + chunk_size, stop))
+
+
+def get_headers(path: Path, columns: List[str]) -> List[dict]:
+    """
+    Get headers of all stores in folder.
+    """
+    if not path.exists():
+        return []
+
+    headers: List[dict] = []
+    for store_path in sorted(path.iterdir()):
+        header: dict = ColumnStore(store_path, columns).get_header()
+        if header.get("count", 0):
+            headers.append(header)
+    return headers
+
+
+def to_datetime64(dt: Optional[datetime]) -> Optional[np.datetime64]:
+    """
+    Convert datetime into naive database local time.
+    """
+    if not dt:
+        return None
+    return np.datetime64(convert_tz(dt), "us")
+
+
+def to_datetime(value: str) -> datetime:
+    """
+    Convert datetime string in header into datetime with database tz.
+    """
+    return datetime.fromisoformat(value).replace(tzinfo=DB_TZ)
@@ -2,11 +2,13 @@
 Basic data structure used for general trading function in the trading platform.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import MISSING, dataclass, field, fields
 from datetime import datetime
 from logging import INFO
+from typing import Callable, Dict, Tuple
 
 from .constant import Direction, Exchange, Interval, Offset, Status, Product, OptionType, OrderType
+from .registry import get_vt_key, get_vt_symbol
 
 ACTIVE_STATUSES = set([Status.SUBMITTING, Status.NOTTRADED, Status.PARTTRADED])
 
@@ -78,7 +80,7 @@ class TickData(BaseData):
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
@@ -102,7 +104,7 @@ class BarData(BaseData):
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
@@ -133,8 +135,8 @@ class OrderData(BaseData):
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
-        self.vt_orderid: str = f"{self.gateway_name}.{self.orderid}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
+        self.vt_orderid: str = get_vt_key(self.gateway_name, self.orderid)
         if self.trade_avg_price == 0:
             self.trade_avg_price = self.price
 
@@ -177,9 +179,9 @@ class TradeData(BaseData):
 
     def __post_init__(self):
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
-        self.vt_orderid: str = f"{self.gateway_name}.{self.orderid}"
-        self.vt_tradeid: str = f"{self.gateway_name}.{self.tradeid}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
+        self.vt_orderid: str = get_vt_key(self.gateway_name, self.orderid)
+        self.vt_tradeid: str = get_vt_key(self.gateway_name, self.tradeid)
 
 
 @dataclass
@@ -207,8 +209,8 @@ class PositionData(BaseData):
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
-        self.vt_positionid: str = f"{self.gateway_name}.{self.vt_symbol}.{self.direction.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
+        self.vt_positionid: str = get_vt_key(self.gateway_name, f"{self.vt_symbol}.{self.direction.value}")
 
 @dataclass
 class BalanceData(BaseData):
@@ -245,7 +247,7 @@ class AccountData(BaseData):
         """"""
         if not self.available:
             self.available: float = self.balance - self.frozen
-        self.vt_accountid: str = f"{self.gateway_name}.{self.accountid}"
+        self.vt_accountid: str = get_vt_key(self.gateway_name, self.accountid)
 
 
 @dataclass
@@ -295,7 +297,7 @@ class ContractData(BaseData):
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
@@ -321,8 +323,8 @@ class QuoteData(BaseData):
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
-        self.vt_quoteid: str = f"{self.gateway_name}.{self.quoteid}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
+        self.vt_quoteid: str = get_vt_key(self.gateway_name, self.quoteid)
 
     def is_active(self) -> bool:
         """
@@ -351,7 +353,7 @@ class SubscribeRequest:
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
@@ -371,7 +373,7 @@ class OrderRequest:
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
 
     def create_order_data(self, orderid: str, gateway_name: str) -> OrderData:
         """
@@ -404,7 +406,7 @@ class CancelRequest:
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
@@ -421,7 +423,7 @@ class HistoryRequest:
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
@@ -442,7 +444,7 @@ class QuoteRequest:
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
 
     def create_quote_data(self, quoteid: str, gateway_name: str) -> QuoteData:
         """
@@ -462,3 +464,59 @@ class QuoteRequest:
             gateway_name=gateway_name,
         )
         return quote
+
+
+def slotted(cls: type, name: str, extra_names: Tuple[str, ...]) -> type:
+    """
+    Create a copy of dataclass using __slots__ instead of per-instance
+    __dict__, with attributes set in __post_init__ listed in extra_names.
+
+    Class created keeps the same fields, constructor and methods, and
+    gets a clone method which is also used by copy.copy.
+    """
+    names: Tuple[str, ...] = tuple(f.name for f in fields(cls)) + extra_names
+
+    namespace: dict = {}
+    for base in reversed(cls.__mro__[:-1]):
+        namespace.update(base.__dict__)
+
+    for key in names + ("__dict__", "__weakref__"):
+        namespace.pop(key, None)
+
+    namespace["__slots__"] = names
+    namespace["__qualname__"] = name
+
+    # Defaults of fields not in __init__ were class attributes, so they
+    # are set before calling the original __post_init__
+    defaults: Dict[str, object] = {
+        f.name: f.default for f in fields(cls)
+        if not f.init and f.default is not MISSING
+    }
+    scope: dict = {"post_init": namespace["__post_init__"], "defaults": defaults}
+    lines: list = [f"    self.{n} = defaults[{n!r}]" for n in defaults]
+    source: str = "def __post_init__(self):\n" + "\n".join(lines) + "\n    post_init(self)\n"
+    exec(source, scope)
+
+    namespace["__post_init__"] = scope["__post_init__"]
+    slotted_cls: type = type(name, (object,), namespace)
+
+    # Generate clone function with one assignment for each attribute
+    lines = [f"    obj.{n} = self.{n}" for n in names]
+    source = "def clone(self):\n    obj = new(cls)\n" + "\n".join(lines) + "\n    return obj\n"
+
+    scope = {"new": object.__new__, "cls": slotted_cls}
+    exec(source, scope)
+
+    clone: Callable = scope["clone"]
+    clone.__qualname__ = f"{name}.clone"
+    clone.__doc__ = "Create a shallow copy of data object."
+
+    slotted_cls.clone = clone
+    slotted_cls.__copy__ = clone
+    return slotted_cls
+
+
+SlotTickData: type = slotted(TickData, "SlotTickData", ("vt_symbol",))
+SlotBarData: type = slotted(BarData, "SlotBarData", ("vt_symbol",))
+SlotOrderData: type = slotted(OrderData, "SlotOrderData", ("vt_symbol", "vt_orderid"))
+SlotTradeData: type = slotted(TradeData, "SlotTradeData", ("vt_symbol", "vt_orderid", "vt_tradeid"))
@@ -0,0 +1,105 @@
+"""
+Registry of identifier keys shared by data objects.
+"""
+
+import sys
+from threading import Lock
+from typing import Dict, List
+
+from .constant import Exchange
+
+
+# Max number of vt keys cached for each gateway
+MAX_VT_KEYS: int = 100_000
+
+
+class KeyRegistry:
+    """
+    Interns vt_symbol and other identifier keys, so that equal keys are
+    the same string object and dict lookup with them only compares
+    pointers.
+
+    Keys of gateway objects (vt_orderid, vt_tradeid, etc.) keep growing
+    in a long session, so they are cached in a bounded table instead of
+    being interned, which would never free them.
+
+    Keys can also be mapped to compact integer ids for hot-path tables,
+    and mapped back to strings for display and persistence. Integer ids
+    are only valid within the running process.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self._vt_symbols: Dict[str, Dict[str, str]] = {}
+        self._vt_keys: Dict[str, Dict[str, str]] = {}
+
+        self._ids: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._lock: Lock = Lock()
+
+    def get_vt_symbol(self, symbol: str, exchange: Exchange) -> str:
+        """
+        Get vt_symbol of symbol and exchange, which is formatted only
+        once for each symbol.
+        """
+        # Hashing enum member calls Enum.__hash__ in python, so its raw
+        # value is used as key instead
+        try:
+            return self._vt_symbols[exchange._value_][symbol]
+        except KeyError:
+            vt_symbol: str = sys.intern(f"{symbol}.{exchange.value}")
+            self._vt_symbols.setdefault(exchange.value, {})[symbol] = vt_symbol
+            return vt_symbol
+
+    def get_vt_key(self, gateway_name: str, key: str) -> str:
+        """
+        Get key of object from gateway, such as vt_orderid and vt_tradeid,
+        which is formatted once while cached. Cache of gateway is cleared
+        when full.
+        """
+        try:
+            return self._vt_keys[gateway_name][key]
+        except KeyError:
+            vt_keys: Dict[str, str] = self._vt_keys.setdefault(gateway_name, {})
+            if len(vt_keys) >= MAX_VT_KEYS:
+                vt_keys.clear()
+
+            vt_key: str = f"{gateway_name}.{key}"
+            vt_keys[key] = vt_key
+            return vt_key
+
+    def get_id(self, key: str) -> int:
+        """
+        Get integer id of key, a new id is assigned for key not seen.
+        """
+        key_id: int = self._ids.get(key, None)
+        if key_id is not None:
+            return key_id
+
+        with self._lock:
+            key_id = self._ids.get(key, None)
+            if key_id is None:
+                key_id = len(self._keys)
+                self._keys.append(sys.intern(key))
+                self._ids[key] = key_id
+            return key_id
+
+    def get_key(self, key_id: int) -> str:
+        """
+        Get key string of integer id.
+        """
+        return self._keys[key_id]
+
+    def find_id(self, key: str) -> int:
+        """
+        Get integer id of key without assigning, -1 if not found.
+        """
+        return self._ids.get(key, -1)
+
+
+KEY_REGISTRY: KeyRegistry = KeyRegistry()
+
+get_vt_symbol = KEY_REGISTRY.get_vt_symbol
+get_vt_key = KEY_REGISTRY.get_vt_key
+get_key_id = KEY_REGISTRY.get_id
+get_key = KEY_REGISTRY.get_key
@@ -0,0 +1,276 @@
+"""
+Vectorized resampling of 1 minute bar history into bars of larger interval.
+"""
+
+from datetime import time
+from typing import List, Tuple
+
+import numpy as np
+
+from .batch import BarBatch, DATETIME_DTYPE
+from .constant import Interval
+from .object import BarData
+from .locale import _
+
+
+class BarResampler:
+    """
+    Batch version of BarGenerator for 1 minute bar history, which is
+    much faster to warm up strategies with years of data.
+
+    Price, volume and datetime of bars generated are exactly the same as
+    window bars pushed by BarGenerator created with the same arguments
+    and updated with the same 1 minute bars. Bars not finished at the end
+    of history are not generated, as BarGenerator has not pushed them.
+
+    Weekly bars are aggregated from daily bars of the same ISO week, and
+    a week is finished when daily bar of the next week arrives. Windows
+    of x hours, days or weeks are finished by every x hour, daily or
+    weekly bars, same as MultiBarGenerator (BarGenerator only supports
+    window 1 of daily bars).
+    """
+
+    def __init__(
+        self,
+        window: int = 1,
+        interval: Interval = Interval.MINUTE,
+        daily_end: time = None
+    ) -> None:
+        """
+        Window of MINUTE_15 and HOUR_4 is converted into minutes and hours,
+        same as MultiBarGenerator.add_window.
+        """
+        if interval == Interval.MINUTE_15:
+            window, interval = window * 15, Interval.MINUTE
+        elif interval == Interval.HOUR_4:
+            window, interval = window * 4, Interval.HOUR
+
+        if interval not in {Interval.MINUTE, Interval.HOUR, Interval.DAILY, Interval.WEEKLY}:
+            raise ValueError(f"Unsupported interval of window bar: {interval}")
+
+        self.window: int = window
+        self.interval: Interval = interval
+        self.daily_end: time = daily_end
+
+        if self.interval in {Interval.DAILY, Interval.WEEKLY} and not self.daily_end:
+            raise RuntimeError(_("合成日K线必须传入每日收盘时间"))
+
+    def resample(self, batch: BarBatch) -> BarBatch:
+        """
+        Resample batch of 1 minute bars sorted by datetime.
+        """
+        if self.interval == Interval.MINUTE:
+            return self.resample_minute(batch)
+        elif self.interval == Interval.HOUR:
+            return self.resample_hour(batch)
+        elif self.interval == Interval.DAILY:
+            return self.resample_daily(batch)
+        elif self.interval == Interval.WEEKLY:
+            return self.resample_weekly(batch)
+        else:
+            raise ValueError(f"Unsupported interval of window bar: {self.interval}")
+
+    def resample_bars(self, bars: List[BarData]) -> List[BarData]:
+        """
+        Resample list of 1 minute bars sorted by datetime.
+        """
+        if not bars:
+            return []
+        return self.resample(BarBatch.from_bars(bars)).to_bars()
+
+    def resample_minute(self, batch: BarBatch) -> BarBatch:
+        """
+        Window bar is finished by bar of which minute + 1 can be divided
+        by window.
+        """
+        minutes: np.ndarray = batch.datetime.astype("datetime64[m]")
+        closing: np.ndarray = (minutes.astype(np.int64) % 60 + 1) % self.window == 0
+
+        starts, stop = get_closed_groups(closing)
+        return aggregate(batch, starts, stop, minutes[starts], Interval.MINUTE)
+
+    def resample_hour(self, batch: BarBatch) -> BarBatch:
+        """
+        Hour bar is finished by bar of minute 59, or by bar of another
+        hour. Window bar is then finished by every window hour bars.
+        """
+        count: int = len(batch)
+        if not count:
+            return aggregate(batch, np.arange(0), 0, batch.datetime[:0], Interval.HOUR)
+
+        hours: np.ndarray = batch.datetime.astype("datetime64[h]")
+        hour_changed: np.ndarray = np.ones(count, dtype=bool)
+        hour_changed[1:] = hours[1:].astype(np.int64) % 24 != hours[:-1].astype(np.int64) % 24
+        minute_59: np.ndarray = batch.datetime.astype("datetime64[m]").astype(np.int64) % 60 == 59
+
+        # Bar of minute 59 is added into hour bar of any hour and finishes
+        # it, other bars start new hour bar if hour changed. Bar starting
+        # new hour bar does not finish it, even of minute 59.
+        new_hour: np.ndarray = hour_changed & ~minute_59
+        new_hour[0] = True
+
+        starting: np.ndarray = new_hour.copy()
+        closing: np.ndarray = minute_59 & ~starting
+        starting[1:] |= closing[:-1]
+        closing &= ~starting
+
+        # Bar of minute 59 following another one finishes hour bar only
+        # if the previous one has not, which is resolved in order
+        for i in (np.flatnonzero(minute_59[1:] & minute_59[:-1]) + 1).tolist():
+            starting[i] = closing[i - 1]
+            closing[i] = not starting[i]
+            if i + 1 < count:
+                starting[i + 1] = new_hour[i + 1] or closing[i]
+
+        starts: np.ndarray = np.flatnonzero(starting)
+        if closing[-1]:
+            stop: int = count
+        else:
+            stop = int(starts[-1])
+            starts = starts[:-1]
+
+        hour_batch: BarBatch = aggregate(batch, starts, stop, hours[starts], Interval.HOUR)
+        return self.aggregate_window(hour_batch, Interval.HOUR)
+
+    def resample_daily(self, batch: BarBatch) -> BarBatch:
+        """
+        Window bar is finished by every window daily bars.
+        """
+        return self.aggregate_window(self.aggregate_daily(batch), Interval.DAILY)
+
+    def resample_weekly(self, batch: BarBatch) -> BarBatch:
+        """
+        Window bar is finished by every window weekly bars.
+        """
+        return self.aggregate_window(self.aggregate_weekly(batch), Interval.WEEKLY)
+
+    def aggregate_window(self, batch: BarBatch, interval: Interval) -> BarBatch:
+        """
+        Aggregate every window bars of hour, daily or weekly batch into
+        one, and its datetime is that of the first bar.
+        """
+        if self.window == 1:
+            return batch
+
+        stop: int = len(batch) // self.window * self.window
+        starts: np.ndarray = np.arange(0, stop, self.window)
+        return aggregate(batch, starts, stop, batch.datetime[starts], interval)
+
+    def aggregate_daily(self, batch: BarBatch) -> BarBatch:
+        """
+        Daily bar is finished by bar of daily_end time, and its datetime
+        is date of the bar.
+        """
+        days: np.ndarray = batch.datetime.astype("datetime64[D]")
+
+        end: time = self.daily_end
+        end_offset: np.timedelta64 = np.timedelta64(
+            ((end.hour * 60 + end.minute) * 60 + end.second) * 1_000_000 + end.microsecond, "us"
+        )
+        closing: np.ndarray = batch.datetime - days == end_offset
+
+        starts, stop = get_closed_groups(closing)
+        ends: np.ndarray = np.append(starts[1:], stop) - 1
+        return aggregate(batch, starts, stop, days[ends], Interval.DAILY)
+
+    def aggregate_weekly(self, batch: BarBatch) -> BarBatch:
+        """
+        Weekly bar is finished by daily bar of the next week, and its
+        datetime is that of the first daily bar.
+        """
+        daily_batch: BarBatch = self.aggregate_daily(batch)
+        count: int = len(daily_batch)
+        if not count:
+            return aggregate(daily_batch, np.arange(0), 0, daily_batch.datetime, Interval.WEEKLY)
+
+        # 1970-01-01 is Thursday, so weeks starting from Monday are
+        # counted from 3 days before
+        days: np.ndarray = daily_batch.datetime.astype("datetime64[D]").astype(np.int64)
+        weeks: np.ndarray = (days + 3) // 7
+
+        starting: np.ndarray = np.ones(count, dtype=bool)
+        starting[1:] = weeks[1:] != weeks[:-1]
+
+        starts: np.ndarray = np.flatnonzero(starting)
+        stop: int = int(starts[-1])
+        starts = starts[:-1]
+
+        return aggregate(daily_batch, starts, stop, daily_batch.datetime[starts], Interval.WEEKLY)
+
+
+def get_closed_groups(closing: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Get start positions of groups finished by closing bars, and stop
+    position after the last closing bar.
+    """
+    ends: np.ndarray = np.flatnonzero(closing)
+    if not len(ends):
+        return ends, 0
+
+    starts: np.ndarray = np.empty(len(ends), dtype=np.int64)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    return starts, int(ends[-1]) + 1
+
+
+def aggregate(
+    batch: BarBatch,
+    starts: np.ndarray,
+    stop: int,
+    datetime: np.ndarray,
+    interval: Interval
+) -> BarBatch:
+    """
+    Aggregate bars into one bar for each group of adjacent rows, which
+    begins at start position and ends before the next one or stop.
+    """
+    if not len(starts):
+        empty: np.ndarray = np.zeros(0)
+        columns: dict = {name: empty for name in batch.columns}
+    else:
+        ends: np.ndarray = np.append(starts[1:], stop) - 1
+        columns = {
+            "open_price": batch.open_price[starts],
+            "high_price": np.maximum.reduceat(batch.high_price[:stop], starts),
+            "low_price": np.minimum.reduceat(batch.low_price[:stop], starts),
+            "close_price": batch.close_price[ends],
+            "volume": get_group_sums(batch.volume, starts, ends),
+            "turnover": get_group_sums(batch.turnover, starts, ends),
+            "open_interest": batch.open_interest[ends],
+        }
+
+    return BarBatch(
+        symbol=batch.symbol,
+        exchange=batch.exchange,
+        interval=interval,
+        gateway_name=batch.gateway_name,
+        datetime=np.asarray(datetime, dtype=DATETIME_DTYPE),
+        tz=batch.tz,
+        **columns
+    )
+
+
+def get_group_sums(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Sum values of each group in the same order as BarGenerator adds them
+    one by one, so that float results are exactly the same. Summing with
+    numpy.add.reduceat is not sequential, and cumsum has larger error.
+
+    Values at the same position of all groups are added together, with
+    groups sorted by length so that groups still going are a prefix.
+    """
+    lengths: np.ndarray = ends - starts + 1
+    order: np.ndarray = np.argsort(-lengths, kind="stable")
+    sorted_starts: np.ndarray = starts[order]
+    sorted_lengths: np.ndarray = lengths[order]
+
+    sums: np.ndarray = np.zeros(len(starts))
+    active: int = len(starts)
+    for i in range(int(sorted_lengths[0])):
+        while sorted_lengths[active - 1] <= i:
+            active -= 1
+        sums[:active] += values[sorted_starts[:active] + i]
+
+    result: np.ndarray = np.empty_like(sums)
+    result[order] = sums
+    return result
@@ -33,7 +33,9 @@ SETTINGS: Dict[str, Any] = {
     "database.host": "",
     "database.port": 0,
     "database.user": "",
-    "database.password": ""
+    "database.password": "",
+    "database.cache_size": 0,
+    "database.write_behind": False
 }
 
 
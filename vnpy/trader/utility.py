@@ -5,16 +5,20 @@ General utility functions.
 import json
 import logging
 import sys
+import warnings
 from datetime import datetime, time
 from pathlib import Path
-from typing import Callable, Dict, Tuple, Union, Optional
+from typing import Callable, Dict, List, Tuple, Union, Optional
 from decimal import Decimal
 from math import floor, ceil
+from inspect import BoundArguments, Parameter, Signature, signature
 
 import numpy as np
 import talib
+from numpy.lib.stride_tricks import sliding_window_view
 
 from .object import BarData, TickData
+from .indicator import BaseIndicator
 from .constant import Exchange, Interval
 from .locale import _
 
@@ -488,6 +492,237 @@ class BarGenerator:
         return bar
 
 
+class BarWindow:
+    """
+    Window bar aggregated from bars of smaller interval, used by
+    MultiBarGenerator.
+    """
+
+    def __init__(
+        self,
+        window: int,
+        interval: Interval,
+        on_window_bar: Callable,
+        reuse: bool = False
+    ) -> None:
+        """Constructor"""
+        self.window: int = window
+        self.interval: Interval = interval
+        self.on_window_bar: Callable = on_window_bar
+        self.reuse: bool = reuse
+
+        self.bar: BarData = None
+        self.count: int = 0
+        self.spare: BarData = None
+
+    def update(self, bar: BarData, dt: datetime) -> None:
+        """
+        Add bar into window bar, which is started at dt if not yet.
+        """
+        window_bar: BarData = self.bar
+
+        if not window_bar:
+            window_bar = self.spare
+            if window_bar:
+                self.spare = None
+                window_bar.datetime = dt
+                window_bar.open_price = bar.open_price
+                window_bar.high_price = bar.high_price
+                window_bar.low_price = bar.low_price
+                window_bar.volume = 0
+                window_bar.turnover = 0
+            else:
+                window_bar = BarData(
+                    symbol=bar.symbol,
+                    exchange=bar.exchange,
+                    datetime=dt,
+                    gateway_name=bar.gateway_name,
+                    open_price=bar.open_price,
+                    high_price=bar.high_price,
+                    low_price=bar.low_price
+                )
+            self.bar = window_bar
+        else:
+            window_bar.high_price = max(window_bar.high_price, bar.high_price)
+            window_bar.low_price = min(window_bar.low_price, bar.low_price)
+
+        window_bar.close_price = bar.close_price
+        window_bar.volume += bar.volume
+        window_bar.turnover += bar.turnover
+        window_bar.open_interest = bar.open_interest
+
+        self.count += 1
+
+    def push(self) -> None:
+        """
+        Push window bar finished, which is kept to be started again if
+        reused.
+        """
+        window_bar: BarData = self.bar
+        self.bar = None
+        self.count = 0
+
+        self.on_window_bar(window_bar)
+
+        if self.reuse:
+            self.spare = window_bar
+
+
+class MultiBarGenerator:
+    """
+    Generate bars of multiple windows from tick data or 1 minute bar data
+    in one pass, instead of chaining BarGenerator for each window.
+
+    Bars of each window are the same as pushed by BarGenerator with the
+    same window and interval, and by BarResampler, while:
+    1. MINUTE_15 and HOUR_4 are 15 minute and 4 hour windows
+    2. x day window bar and x week window bar are finished by every x
+    daily bars or weekly bars, and weekly bar is finished by daily bar
+    of the next week
+
+    Hour, daily and weekly bars are aggregated only once for all windows,
+    and 1 minute/hour/day/week windows push these bars directly.
+
+    With reuse, bar object pushed is started again as the next window
+    bar after callback returns, so callbacks should not keep it.
+    """
+
+    def __init__(self, daily_end: time = None, reuse: bool = False) -> None:
+        """Constructor"""
+        self.daily_end: time = daily_end
+        self.reuse: bool = reuse
+
+        self.tick_generator: BarGenerator = BarGenerator(self.update_bar)
+
+        self.minute_windows: List[BarWindow] = []
+        self.hour_windows: List[BarWindow] = []
+        self.daily_windows: List[BarWindow] = []
+        self.weekly_windows: List[BarWindow] = []
+
+        self.hour_window: BarWindow = BarWindow(1, Interval.HOUR, self.on_hour_bar, reuse)
+        self.daily_window: BarWindow = BarWindow(1, Interval.DAILY, self.on_daily_bar, reuse)
+        self.weekly_window: BarWindow = BarWindow(1, Interval.WEEKLY, self.on_weekly_bar, reuse)
+
+    def add_window(self, window: int, interval: Interval, on_window_bar: Callable) -> None:
+        """
+        Add callback of window bar, such as (1, MINUTE) for 1 minute bar
+        and (4, HOUR) or (1, HOUR_4) for 4 hour bar.
+        """
+        if interval == Interval.MINUTE_15:
+            window, interval = window * 15, Interval.MINUTE
+        elif interval == Interval.HOUR_4:
+            window, interval = window * 4, Interval.HOUR
+
+        if interval in {Interval.DAILY, Interval.WEEKLY} and not self.daily_end:
+            raise RuntimeError(_("合成日K线必须传入每日收盘时间"))
+
+        windows: Dict[Interval, List[BarWindow]] = {
+            Interval.MINUTE: self.minute_windows,
+            Interval.HOUR: self.hour_windows,
+            Interval.DAILY: self.daily_windows,
+            Interval.WEEKLY: self.weekly_windows,
+        }
+        if interval not in windows:
+            raise ValueError(f"Unsupported interval of window bar: {interval}")
+
+        bar_window: BarWindow = BarWindow(window, interval, on_window_bar, self.reuse)
+        windows[interval].append(bar_window)
+
+    def update_tick(self, tick: TickData) -> None:
+        """
+        Update new tick data into generator.
+        """
+        self.tick_generator.update_tick(tick)
+
+    def generate(self) -> Optional[BarData]:
+        """
+        Finish 1 minute bar of ticks immediately and update it.
+        """
+        return self.tick_generator.generate()
+
+    def update_bar(self, bar: BarData) -> None:
+        """
+        Update 1 minute bar into generator.
+        """
+        dt: datetime = bar.datetime
+
+        if self.minute_windows:
+            minute_dt: datetime = dt.replace(second=0, microsecond=0)
+            next_minute: int = dt.minute + 1
+
+            for bar_window in self.minute_windows:
+                if bar_window.window == 1:
+                    bar_window.on_window_bar(bar)
+                    continue
+
+                bar_window.update(bar, minute_dt)
+                if not next_minute % bar_window.window:
+                    bar_window.push()
+
+        if self.hour_windows:
+            self.update_hour(bar)
+
+        if self.daily_windows or self.weekly_windows:
+            self.daily_window.update(bar, dt)
+
+            if dt.time() == self.daily_end:
+                self.daily_window.bar.datetime = dt.replace(hour=0, minute=0, second=0, microsecond=0)
+                self.daily_window.push()
+
+    def update_hour(self, bar: BarData) -> None:
+        """
+        Update 1 minute bar into hour bar, same as BarGenerator.
+        """
+        hour_window: BarWindow = self.hour_window
+        dt: datetime = bar.datetime
+
+        if not hour_window.bar:
+            hour_window.update(bar, dt.replace(minute=0, second=0, microsecond=0))
+        elif dt.minute == 59:
+            hour_window.update(bar, None)
+            hour_window.push()
+        elif dt.hour != hour_window.bar.datetime.hour:
+            hour_window.push()
+            hour_window.update(bar, dt.replace(minute=0, second=0, microsecond=0))
+        else:
+            hour_window.update(bar, None)
+
+    def on_hour_bar(self, bar: BarData) -> None:
+        """"""
+        update_windows(self.hour_windows, bar)
+
+    def on_daily_bar(self, bar: BarData) -> None:
+        """"""
+        update_windows(self.daily_windows, bar)
+
+        if self.weekly_windows:
+            weekly_window: BarWindow = self.weekly_window
+            if (
+                weekly_window.bar
+                and bar.datetime.isocalendar()[:2] != weekly_window.bar.datetime.isocalendar()[:2]
+            ):
+                weekly_window.push()
+            weekly_window.update(bar, bar.datetime)
+
+    def on_weekly_bar(self, bar: BarData) -> None:
+        """"""
+        update_windows(self.weekly_windows, bar)
+
+
+def update_windows(bar_windows: List[BarWindow], bar: BarData) -> None:
+    """
+    Update bar into windows finished by every window bars.
+    """
+    for bar_window in bar_windows:
+        if bar_window.window == 1:
+            bar_window.on_window_bar(bar)
+            continue
+
+        bar_window.update(bar, bar.datetime)
+        if bar_window.count == bar_window.window:
+            bar_window.push()
+
+
 class ArrayManager(object):
     """
     For:
@@ -495,7 +730,7 @@ class ArrayManager(object):
     2. calculating technical indicator value
     """
 
-    def __init__(self, size: int = 100) -> None:
+    def __init__(self, size: int = 100, cache: bool = False) -> None:
         """Constructor"""
         self.count: int = 0
         self.size: int = size
@@ -509,10 +744,21 @@ class ArrayManager(object):
         self.turnover_array: np.ndarray = np.zeros(size)
         self.open_interest_array: np.ndarray = np.zeros(size)
 
+        self.indicators: List[BaseIndicator] = []
+
+        self.cache: Dict[tuple, object] = {}
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+        if cache:
+            self.enable_cache()
+
     def update_bar(self, bar: BarData) -> None:
         """
         Update new bar data into array manager.
         """
+        if self.cache:
+            self.cache.clear()
+
         self.count += 1
         if not self.inited and self.count >= self.size:
             self.inited = True
@@ -533,6 +779,100 @@ class ArrayManager(object):
         self.turnover_array[-1] = bar.turnover
         self.open_interest_array[-1] = bar.open_interest
 
+        for indicator in self.indicators:
+            indicator.update_bar(bar)
+
+    def update_arrays(self, arrays: Dict[str, np.ndarray]) -> None:
+        """
+        Update bars in arrays of open, high, low, close, volume, turnover
+        and open_interest at once, as returned by load_bar_arrays. Only
+        the latest size bars are kept, while indicators are fed all.
+        """
+        if self.cache:
+            self.cache.clear()
+
+        count: int = len(arrays["close"])
+        if not count:
+            return
+
+        self.count += count
+        if not self.inited and self.count >= self.size:
+            self.inited = True
+
+        n: int = min(count, self.size)
+        for name in ARRAY_NAMES:
+            array: np.ndarray = getattr(self, f"{name}_array")
+            array[:-n] = array[n:]
+            array[-n:] = arrays[name][-n:]
+
+        update_indicators(self.indicators, arrays)
+
+    def add_indicator(self, indicator: BaseIndicator) -> BaseIndicator:
+        """
+        Register incremental indicator to be updated with each new bar,
+        bars already in array manager are fed into it first.
+        """
+        count: int = min(self.count, self.size)
+        if count:
+            for high, low, close, volume in zip(
+                self.high[-count:].tolist(),
+                self.low[-count:].tolist(),
+                self.close[-count:].tolist(),
+                self.volume[-count:].tolist()
+            ):
+                indicator.update(high, low, close, volume)
+
+        self.indicators.append(indicator)
+        return indicator
+
+    def enable_cache(self) -> None:
+        """
+        Cache results of indicator methods until next update_bar, so that
+        an indicator called several times on the same bar, such as by
+        different signals of strategy, is only calculated once.
+
+        Arrays returned from cache are shared by callers and read-only.
+        """
+        for name in INDICATOR_METHODS:
+            setattr(self, name, self.create_cached_method(name))
+
+    def create_cached_method(self, name: str) -> Callable:
+        """
+        Wrap indicator method with cache keyed on method name and all
+        arguments including array flag. Defaults are filled in the key,
+        so that the same call in different forms (e.g. sma(20) and
+        sma(20, False) called inside boll) shares one result.
+        """
+        method: Callable = getattr(self, name)
+        sig: Signature = signature(method)
+        defaults: tuple = tuple(p.default for p in sig.parameters.values())
+        required: int = defaults.count(Parameter.empty)
+        cache: Dict[tuple, object] = self.cache
+
+        def cached_method(*args, **kwargs) -> object:
+            """"""
+            if kwargs or len(args) < required:
+                bound: BoundArguments = sig.bind(*args, **kwargs)
+                bound.apply_defaults()
+                args = tuple(bound.arguments.values())
+            elif len(args) < len(defaults):
+                args += defaults[len(args):]
+
+            key: tuple = (name, args)
+            result: object = cache.get(key, None)
+
+            if result is None:
+                self.cache_misses += 1
+                result = method(*args)
+                set_readonly(result)
+                cache[key] = result
+            else:
+                self.cache_hits += 1
+
+            return result
+
+        return cached_method
+
     @property
     def open(self) -> np.ndarray:
         """
@@ -1047,6 +1387,543 @@ class ArrayManager(object):
         return k[-1], d[-1]
 
 
+INDICATOR_METHODS: List[str] = [
+    name for name, value in vars(ArrayManager).items()
+    if callable(value) and not name.startswith("_")
+    and name not in {"update_bar", "update_arrays", "add_indicator", "enable_cache", "create_cached_method"}
+]
+
+
+ARRAY_NAMES: List[str] = [
+    "open", "high", "low", "close", "volume", "turnover", "open_interest"
+]
+
+
+def update_indicators(indicators: List[BaseIndicator], arrays: Dict[str, np.ndarray]) -> None:
+    """
+    Feed incremental indicators with bars in arrays one by one.
+    """
+    if not indicators:
+        return
+
+    for high, low, close, volume in zip(
+        arrays["high"].tolist(),
+        arrays["low"].tolist(),
+        arrays["close"].tolist(),
+        arrays["volume"].tolist()
+    ):
+        for indicator in indicators:
+            indicator.update(high, low, close, volume)
+
+
+def set_readonly(result: object) -> None:
+    """
+    Mark array result, or arrays in tuple result, as read-only.
+    """
+    if isinstance(result, tuple):
+        for value in result:
+            if isinstance(value, np.ndarray):
+                value.setflags(write=False)
+    elif isinstance(result, np.ndarray):
+        result.setflags(write=False)
+
+
+class RingArrayManager(ArrayManager):
+    """
+    Drop-in replacement of ArrayManager with O(1) update.
+
+    Bars are written into a ring buffer of double length, each value at
+    both its position and position + size, so that the latest size bars
+    are always a contiguous view in chronological order which can be
+    passed to talib directly. Arrays are views set on each update, and
+    are only valid until next update.
+    """
+
+    def __init__(self, size: int = 100, cache: bool = False) -> None:
+        """Constructor"""
+        self.count: int = 0
+        self.size: int = size
+        self.inited: bool = False
+
+        # Rows: open, high, low, close, volume, turnover, open_interest
+        self.buffer: np.ndarray = np.zeros((7, size * 2))
+        self.set_arrays(size - 1)
+
+        self.indicators: List[BaseIndicator] = []
+
+        self.cache: Dict[tuple, object] = {}
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+        if cache:
+            self.enable_cache()
+
+    def update_bar(self, bar: BarData) -> None:
+        """
+        Update new bar data into array manager.
+        """
+        if self.cache:
+            self.cache.clear()
+
+        i: int = self.count % self.size
+
+        self.count += 1
+        if not self.inited and self.count >= self.size:
+            self.inited = True
+
+        values: tuple = (
+            bar.open_price,
+            bar.high_price,
+            bar.low_price,
+            bar.close_price,
+            bar.volume,
+            bar.turnover,
+            bar.open_interest
+        )
+        self.buffer[:, i] = values
+        self.buffer[:, i + self.size] = values
+
+        self.set_arrays(i)
+
+        for indicator in self.indicators:
+            indicator.update_bar(bar)
+
+    def update_arrays(self, arrays: Dict[str, np.ndarray]) -> None:
+        """
+        Update bars in arrays at once, written into the same positions
+        of ring buffer as update_bar one by one.
+        """
+        if self.cache:
+            self.cache.clear()
+
+        count: int = len(arrays["close"])
+        if not count:
+            return
+
+        n: int = min(count, self.size)
+        positions: np.ndarray = np.arange(self.count + count - n, self.count + count) % self.size
+
+        self.count += count
+        if not self.inited and self.count >= self.size:
+            self.inited = True
+
+        values: np.ndarray = np.array([arrays[name][-n:] for name in ARRAY_NAMES])
+        self.buffer[:, positions] = values
+        self.buffer[:, positions + self.size] = values
+
+        self.set_arrays((self.count - 1) % self.size)
+
+        update_indicators(self.indicators, arrays)
+
+    def set_arrays(self, i: int) -> None:
+        """
+        Set arrays as views of the latest size bars, of which the last
+        one is written at position i.
+        """
+        window: np.ndarray = self.buffer[:, i + 1:i + 1 + self.size]
+        self.open_array = window[0]
+        self.high_array = window[1]
+        self.low_array = window[2]
+        self.close_array = window[3]
+        self.volume_array = window[4]
+        self.turnover_array = window[5]
+        self.open_interest_array = window[6]
+
+
+class PortfolioArrayManager:
+    """
+    Time series container of bar data of multiple symbols, stored as 2-D
+    arrays of symbols x time so that indicators and cross-sectional
+    signals are calculated for all symbols at once.
+
+    Indicator methods return an array of the latest value of each symbol,
+    or the 2-D time series with array=True. Symbols without bar at a
+    timestamp keep their last close price with zero volume.
+
+    As RingArrayManager does, bars are written into a ring buffer and
+    arrays returned are views only valid until next update.
+    """
+
+    def __init__(self, vt_symbols: List[str], size: int = 100) -> None:
+        """Constructor"""
+        self.vt_symbols: List[str] = list(vt_symbols)
+        self.indexes: Dict[str, int] = {vt_symbol: i for i, vt_symbol in enumerate(self.vt_symbols)}
+
+        self.count: int = 0
+        self.size: int = size
+        self.inited: bool = False
+
+        # Rows: open, high, low, close, volume, turnover, open_interest
+        self.buffer: np.ndarray = np.zeros((7, len(self.vt_symbols), size * 2))
+        self.window: np.ndarray = self.buffer[:, :, :size]
+        self.values: np.ndarray = np.zeros((7, len(self.vt_symbols)))
+
+        self.managers: Dict[str, SymbolArrayManager] = {}
+
+    def update_bars(self, bars: Dict[str, BarData]) -> None:
+        """
+        Update bars of the same timestamp into array manager, bars of
+        symbols not in portfolio are ignored.
+        """
+        i: int = self.count % self.size
+
+        self.count += 1
+        if not self.inited and self.count >= self.size:
+            self.inited = True
+
+        # Fill symbols without bar with last close price
+        values: np.ndarray = self.values
+        values[0:3] = values[3]
+        values[4:6] = 0
+
+        indexes: List[int] = []
+        rows: List[tuple] = []
+        for vt_symbol, bar in bars.items():
+            index: Optional[int] = self.indexes.get(vt_symbol, None)
+            if index is None:
+                continue
+
+            indexes.append(index)
+            rows.append((
+                bar.open_price,
+                bar.high_price,
+                bar.low_price,
+                bar.close_price,
+                bar.volume,
+                bar.turnover,
+                bar.open_interest
+            ))
+
+        if rows:
+            values[:, indexes] = np.array(rows).T
+
+        self.buffer[:, :, i] = values
+        self.buffer[:, :, i + self.size] = values
+
+        self.window = self.buffer[:, :, i + 1:i + 1 + self.size]
+
+        for vt_symbol, manager in self.managers.items():
+            if manager.cache:
+                manager.cache.clear()
+
+            if manager.indicators and vt_symbol in bars:
+                bar: BarData = bars[vt_symbol]
+                for indicator in manager.indicators:
+                    indicator.update_bar(bar)
+
+    def get_array_manager(self, vt_symbol: str) -> "SymbolArrayManager":
+        """
+        Get array manager of one symbol, which supports all methods of
+        ArrayManager on views of the symbol's rows.
+        """
+        manager: Optional[SymbolArrayManager] = self.managers.get(vt_symbol, None)
+        if not manager:
+            manager = SymbolArrayManager(self, vt_symbol)
+            self.managers[vt_symbol] = manager
+        return manager
+
+    @property
+    def open_array(self) -> np.ndarray:
+        """"""
+        return self.window[0]
+
+    @property
+    def high_array(self) -> np.ndarray:
+        """"""
+        return self.window[1]
+
+    @property
+    def low_array(self) -> np.ndarray:
+        """"""
+        return self.window[2]
+
+    @property
+    def close_array(self) -> np.ndarray:
+        """"""
+        return self.window[3]
+
+    @property
+    def volume_array(self) -> np.ndarray:
+        """"""
+        return self.window[4]
+
+    @property
+    def turnover_array(self) -> np.ndarray:
+        """"""
+        return self.window[5]
+
+    @property
+    def open_interest_array(self) -> np.ndarray:
+        """"""
+        return self.window[6]
+
+    open = open_array
+    high = high_array
+    low = low_array
+    close = close_array
+    volume = volume_array
+    turnover = turnover_array
+    open_interest = open_interest_array
+
+    def apply(self, func: Callable, inputs: List[np.ndarray], *args) -> np.ndarray:
+        """
+        Run talib function on rows of each symbol, used by recursive
+        indicators which can not be vectorized across symbols.
+        """
+        return np.array([func(*[data[i] for data in inputs], *args) for i in range(len(self.vt_symbols))])
+
+    def sma(self, n: int, array: bool = False) -> np.ndarray:
+        """
+        Simple moving average.
+        """
+        if array:
+            return get_rolling(self.close, n).mean(axis=2)
+        return self.close[:, -n:].mean(axis=1)
+
+    def std(self, n: int, nbdev: int = 1, array: bool = False) -> np.ndarray:
+        """
+        Standard deviation.
+        """
+        if array:
+            return get_rolling(self.close, n).std(axis=2) * nbdev
+        return self.close[:, -n:].std(axis=1) * nbdev
+
+    def roc(self, n: int, array: bool = False) -> np.ndarray:
+        """
+        ROC.
+        """
+        # Symbols without any bar yet have zero price
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if array:
+                result: np.ndarray = np.full(self.close.shape, np.nan)
+                result[:, n:] = (self.close[:, n:] / self.close[:, :-n] - 1) * 100
+                return result
+            return (self.close[:, -1] / self.close[:, -n - 1] - 1) * 100
+
+    def returns(self, n: int = 1, array: bool = False) -> np.ndarray:
+        """
+        Return of close price over n bars.
+        """
+        return self.roc(n, array) / 100
+
+    def donchian(self, n: int, array: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Donchian Channel.
+        """
+        if array:
+            return get_rolling(self.high, n).max(axis=2), get_rolling(self.low, n).min(axis=2)
+        return self.high[:, -n:].max(axis=1), self.low[:, -n:].min(axis=1)
+
+    def boll(self, n: int, dev: float, array: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bollinger Channel.
+        """
+        mid: np.ndarray = self.sma(n, array)
+        std: np.ndarray = self.std(n, 1, array)
+
+        up: np.ndarray = mid + std * dev
+        down: np.ndarray = mid - std * dev
+
+        return up, down
+
+    def ema(self, n: int, array: bool = False) -> np.ndarray:
+        """
+        Exponential moving average.
+        """
+        result: np.ndarray = self.apply(talib.EMA, [self.close], n)
+        if array:
+            return result
+        return result[:, -1]
+
+    def atr(self, n: int, array: bool = False) -> np.ndarray:
+        """
+        ATR.
+        """
+        result: np.ndarray = self.apply(talib.ATR, [self.high, self.low, self.close], n)
+        if array:
+            return result
+        return result[:, -1]
+
+    def rsi(self, n: int, array: bool = False) -> np.ndarray:
+        """
+        RSI.
+        """
+        result: np.ndarray = self.apply(talib.RSI, [self.close], n)
+        if array:
+            return result
+        return result[:, -1]
+
+    def macd(
+        self,
+        fast_period: int,
+        slow_period: int,
+        signal_period: int,
+        array: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        MACD.
+        """
+        results: List[tuple] = [
+            talib.MACD(close, fast_period, slow_period, signal_period) for close in self.close
+        ]
+        macd, signal, hist = (np.array(result) for result in zip(*results))
+
+        if array:
+            return macd, signal, hist
+        return macd[:, -1], signal[:, -1], hist[:, -1]
+
+    def rank(self, values: np.ndarray, pct: bool = True) -> np.ndarray:
+        """
+        Cross-sectional rank of values across symbols (first axis), from 0
+        for the smallest. Equal values are ranked by symbol order, and nan
+        values are left as nan.
+
+        With pct, ranks are scaled into [0, 1] by number of valid values.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        invalid: np.ndarray = np.isnan(values)
+
+        order: np.ndarray = np.argsort(values, axis=0, kind="stable")
+        positions: np.ndarray = np.arange(len(values), dtype=np.float64).reshape((-1,) + (1,) * (values.ndim - 1))
+
+        ranks: np.ndarray = np.empty_like(values)
+        np.put_along_axis(ranks, order, np.broadcast_to(positions, values.shape), axis=0)
+
+        if pct:
+            valid_count: np.ndarray = (~invalid).sum(axis=0)
+            ranks /= np.maximum(valid_count - 1, 1)
+
+        ranks[invalid] = np.nan
+        return ranks
+
+    def zscore(self, values: np.ndarray) -> np.ndarray:
+        """
+        Cross-sectional z-score of values across symbols (first axis),
+        ignoring nan values. Z-score is 0 when all values are equal.
+        """
+        values = np.asarray(values, dtype=np.float64)
+
+        # Columns of all nan values get nan mean with warning
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            mean: np.ndarray = np.nanmean(values, axis=0)
+            std: np.ndarray = np.nanstd(values, axis=0)
+
+        return np.divide(values - mean, std, out=np.zeros_like(values), where=std > 0)
+
+    def corr(self, n: int) -> np.ndarray:
+        """
+        Correlation matrix of symbols calculated with return of each bar
+        in the latest n bars.
+        """
+        close: np.ndarray = self.close[:, -n - 1:]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns: np.ndarray = close[:, 1:] / close[:, :-1] - 1
+            return np.corrcoef(returns)
+
+
+class SymbolArrayManager(ArrayManager):
+    """
+    Array manager of one symbol in PortfolioArrayManager, with arrays of
+    views into the portfolio's rows of the symbol.
+    """
+
+    def __init__(self, portfolio: PortfolioArrayManager, vt_symbol: str) -> None:
+        """Constructor"""
+        self.portfolio: PortfolioArrayManager = portfolio
+        self.vt_symbol: str = vt_symbol
+        self.index: int = portfolio.indexes[vt_symbol]
+
+        self.indicators: List[BaseIndicator] = []
+
+        self.cache: Dict[tuple, object] = {}
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+
+    def update_bar(self, bar: BarData) -> None:
+        """
+        Update portfolio with bar of this symbol only.
+        """
+        self.portfolio.update_bars({self.vt_symbol: bar})
+
+    def update_arrays(self, arrays: Dict[str, np.ndarray]) -> None:
+        """
+        Bars of all symbols are updated together by portfolio, so arrays
+        of one symbol cannot be updated alone.
+        """
+        raise TypeError(
+            "update_arrays is not supported by array manager of portfolio, "
+            "use PortfolioArrayManager.update_bars instead"
+        )
+
+    @property
+    def count(self) -> int:
+        """"""
+        return self.portfolio.count
+
+    @property
+    def size(self) -> int:
+        """"""
+        return self.portfolio.size
+
+    @property
+    def inited(self) -> bool:
+        """"""
+        return self.portfolio.inited
+
+    @property
+    def open_array(self) -> np.ndarray:
+        """"""
+        return self.portfolio.window[0, self.index]
+
+    @property
+    def high_array(self) -> np.ndarray:
+        """"""
+        return self.portfolio.window[1, self.index]
+
+    @property
+    def low_array(self) -> np.ndarray:
+        """"""
+        return self.portfolio.window[2, self.index]
+
+    @property
+    def close_array(self) -> np.ndarray:
+        """"""
+        return self.portfolio.window[3, self.index]
+
+    @property
+    def volume_array(self) -> np.ndarray:
+        """"""
+        return self.portfolio.window[4, self.index]
+
+    @property
+    def turnover_array(self) -> np.ndarray:
+        """"""
+        return self.portfolio.window[5, self.index]
+
+    @property
+    def open_interest_array(self) -> np.ndarray:
+        """"""
+        return self.portfolio.window[6, self.index]
+
+    open = open_array
+    high = high_array
+    low = low_array
+    close = close_array
+    volume = volume_array
+    turnover = turnover_array
+    open_interest = open_interest_array
+
+
+def get_rolling(data: np.ndarray, n: int) -> np.ndarray:
+    """
+    Get rolling windows of n values along last axis, padded with nan at
+    head so that result of reducing windows has the same shape as data.
+    """
+    padding: np.ndarray = np.full(data.shape[:-1] + (n - 1,), np.nan)
+    return sliding_window_view(np.concatenate([padding, data], axis=-1), n, axis=-1)
+
+
 def virtual(func: Callable) -> Callable:
     """
     mark a function as "virtual", which means that this function can be override.
@@ -0,0 +1,375 @@
+"""
+Write-behind wrapper of database batching streaming saves in a background thread.
+"""
+
+import atexit
+import traceback
+from copy import copy
+from datetime import datetime
+from threading import Condition, Lock, RLock, Thread
+from time import perf_counter
+from typing import Dict, Iterator, List, Union
+
+from vnpy.event.engine import LatencyStats
+
+from .batch import BarBatch, TickBatch
+from .constant import Exchange, Interval
+from .database import BaseDatabase, BarOverview, TickOverview
+from .object import BarData, TickData
+
+
+class WriteBehindDatabase(BaseDatabase):
+    """
+    Wrapper of database, which is used with database.write_behind set.
+
+    Data saved with stream=True is accumulated per table (bar data of
+    one symbol and interval, or tick data of one symbol), and written by
+    a background thread in one save call per table when any table has
+    flush_size records, or the oldest record waited flush_interval
+    seconds. Callers block when buffer_size records are pending, for at
+    most put_timeout seconds. Records saved are dropped and counted if
+    the buffer is still full by then, or at once while writing fails or
+    records are being dropped, so that callers such as the event thread
+    never hang on a database down.
+
+    Records of each table are written in the order saved. Other saves,
+    loads and deletes flush pending records first, so they see data
+    saved before them. Records failed to write are kept and retried, and
+    the error is printed once until records are written again.
+    Pending records are flushed on close, which is also called at exit.
+    """
+
+    def __init__(
+        self,
+        database: BaseDatabase,
+        flush_size: int = 1000,
+        flush_interval: float = 1,
+        buffer_size: int = 100_000,
+        put_timeout: float = 5
+    ) -> None:
+        """"""
+        self.database: BaseDatabase = database
+        self.flush_size: int = flush_size
+        self.flush_interval: float = flush_interval
+        self.buffer_size: int = buffer_size
+        self.put_timeout: float = put_timeout
+
+        self.buffers: Dict[tuple, list] = {}
+        self.first_times: Dict[tuple, float] = {}
+        self.pending: int = 0
+        self.size_due: bool = False
+
+        self.lag_stats: LatencyStats = LatencyStats()
+        self.flush_stats: LatencyStats = LatencyStats()
+        self.errors: int = 0
+        self.failing: bool = False
+        self.last_error: str = ""
+        self.dropped: int = 0
+        self.dropping: bool = False
+
+        self.lock: Lock = Lock()
+        self.condition: Condition = Condition(self.lock)
+        self.not_full: Condition = Condition(self.lock)
+        self.write_lock: RLock = RLock()
+
+        self.active: bool = True
+        self.thread: Thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+        atexit.register(self.close)
+
+    def save_bar_data(self, bars: List[BarData], stream: bool = False) -> bool:
+        """"""
+        if not bars:
+            return False
+
+        first: BarData = bars[0]
+        if stream and self.put(("bar", first.symbol, first.exchange, first.interval), bars):
+            return True
+
+        with self.write_lock:
+            self.flush()
+            return self.database.save_bar_data(bars, stream)
+
+    def save_tick_data(self, ticks: List[TickData], stream: bool = False) -> bool:
+        """"""
+        if not ticks:
+            return False
+
+        first: TickData = ticks[0]
+        if stream and self.put(("tick", first.symbol, first.exchange), ticks):
+            return True
+
+        with self.write_lock:
+            self.flush()
+            return self.database.save_tick_data(ticks, stream)
+
+    def load_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> List[BarData]:
+        """"""
+        self.flush()
+        return self.database.load_bar_data(symbol, exchange, interval, start, end)
+
+    def load_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> List[TickData]:
+        """"""
+        self.flush()
+        return self.database.load_tick_data(symbol, exchange, start, end)
+
+    def load_bar_batch(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> BarBatch:
+        """"""
+        self.flush()
+        return self.database.load_bar_batch(symbol, exchange, interval, start, end)
+
+    def load_tick_batch(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> TickBatch:
+        """"""
+        self.flush()
+        return self.database.load_tick_batch(symbol, exchange, start, end)
+
+    def iter_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = 10_000,
+        batch: bool = False
+    ) -> Iterator[Union[List[BarData], BarBatch]]:
+        """"""
+        self.flush()
+        return self.database.iter_bar_data(symbol, exchange, interval, start, end, chunk_size, batch)
+
+    def iter_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = 10_000,
+        batch: bool = False
+    ) -> Iterator[Union[List[TickData], TickBatch]]:
+        """"""
+        self.flush()
+        return self.database.iter_tick_data(symbol, exchange, start, end, chunk_size, batch)
+
+    def delete_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval
+    ) -> int:
+        """"""
+        with self.write_lock:
+            self.flush()
+            return self.database.delete_bar_data(symbol, exchange, interval)
+
+    def delete_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange
+    ) -> int:
+        """"""
+        with self.write_lock:
+            self.flush()
+            return self.database.delete_tick_data(symbol, exchange)
+
+    def get_bar_overview(self) -> List[BarOverview]:
+        """"""
+        self.flush()
+        return self.database.get_bar_overview()
+
+    def get_tick_overview(self) -> List[TickOverview]:
+        """"""
+        self.flush()
+        return self.database.get_tick_overview()
+
+    def put(self, key: tuple, records: list) -> bool:
+        """
+        Add records into buffer of table, blocking while buffer is full.
+        Return False if closed, then records should be written directly.
+        """
+        # Records are copied as callers may reuse and modify them before
+        # written, such as bars of MultiBarGenerator with reuse set
+        records = [copy(record) for record in records]
+
+        with self.lock:
+            deadline: float = perf_counter() + self.put_timeout
+            while self.active and self.pending >= self.buffer_size:
+                timeout: float = deadline - perf_counter()
+                if self.failing or self.dropping or timeout <= 0:
+                    self.drop(key, records)
+                    return True
+                self.not_full.wait(timeout)
+
+            if not self.active:
+                return False
+
+            self.dropping = False
+
+            buffer: list = self.buffers.get(key, None)
+            if buffer is None:
+                buffer = self.buffers[key] = []
+                self.first_times[key] = perf_counter()
+
+            buffer.extend(records)
+            self.pending += len(records)
+
+            if len(buffer) >= self.flush_size:
+                self.size_due = True
+                self.condition.notify()
+
+        return True
+
+    def drop(self, key: tuple, records: list) -> None:
+        """
+        Drop records as buffer is full, should be called with lock held.
+        Message is only printed once until records are buffered again.
+        """
+        self.dropped += len(records)
+
+        if not self.dropping:
+            self.dropping = True
+            print(f"Write-behind buffer full, {len(records)} {key[0]} records of {key[1]} dropped")
+
+    def run(self) -> None:
+        """
+        Flush pending records whenever size or time threshold is reached.
+        """
+        while self.active:
+            with self.lock:
+                while self.active and not self.size_due:
+                    if self.first_times:
+                        timeout: float = min(self.first_times.values()) + self.flush_interval - perf_counter()
+                        if timeout <= 0:
+                            break
+                    else:
+                        timeout = None
+                    self.condition.wait(timeout)
+
+            # Wait before retrying if some records failed to write
+            if not self.flush():
+                with self.lock:
+                    self.condition.wait(self.flush_interval)
+
+    def flush(self) -> bool:
+        """
+        Write all pending records into database, return False if any of
+        them failed and were kept for retry.
+        """
+        with self.write_lock:
+            with self.lock:
+                buffers: Dict[tuple, list] = self.buffers
+                first_times: Dict[tuple, float] = self.first_times
+                self.buffers = {}
+                self.first_times = {}
+                self.size_due = False
+
+            if not buffers:
+                return True
+
+            written: int = 0
+            failed: Dict[tuple, list] = {}
+
+            for key, records in buffers.items():
+                start: float = perf_counter()
+                try:
+                    if key[0] == "bar":
+                        self.database.save_bar_data(records, stream=True)
+                    else:
+                        self.database.save_tick_data(records, stream=True)
+                except Exception:
+                    failed[key] = records
+                    error: str = traceback.format_exc()
+                    continue
+                end: float = perf_counter()
+
+                with self.lock:
+                    self.flush_stats.update(end - start)
+                    self.lag_stats.update(end - first_times[key])
+                written += len(records)
+
+            with self.lock:
+                self.pending -= written
+                self.errors += len(failed)
+
+                # Error is only printed once until records written again,
+                # as failed records are retried every flush interval
+                if failed:
+                    self.last_error = error
+                    if not self.failing:
+                        self.failing = True
+                        print(error)
+                elif self.failing:
+                    self.failing = False
+
+                # Failed records are put before those saved since then
+                for key, records in failed.items():
+                    self.buffers[key] = records + self.buffers.get(key, [])
+                    self.first_times[key] = first_times[key]
+
+                self.not_full.notify_all()
+
+        return not failed
+
+    def close(self) -> None:
+        """
+        Stop background thread and flush pending records. Records still
+        failed to write are left pending as shown by get_stats, and can
+        be flushed again.
+        """
+        with self.lock:
+            if not self.active:
+                return
+            self.active = False
+            self.condition.notify_all()
+            self.not_full.notify_all()
+
+        self.thread.join()
+        self.flush()
+
+    def get_stats(self) -> dict:
+        """
+        Get pending records, current lag of the oldest one in seconds,
+        errors and records dropped, and stats of lag from save to written
+        and of flush latency for each table written.
+        """
+        with self.lock:
+            lag: float = 0
+            if self.first_times:
+                lag = perf_counter() - min(self.first_times.values())
+
+            return {
+                "pending": self.pending,
+                "lag": lag,
+                "errors": self.errors,
+                "failing": self.failing,
+                "last_error": self.last_error,
+                "dropped": self.dropped,
+                "write_lag": self.lag_stats.to_dict(),
+                "flush_latency": self.flush_stats.to_dict(),
+            }